@@ -0,0 +1,99 @@
+"""
+Compare the cost of getting analysis-size frames from the lores stream with
+downscaling full-resolution frames in Python.
+
+A CV consumer takes the latest frame as a 640x360 greyscale image, either
+straight from the lores stream's Y plane or by resizing and converting the
+1080p main stream with OpenCV. The consumer's CPU time per frame and each
+stream's frame rate are reported. A synthetic backend renders both streams
+so the comparison runs anywhere, from a test pattern or a replayed --video;
+pass --real to use the picamera2 camera.
+
+Usage:
+    python -m benchmarks.bench_analysis_stream [--seconds 5] [--fps 30] [--video FILE] [--real]
+"""
+
+import argparse
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.camera import Camera
+from src.camera_backends import SyntheticBackend
+
+MAIN: Tuple[int, int] = (1920, 1080)
+LORES: Tuple[int, int] = (640, 360)
+
+
+def grey_from_lores(frame: Any) -> np.ndarray:
+    """The lores stream's Y plane is already a greyscale analysis frame."""
+    return frame.array[: LORES[1]]
+
+
+def grey_from_main(frame: Any) -> np.ndarray:
+    """Downscale and convert a main stream frame in Python."""
+    small = cv2.resize(frame.array, LORES, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+
+def run(
+    stream: str, seconds: float, fps: float, real: bool, video: Optional[str]
+) -> Dict[str, Any]:
+    """Analyse `stream` for `seconds` and return the consumer's cost."""
+    if real:
+        camera = Camera(resolution=MAIN, flip=False, lores=LORES)
+    else:
+        backend = SyntheticBackend(fps, video=video)
+        camera = Camera(resolution=MAIN, flip=False, lores=LORES, backend=backend)
+    subscription = camera.subscribe(stream, mode="latest")
+    prepare = grey_from_lores if stream == "lores" else grey_from_main
+    analysed = [0, 0.0]  # frames, CPU seconds
+    stop = threading.Event()
+
+    def consume() -> None:
+        while not stop.is_set():
+            frame = subscription.get(timeout=0.1)
+            if frame is None:
+                continue
+            with frame:
+                started = time.thread_time()
+                grey = prepare(frame)
+                cv2.GaussianBlur(grey, (21, 21), 0)  # stand-in for the CV itself
+                analysed[1] += time.thread_time() - started
+                analysed[0] += 1
+
+    thread = threading.Thread(target=consume)
+    thread.start()
+    time.sleep(seconds)
+    stop.set()
+    thread.join()
+    camera.camera_close()
+    return {
+        "frames": analysed[0],
+        "cpu_ms": analysed[1] / max(analysed[0], 1) * 1000,
+        "summary": camera.summary(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--video", help="video file to replay instead of a test pattern")
+    parser.add_argument("--real", action="store_true", help="use the picamera2 camera")
+    args = parser.parse_args()
+
+    for stream in ("lores", "main"):
+        result = run(stream, args.seconds, args.fps, args.real, args.video)
+        print(
+            f"analysing {stream:<6}: {result['frames']} frames, "
+            f"{result['cpu_ms']:.2f} ms CPU per frame"
+        )
+        print(f"    {result['summary']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Measure boot time to the first drive command with sequential and parallel
+subsystem initialisation, and with driving allowed before the camera is ready.
+
+Stand-in subsystems sleep for typical bring-up times (serial open, pad
+connect, camera configure and start) so the comparison runs anywhere. Pass
+--real to build the real base, PS4 controller and picamera2 camera instead.
+
+Usage:
+    python -m benchmarks.bench_boot [--runs 3] [--camera-seconds 1.5] [--real]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from config.config import config
+from src.logger import isolated_logging
+from src.ugv_system import UGVSystem
+
+
+class SlowBase:
+    """Base controller stand-in with a fixed bring-up time."""
+
+    delay: float = 0.05
+
+    def __init__(self, uart_dev_set: str, buad_set: int, thread_setup: Any = None) -> None:
+        time.sleep(self.delay)
+
+    def send_command(self, data: dict) -> None:
+        pass
+
+
+class SlowController:
+    """Input source stand-in with a fixed bring-up time."""
+
+    delay: float = 0.1
+
+    def __init__(self, config: Any) -> None:
+        time.sleep(self.delay)
+        self.speed = 0.0
+        self.turn = 0.0
+        self.recording = False
+        self.stop = False
+
+
+class SlowCamera:
+    """Camera stand-in with a fixed bring-up time."""
+
+    delay: float = 1.5
+
+    def __init__(self, resolution: Any, flip: bool, recording: Any) -> None:
+        time.sleep(self.delay)
+
+    def camera_close(self) -> None:
+        pass
+
+
+MODES: Dict[str, Dict[str, bool]] = {
+    "sequential": {"parallel_init": False, "wait_for_camera": True},
+    "parallel": {"parallel_init": True, "wait_for_camera": True},
+    "parallel, drive before camera": {"parallel_init": True, "wait_for_camera": False},
+}
+
+
+def boot_to_first_drive(mode: Dict[str, bool], real: bool, log_dir: str) -> float:
+    """Build a UGVSystem, run one tick and return seconds to the first drive command."""
+    kwargs: Dict[str, Any] = dict(
+        config=isolated_logging(config, log_dir),
+        base_path="/dev/serial0",
+        debug_logging=False,
+        camera=True,
+        **mode,
+    )
+    if real:
+        system = UGVSystem(**kwargs)
+    else:
+        with patch("src.base_ctrl.BaseController", SlowBase), patch(
+            "src.controller.UGVRemoteController", SlowController
+        ):
+            system = UGVSystem(camera_factory=SlowCamera, **kwargs)
+    system._tick()
+    elapsed: float = system.first_drive_at - system._init_started
+    if system._camera_available(wait=True):
+        system.camera.camera_close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--camera-seconds", type=float, default=SlowCamera.delay)
+    parser.add_argument("--real", action="store_true", help="use the rover's hardware")
+    args = parser.parse_args()
+    SlowCamera.delay = args.camera_seconds
+
+    print(f"{'mode':<32}{'boot to first drive (median)':>30}")
+    with tempfile.TemporaryDirectory() as log_dir:
+        for name, mode in MODES.items():
+            times: List[float] = [
+                boot_to_first_drive(mode, args.real, log_dir) for _ in range(args.runs)
+            ]
+            print(f"{name:<32}{statistics.median(times) * 1000:>27.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Compare control loop jitter with the camera in the control process and in a
+separate worker process.
+
+By default a stand-in camera generates GIL-heavy Python work while recording
+(like encoder callbacks and logging would), so the comparison runs anywhere.
+Pass --real to use the picamera2 camera on the rover instead.
+
+Usage:
+    python -m benchmarks.bench_camera_layout [--seconds 10] [--real]
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+
+from config.config import config
+from src.camera_worker import CameraProcess
+from src.logger import isolated_logging
+from src.simulator import ReplayController, ReplayEvent
+from src.ugv_system import UGVSystem
+
+
+class NullBase:
+    """Base controller stand-in that discards commands."""
+
+    def send_command(self, data: dict) -> None:
+        pass
+
+
+class BusyCamera:
+    """Camera stand-in doing bursts of pure-Python work while recording."""
+
+    def __init__(self, burst: float = 0.005, period: float = 1 / 30) -> None:
+        self.burst = burst
+        self.period = period
+        self._recording = threading.Event()
+        self._closed = False
+        threading.Thread(target=self._work, daemon=True).start()
+
+    def _work(self) -> None:
+        while not self._closed:
+            if self._recording.is_set():
+                end = time.perf_counter() + self.burst
+                total = 0
+                while time.perf_counter() < end:
+                    total += sum(range(100))
+            time.sleep(self.period)
+
+    def start_recording(self, path: str, video_file: str) -> None:
+        self._recording.set()
+
+    def stop_recording(self) -> None:
+        self._recording.clear()
+
+    def camera_close(self) -> None:
+        self._closed = True
+
+
+def run_layout(process: bool, seconds: float, real: bool, log_dir: str) -> UGVSystem:
+    """Drive a recording UGVSystem for `seconds` and return it."""
+    # Start recording straight away and keep going for the whole run.
+    events = [ReplayEvent(0.0, 0.2, 0.0, True)]
+    system = UGVSystem(
+        config=isolated_logging(config, log_dir),
+        base_path="benchmark",
+        debug_logging=False,
+        camera=real,
+        camera_process=process,
+        base=NullBase(),
+        controller=ReplayController(events, time, seconds),
+    )
+    if not real:
+        system.camera_exists = True
+        system.camera = CameraProcess(BusyCamera) if process else BusyCamera()
+    system._loop()
+    return system
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--real", action="store_true", help="use the picamera2 camera.")
+    args = parser.parse_args()
+
+    for process in (False, True):
+        with tempfile.TemporaryDirectory() as log_dir:
+            system = run_layout(process, args.seconds, args.real, log_dir)
+        layout = "worker process" if process else "control process"
+        print(f"camera in {layout}: {system.scheduler.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Measure the worst-case control loop tick while recording is toggled, with
+recording started and stopped inline in the tick against posted to the
+camera worker thread.
+
+The camera uses the synthetic backend (libx264 at 1080p) and writes MP4
+segments to a temporary directory; pass --real to use picamera2. Inline
+mode is the previous behaviour: the tick calls the camera directly.
+
+Usage:
+    python -m benchmarks.bench_camera_toggle [--toggles 10] [--real]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from dataclasses import replace
+from typing import Any, Callable, List
+
+from config.config import config
+from src.camera import Camera
+from src.camera_backends import SyntheticBackend
+from src.logger import isolated_logging
+from src.ugv_system import UGVSystem
+
+
+class NullBase:
+    """Base controller stand-in that discards commands."""
+
+    def send_command(self, data: dict) -> None:
+        pass
+
+
+class Remote:
+    """Remote control stand-in driving straight ahead."""
+
+    speed: float = 0.2
+    turn: float = 0.0
+    recording: bool = False
+    stop: bool = False
+
+
+def run(inline: bool, toggles: int, real: bool, directory: str) -> List[float]:
+    """Run ticks while toggling recording; return the duration of each toggling tick."""
+    camera_factory: Callable[..., Any] = Camera
+    if not real:
+
+        def camera_factory(**kwargs: Any) -> Camera:
+            return Camera(backend=SyntheticBackend(fps=30), **kwargs)
+
+    general = replace(config.general_config, VIDEO_PATH=directory)
+    system = UGVSystem(
+        config=isolated_logging(replace(config, general_config=general), directory),
+        base_path="benchmark",
+        debug_logging=False,
+        camera=True,
+        base=NullBase(),
+        controller=Remote(),
+        camera_factory=camera_factory,
+    )
+    if inline:
+        system.camera = system.camera.camera  # bypass the worker
+    period: float = 1.0 / config.ugv_config.LOOP_HZ
+    toggle_ticks: List[float] = []
+    for _ in range(toggles):
+        time.sleep(1.0)  # let the pre-roll fill and the worker finish
+        system.controller.recording = not system.controller.recording
+        for _ in range(3):
+            started = time.perf_counter()
+            system._tick()
+            toggle_ticks.append(time.perf_counter() - started)
+            time.sleep(period)
+    system.controller.recording = False
+    system._tidy_up()
+    return toggle_ticks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--toggles", type=int, default=10)
+    parser.add_argument("--real", action="store_true", help="use the picamera2 camera")
+    args = parser.parse_args()
+
+    for name, inline in (("inline", True), ("worker", False)):
+        with tempfile.TemporaryDirectory() as directory:
+            ticks = run(inline, args.toggles, args.real, directory)
+        print(
+            f"{name:<7} tick while toggling: median {statistics.median(ticks) * 1000:6.2f} ms, "
+            f"max {max(ticks) * 1000:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Compare handing frames to CV with a new thread per frame, gated by an
+event (the previous frame_process), against a persistent worker fed by a
+latest-frame mailbox.
+
+A frame loop produces 640x480 frames at --fps while a CV stand-in (a
+Gaussian blur repeated to take about --work-ms) analyses them. The cost in
+the frame loop, the frames analysed and the age of each analysed frame
+when its analysis started are reported.
+
+Usage:
+    python -m benchmarks.bench_cv_worker [--seconds 5] [--fps 30] [--work-ms 50]
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+import cv2
+import numpy as np
+
+from src.cv_worker import CVWorker
+
+
+def make_work(work_ms: float) -> Callable[[np.ndarray], None]:
+    """Build a CV stand-in taking about `work_ms` per frame."""
+    frame = np.zeros((480, 640, 4), np.uint8)
+    started = time.perf_counter()
+    cv2.GaussianBlur(frame, (21, 21), 0)
+    repeats = max(1, round(work_ms / 1000 / (time.perf_counter() - started)))
+
+    def work(image: np.ndarray) -> None:
+        for _ in range(repeats):
+            cv2.GaussianBlur(image, (21, 21), 0)
+
+    return work
+
+
+def run(
+    mode: str, seconds: float, fps: float, work: Callable[[np.ndarray], None]
+) -> Dict[str, Any]:
+    """Run the frame loop for `seconds`; return the loop cost and frames analysed."""
+    ages: List[float] = []
+    frame = np.zeros((480, 640, 4), np.uint8)
+
+    def analyse(image: np.ndarray, submitted: float) -> None:
+        ages.append(time.perf_counter() - submitted)
+        work(image)
+
+    if mode == "thread per frame":
+        event = threading.Event()
+
+        def process(image: np.ndarray, submitted: float) -> None:
+            analyse(image, submitted)
+            event.clear()
+
+        def submit(image: np.ndarray) -> None:
+            if not event.is_set():
+                event.set()
+                threading.Thread(
+                    target=process, args=(image.copy(), time.perf_counter()), daemon=True
+                ).start()
+
+    else:
+        worker = CVWorker(analyse)
+
+        def submit(image: np.ndarray) -> None:
+            worker.submit(image, time.perf_counter(), copy=True)
+
+    costs: List[float] = []
+    period = 1.0 / fps
+    end = time.perf_counter() + seconds
+    next_frame = time.perf_counter()
+    while time.perf_counter() < end:
+        started = time.perf_counter()
+        submit(frame)  # each mode copies only a frame it will analyse
+        costs.append(time.perf_counter() - started)
+        next_frame += period
+        time.sleep(max(0.0, next_frame - time.perf_counter()))
+    if mode != "thread per frame":
+        worker.close()
+    return {
+        "loop": statistics.mean(costs),
+        "loop_max": max(costs),
+        "analysed": len(ages),
+        "age": statistics.median(ages) if ages else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--work-ms", type=float, default=50, help="CV time per frame")
+    args = parser.parse_args()
+
+    work = make_work(args.work_ms)
+    for mode in ("thread per frame", "worker"):
+        result = run(mode, args.seconds, args.fps, work)
+        print(
+            f"{mode:<17} loop cost {result['loop'] * 1e6:6.0f} us mean, "
+            f"{result['loop_max'] * 1e6:6.0f} us max; {result['analysed']} frames analysed, "
+            f"{result['age'] * 1000:5.1f} ms old at analysis (median)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Measure frame streaming throughput from a camera to its consumers.
+
+A synthetic backend renders frames as fast as it can, and a consumer thread
+takes them through a latest-only or every-frame subscription, or a callback
+takes them on the camera thread. A baseline copies each frame into a newly
+allocated array instead of a pooled buffer. Pass --real to stream from the
+picamera2 camera at its own frame rate instead.
+
+Usage:
+    python -m benchmarks.bench_frame_stream [--seconds 3] [--work-ms 0] [--real]
+"""
+
+import argparse
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+from src.camera import Camera
+from src.camera_backends import SyntheticBackend
+
+RESOLUTIONS: List[Tuple[int, int]] = [(640, 480), (1920, 1080)]
+CONSUMERS: List[str] = ["latest", "every", "callback", "copy per frame"]
+
+
+def spin(seconds: float) -> None:
+    """Busy-wait, standing in for per-frame consumer work."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def make_backend(real: bool) -> Any:
+    """Build the backend frames are streamed from."""
+    if real:
+        from src.camera_backends import Picamera2Backend
+
+        return Picamera2Backend(flip=False)
+    return SyntheticBackend(fps=0)
+
+
+def run_baseline(
+    resolution: Tuple[int, int], seconds: float, work: float, real: bool
+) -> Dict[str, Any]:
+    """Copy every frame into a new array, without the pool, for `seconds`."""
+    backend = make_backend(real)
+    backend.configure(resolution)
+    consumed: List[int] = [0]
+
+    def on_frame(arrays: Dict[str, Any], timestamp: int) -> None:
+        arrays["main"].copy()
+        spin(work)
+        consumed[0] += 1
+
+    started = time.perf_counter()
+    backend.start(on_frame)
+    time.sleep(seconds)
+    rate = consumed[0] / (time.perf_counter() - started)
+    backend.close()
+    return {"captured": rate, "consumed": rate, "dropped": 0}
+
+
+def run(
+    resolution: Tuple[int, int], consumer: str, seconds: float, work: float, real: bool
+) -> Dict[str, Any]:
+    """Stream frames for `seconds` and return the rates seen by the consumer."""
+    if consumer == "copy per frame":
+        return run_baseline(resolution, seconds, work, real)
+    camera = Camera(resolution=resolution, flip=False, lores=None, backend=make_backend(real))
+    consumed: List[int] = [0]
+    stop = threading.Event()
+    thread = None
+
+    if consumer == "callback":
+
+        def on_frame(frame: Any) -> None:
+            spin(work)
+            consumed[0] += 1
+
+        camera.add_callback(on_frame)
+    else:
+        subscription = camera.subscribe(mode=consumer, maxsize=3)
+
+        def consume() -> None:
+            while not stop.is_set():
+                frame = subscription.get(timeout=0.1)
+                if frame is None:
+                    continue
+                with frame:
+                    spin(work)
+                    consumed[0] += 1
+
+        thread = threading.Thread(target=consume)
+        thread.start()
+
+    started = time.perf_counter()
+    captured_before: int = camera.streams["main"].frames
+    time.sleep(seconds)
+    captured: int = camera.streams["main"].frames - captured_before
+    count: int = consumed[0]
+    elapsed = time.perf_counter() - started
+    stop.set()
+    if thread is not None:
+        thread.join()
+    stats = camera.frame_stats()["main"]
+    camera.camera_close()
+    return {
+        "captured": captured / elapsed,
+        "consumed": count / elapsed,
+        "dropped": stats["dropped"] + stats["subscriber_dropped"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--work-ms", type=float, default=0, help="consumer work per frame")
+    parser.add_argument("--real", action="store_true", help="use the picamera2 camera")
+    args = parser.parse_args()
+
+    print(
+        f"{'resolution':<12}{'consumer':<16}{'captured fps':>14}"
+        f"{'consumed fps':>14}{'dropped':>10}"
+    )
+    for width, height in RESOLUTIONS:
+        for consumer in CONSUMERS:
+            result = run((width, height), consumer, args.seconds, args.work_ms / 1000, args.real)
+            print(
+                f"{f'{width}x{height}':<12}{consumer:<16}{result['captured']:>14.0f}"
+                f"{result['consumed']:>14.0f}{result['dropped']:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
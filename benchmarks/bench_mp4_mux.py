@@ -0,0 +1,100 @@
+"""
+Measure recording start and stop latency and CPU time of muxing H.264 into
+MP4 in process (PyAV), against piping it to an ffmpeg process.
+
+A clip is encoded once with the synthetic backend's encoder (libx264), then
+written to each sink as a recording would be: the sink is opened, every
+frame written and the sink closed. Start latency is from opening the sink
+to its first frame being written; stop latency is the time to close it.
+CPU time includes ffmpeg's. The ffmpeg path is skipped if ffmpeg is not
+installed.
+
+Usage:
+    python -m benchmarks.bench_mp4_mux [--runs 5] [--seconds 10]
+"""
+
+import argparse
+import os
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+from src.camera_backends import SyntheticBackend
+from src.recording import EncodedFrame, FfmpegSink, Mp4Sink, PrerollRecorder, StreamSink
+
+FPS: float = 30.0
+
+
+def encode_clip(seconds: float, size: Tuple[int, int] = (1280, 720)) -> List[EncodedFrame]:
+    """Encode `seconds` of the synthetic test pattern."""
+    backend = SyntheticBackend(fps=FPS)
+    backend.configure(size)
+    recorder = PrerollRecorder(seconds=seconds + 1, max_bytes=1 << 30)
+    encoder = backend.create_encoder(iperiod=round(FPS))
+    encoder.start(recorder, size, FPS)
+    for count in range(int(seconds * FPS)):
+        backend._render(count)
+        encoder.encode(backend._frames["main"], int(count * 1e9 / FPS))
+    encoder.stop()
+    return list(recorder._ring)
+
+
+def cpu_seconds() -> float:
+    """CPU time of this process and its finished children."""
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def record(open_sink: Callable[[], StreamSink], frames: List[EncodedFrame]) -> Dict[str, float]:
+    """Write a recording; return its start and stop latency and CPU time in seconds."""
+    cpu = cpu_seconds()
+    started = time.monotonic()
+    sink = open_sink()
+    for frame in frames:
+        sink.write(frame)
+    while sink.first_write_at is None and sink.error is None:
+        time.sleep(0.0005)
+    stopping = time.monotonic()
+    sink.close()
+    stopped = time.monotonic()
+    if sink.error is not None:
+        raise sink.error
+    return {
+        "start": sink.first_write_at - started,
+        "stop": stopped - stopping,
+        "cpu": cpu_seconds() - cpu,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seconds", type=float, default=10.0, help="length of each recording")
+    args = parser.parse_args()
+
+    frames = encode_clip(args.seconds)
+    size_mb = sum(len(frame.data) for frame in frames) / 1024 / 1024
+    print(f"clip: {len(frames)} frames, {size_mb:.2f} MB")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "video.mp4")
+        sinks: Dict[str, Callable[[], StreamSink]] = {"in process": lambda: Mp4Sink(path)}
+        if shutil.which("ffmpeg"):
+            sinks["ffmpeg"] = lambda: FfmpegSink(path, FPS)
+        else:
+            print("ffmpeg not installed, skipping the ffmpeg sink")
+        for name, open_sink in sinks.items():
+            runs = [record(open_sink, frames) for _ in range(args.runs)]
+            medians = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+            print(
+                f"{name:<10} start {medians['start'] * 1000:7.2f} ms, "
+                f"stop {medians['stop'] * 1000:7.2f} ms, "
+                f"CPU {medians['cpu'] * 1000:7.1f} ms ({os.path.getsize(path) / 1024:.0f} KB)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Measure per-frame overlay compositing time: the full-frame boolean mask,
+masked copy and addWeighted that frame_process used, against compositing
+an overlay layer's drawn region only.
+
+The overlay holds what a CV mode typically draws: a few boxes and lines
+and a line of text. Layer build time, paid once per overlay update, is
+reported separately.
+
+Usage:
+    python -m benchmarks.bench_overlay [--frames 300]
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List, Tuple
+
+import cv2
+import numpy as np
+
+from src.overlay import OverlayLayers
+
+RESOLUTIONS: List[Tuple[int, int]] = [(640, 480), (1920, 1080)]
+
+
+def draw_overlay(size: Tuple[int, int]) -> np.ndarray:
+    """Draw a face-detection style overlay on black."""
+    width, height = size
+    overlay = np.zeros((height, width, 4), np.uint8)
+    x, y = width // 3, height // 3
+    green, white = (64, 255, 64, 0), (255, 255, 255, 0)
+    box_width, box_height = width // 6, height // 5
+    cv2.rectangle(overlay, (x, y), (x + box_width, y + box_height), green, 2)
+    cv2.rectangle(overlay, (x + box_width * 2, y), (x + box_width * 3, y + box_height), green, 2)
+    cv2.line(overlay, (width // 2, y - 20), (width // 2, y + height // 4), white, 1)
+    cv2.putText(overlay, "2 faces", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, white, 1)
+    return overlay
+
+
+def full_frame(frame: np.ndarray, overlay: np.ndarray) -> None:
+    """Composite as frame_process did, over the whole frame."""
+    mask = overlay.astype(bool)
+    frame[mask] = overlay[mask]
+    cv2.addWeighted(overlay, 1, frame, 1, 0, frame)
+
+
+def time_per_call(function: Callable[[], None], calls: int) -> float:
+    """Median seconds per call."""
+    times: List[float] = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    for width, height in RESOLUTIONS:
+        overlay = draw_overlay((width, height))
+        frame = np.full((height, width, 4), 100, np.uint8)
+        layers = OverlayLayers()
+        build = time_per_call(lambda: layers.set("cv", overlay), 20)
+        box = layers.layers["cv"].box
+        full = time_per_call(lambda: full_frame(frame, overlay), args.frames)
+        layered = time_per_call(lambda: layers.composite(frame), args.frames)
+        print(
+            f"{width}x{height}: full frame {full * 1000:6.3f} ms, "
+            f"layer {layered * 1000:6.3f} ms per frame "
+            f"(region {box[2]}x{box[3]}, built in {build * 1000:.3f} ms per update)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Measure recording start-to-first-frame latency and memory with an always-on
+encoder feeding a pre-roll ring, against starting the encoder on demand.
+
+On demand, the encoder is started when recording is requested, so the first
+frame is written once the encoder is up and has produced a keyframe. With
+the pre-roll, the ring is handed to the sink straight away. A synthetic
+backend (libx264) stands in for the camera; pass --real to use picamera2's
+hardware encoder.
+
+Usage:
+    python -m benchmarks.bench_preroll [--runs 5] [--preroll 5] [--real]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, List
+
+from config.schema import RecordingConfig
+from src.camera import Camera
+from src.camera_backends import SyntheticBackend
+from src.recording import H264FileSink, PrerollRecorder
+
+
+def wait_for_first_write(sink: H264FileSink, timeout: float = 5.0) -> None:
+    """Wait until the sink has written a frame."""
+    deadline = time.monotonic() + timeout
+    while sink.first_write_at is None and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def on_demand(camera: Camera, path: str) -> float:
+    """Start a fresh encoder and recording; return seconds to the first frame."""
+    camera.backend.stop_encoder()  # the always-on encoder
+    started = time.monotonic()
+    recorder = PrerollRecorder(seconds=0)
+    sink = H264FileSink(path)
+    recorder.start_recording(sink)
+    camera.backend.start_encoder(camera.backend.create_encoder(round(camera.fps)), recorder)
+    wait_for_first_write(sink)
+    camera.backend.stop_encoder()
+    recorder.stop_recording()
+    camera.backend.start_encoder(camera.encoder, camera.recorder)
+    return sink.first_write_at - started
+
+
+def preroll(camera: Camera, path: str) -> float:
+    """Start a recording from the pre-roll; return seconds to the first frame."""
+    started = time.monotonic()
+    sink = H264FileSink(path)
+    camera.recorder.start_recording(sink)
+    wait_for_first_write(sink)
+    camera.recorder.stop_recording()
+    return sink.first_write_at - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--preroll", type=float, default=5.0, help="seconds of pre-roll")
+    parser.add_argument("--real", action="store_true", help="use the picamera2 camera")
+    args = parser.parse_args()
+
+    backend: Any = None if args.real else SyntheticBackend(fps=30)
+    recording = RecordingConfig(PREROLL_SECONDS=args.preroll)
+    camera = Camera(
+        resolution=(1920, 1080), flip=False, lores=None, backend=backend, recording=recording
+    )
+    time.sleep(args.preroll + 1.5)  # fill the ring
+    print(
+        f"pre-roll ring: {camera.recorder.buffered_seconds:.1f} s in "
+        f"{camera.recorder.buffered_bytes / 1024 / 1024:.2f} MB"
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "video.h264")
+        for name, start in (("on demand", on_demand), ("pre-roll", preroll)):
+            latencies: List[float] = []
+            for _ in range(args.runs):
+                latencies.append(start(camera, path))
+                time.sleep(0.5)
+            print(
+                f"{name:<10} start to first frame: median "
+                f"{statistics.median(latencies) * 1000:6.1f} ms, "
+                f"max {max(latencies) * 1000:6.1f} ms"
+            )
+    camera.camera_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Measure control loop jitter under CPU stress with and without the real-time
+mode (CPU pinning and SCHED_FIFO).
+
+The loop runs on a "control" thread, as in `UGVSystem.run`, and drives a real
+`BaseController` whose serial port is stubbed out, so the serial writer
+thread gets its real-time settings too. Its wake-up latency (command queued
+to written) is reported alongside the loop's jitter.
+
+Stress comes from one busy-looping process per CPU. SCHED_FIFO needs root or
+CAP_SYS_NICE; without it the fallback is reported and only pinning applies.
+
+Usage:
+    python -m benchmarks.bench_realtime [--seconds 10] [--stressors N]
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+from config.config import config
+from src.base_ctrl import BaseController
+from src.logger import isolated_logging
+from src.simulator import ReplayController, ReplayEvent
+from src.ugv_system import UGVSystem
+
+
+class NullSerial:
+    """Serial port stand-in that records when each command is written."""
+
+    def __init__(self, port: str, baudrate: int, timeout: Optional[float] = None) -> None:
+        self.written: List[float] = []
+
+    def write(self, data: bytes) -> int:
+        self.written.append(time.perf_counter())
+        return len(data)
+
+
+class TimedBaseController(BaseController):
+    """BaseController that records when each command is queued."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.queued: List[float] = []
+        super().__init__(*args, **kwargs)
+
+    def send_command(self, data: Dict[str, Any]) -> None:
+        self.queued.append(time.perf_counter())
+        super().send_command(data)
+
+
+def burn() -> None:
+    """Busy loop forever."""
+    while True:
+        pass
+
+
+def run_loop(seconds: float, realtime: bool, log_dir: str) -> UGVSystem:
+    """Run the control loop for `seconds` on a control thread."""
+    with patch("src.base_ctrl.serial.Serial", NullSerial), patch(
+        "src.base_ctrl.BaseController", TimedBaseController
+    ):
+        system = UGVSystem(
+            config=isolated_logging(config, log_dir),
+            base_path="benchmark",
+            debug_logging=False,
+            realtime=realtime,
+            controller=ReplayController([ReplayEvent(0.0, 0.2, 0.0)], time, seconds),
+        )
+    control_thread = threading.Thread(target=system._loop, name="control")
+    control_thread.start()
+    control_thread.join()
+    return system
+
+
+def serial_summary(base: TimedBaseController) -> str:
+    """Describe how long commands waited for the serial thread to write them."""
+    time.sleep(0.1)  # let the last commands through
+    written: List[float] = base.ser.written
+    latencies = sorted(w - q for q, w in zip(base.queued, written))
+    if not latencies:
+        return "Serial thread: nothing written."
+    p50, p99 = (latencies[int(q * (len(latencies) - 1))] * 1000 for q in (0.5, 0.99))
+    return (
+        f"Serial thread: {len(written)} writes, queued to written p50 {p50:.2f} ms, "
+        f"p99 {p99:.2f} ms, max {latencies[-1] * 1000:.2f} ms."
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--stressors", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    stressors = [
+        multiprocessing.Process(target=burn, daemon=True) for _ in range(args.stressors)
+    ]
+    for stressor in stressors:
+        stressor.start()
+    try:
+        for realtime in (False, True):
+            with tempfile.TemporaryDirectory() as log_dir:
+                system = run_loop(args.seconds, realtime, log_dir)
+            for report in system.realtime_reports:
+                print(report)
+            mode = "realtime" if realtime else "default"
+            print(f"{mode}: {system.scheduler.summary()}")
+            print(f"{mode}: {serial_summary(system.base)}")
+    finally:
+        for stressor in stressors:
+            stressor.terminate()
+
+
+if __name__ == "__main__":
+    main()
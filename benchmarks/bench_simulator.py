@@ -0,0 +1,52 @@
+"""
+Run a replayed drive through UGVSystem and the headless simulator in
+virtual time and report loop throughput.
+
+Usage:
+    python -m benchmarks.bench_simulator [--minutes 10] [--replay drive.csv]
+"""
+
+import argparse
+import math
+import random
+import time
+
+from config.config import config
+from src.simulator import ReplayEvent, load_replay, run_simulation
+
+
+def synthetic_drive(minutes: float, seed: int = 0) -> list:
+    """Random trigger and stick changes every 50-500 ms."""
+    rng = random.Random(seed)
+    events, t = [], 0.0
+    while t < minutes * 60:
+        events.append(ReplayEvent(t, rng.uniform(-0.5, 0.5), rng.uniform(-1, 1)))
+        t += rng.uniform(0.05, 0.5)
+    return events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--replay", help="CSV with t, speed, turn[, recording] columns.")
+    args = parser.parse_args()
+
+    events = load_replay(args.replay) if args.replay else synthetic_drive(args.minutes)
+    duration = args.minutes * 60
+
+    start = time.perf_counter()
+    system, simulator = run_simulation(config, events, duration=duration)
+    wall = time.perf_counter() - start
+
+    x, y, heading = simulator.pose
+    print(f"simulated: {duration:.0f} s in {wall:.2f} s ({duration / wall:.0f}x real time)")
+    print(f"loop throughput: {system.scheduler.ticks / wall:.0f} ticks/s")
+    print(f"commands: {simulator.commands_received}, feedback: {len(simulator.feedback_log)}")
+    print(
+        f"final pose: x {x:.2f} m, y {y:.2f} m, heading {math.degrees(heading):.0f} deg, "
+        f"distance {simulator.distance:.1f} m"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark the scalar and vectorised track speed calculations.
+
+Usage:
+    python -m benchmarks.bench_track_speeds [--samples 1000000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.kinematics import calculate_track_speeds_batch
+from src.ugv_system import UGVSystem
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    speed = rng.uniform(-0.5, 0.5, args.samples)
+    turn = rng.uniform(-1, 1, args.samples)
+    # Recorded drives contain plenty of exact zeros (released triggers, centred stick).
+    speed[rng.random(args.samples) < 0.2] = 0.0
+    turn[rng.random(args.samples) < 0.3] = 0.0
+
+    start = time.perf_counter()
+    scalar = [
+        UGVSystem._calculate_track_speeds(s, t)
+        for s, t in zip(speed.tolist(), turn.tolist())
+    ]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    first, second = calculate_track_speeds_batch(speed, turn)
+    batch_time = time.perf_counter() - start
+
+    assert np.array_equal(first, [pair[0] for pair in scalar])
+    assert np.array_equal(second, [pair[1] for pair in scalar])
+
+    print(f"samples: {args.samples}")
+    print(f"scalar:     {scalar_time * 1000:.1f} ms")
+    print(f"vectorised: {batch_time * 1000:.1f} ms")
+    print(f"speedup:    {scalar_time / batch_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
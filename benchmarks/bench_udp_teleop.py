@@ -0,0 +1,68 @@
+"""
+Localhost load test for the UDP teleoperation input source.
+
+Sends commands at 500 Hz and reports loop-to-wire latency, i.e. the time from
+the sender's loop tick to the receiver applying the command.
+
+Usage:
+    python -m benchmarks.bench_udp_teleop [--rate 500] [--duration 5]
+"""
+
+import argparse
+import statistics
+import time
+from threading import Thread
+
+from src.udp_controller import UDPRemoteController, UDPTeleopSender
+
+config = {
+    "udp_config": {"HOST": "127.0.0.1", "PORT": 0, "MAX_PACKET_AGE": 0.1},
+    "ugv_config": {
+        "SPEED_MAX": 0.5,
+        "TURN_VALUE_MIN": -1,
+        "TURN_VALUE_MAX": 1,
+    },
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rate", type=float, default=500, help="send rate in Hz.")
+    parser.add_argument("--duration", type=float, default=5, help="seconds to run.")
+    args = parser.parse_args()
+
+    controller = UDPRemoteController(config=config, latency_history=1_000_000)
+    _, port = controller.bind()
+    listen_thread = Thread(target=controller.listen, args=(5,))
+    listen_thread.start()
+
+    sender = UDPTeleopSender("127.0.0.1", port)
+    period: float = 1 / args.rate
+    deadline: float = time.monotonic()
+    end: float = deadline + args.duration
+    sent: int = 0
+    while deadline < end:
+        sender.send(0.25, (sent % 200) / 100 - 1)
+        sent += 1
+        deadline += period
+        time.sleep(max(0.0, deadline - time.monotonic()))
+    sender.send(0, 0, stop=True)
+    listen_thread.join()
+    sender.close()
+
+    latencies_us = sorted(latency * 1e6 for latency in controller.latencies)
+    print(f"sent: {sent + 1}, received: {controller.received}, applied: {controller.accepted}")
+    print(
+        f"dropped: out-of-order {controller.dropped_out_of_order}, "
+        f"stale {controller.dropped_stale}, superseded {controller.dropped_superseded}"
+    )
+    if latencies_us:
+        print(
+            f"loop-to-wire latency (us): median {statistics.median(latencies_us):.0f}, "
+            f"p99 {latencies_us[int(len(latencies_us) * 0.99) - 1]:.0f}, "
+            f"max {latencies_us[-1]:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
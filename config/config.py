@@ -1,7 +1,84 @@
+import hashlib
+import os
+import pickle
 from pathlib import Path
-import yaml
+from typing import Any, Dict
+
+from config.schema import Config, compile_config
 
 CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "config.yaml"
+# Compiled config, reused while config.yaml and the schema are unchanged.
+CACHE_PATH = CONFIG_PATH.with_name("config.yaml.cache")
+SCHEMA_PATH = Path(__file__).resolve().parent / "schema.py"
+CACHE_VERSION = 1
+
+
+def _signature(path: Path) -> tuple:
+    """Cheap change check: (version, mtime and size of the YAML and schema)."""
+    yaml_stat = os.stat(path)
+    schema_stat = os.stat(SCHEMA_PATH)
+    return (
+        CACHE_VERSION,
+        yaml_stat.st_mtime_ns,
+        yaml_stat.st_size,
+        schema_stat.st_mtime_ns,
+        schema_stat.st_size,
+    )
+
+
+def _digest(yaml_bytes: bytes) -> str:
+    """Content hash of the YAML and schema, used when the signature changes."""
+    return hashlib.sha256(yaml_bytes + SCHEMA_PATH.read_bytes()).hexdigest()
+
+
+def _write_cache(cache_path: Path, entry: Dict[str, Any]) -> None:
+    """Write the cache atomically, ignoring a read-only filesystem."""
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as cache_file:
+            pickle.dump(entry, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def load_config(path: Path = CONFIG_PATH, cache_path: Path = CACHE_PATH) -> Config:
+    """Load the compiled configuration, parsing the YAML only when it changed.
+
+    The cache is reused without reading the YAML while its mtime and size
+    match. If they differ but the contents hash the same (e.g. after a
+    checkout), the cache is refreshed without parsing.
+
+    Args:
+        path: Config YAML file.
+        cache_path: Compiled config cache.
+
+    Returns:
+        Config: The validated configuration.
+
+    Raises:
+        ConfigError: If the configuration is invalid.
+    """
+    signature = _signature(path)
+    try:
+        with open(cache_path, "rb") as cache_file:
+            cached = pickle.load(cache_file)
+    except Exception:
+        cached = None  # missing, corrupt or from an older schema
+    if not (isinstance(cached, dict) and isinstance(cached.get("config"), Config)):
+        cached = {}
+    if cached.get("signature") == signature:
+        return cached["config"]
+
+    yaml_bytes = Path(path).read_bytes()
+    digest = _digest(yaml_bytes)
+    if cached.get("digest") == digest:
+        _write_cache(cache_path, {**cached, "signature": signature})
+        return cached["config"]
+
+    config = compile_config(yaml_bytes)
+    _write_cache(cache_path, {"signature": signature, "digest": digest, "config": config})
+    return config
+
 
-with open(CONFIG_PATH, "r") as yaml_file:
-    config = yaml.safe_load(yaml_file)
+config = load_config()
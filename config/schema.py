@@ -0,0 +1,296 @@
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Mapping, Tuple, Union
+
+# Typed, validated form of config.yaml. Every setting has a default matching
+# the shipped config.yaml, so a YAML file (or dict) only needs the keys it
+# changes, but unknown keys and invalid values are rejected.
+
+
+class ConfigError(ValueError):
+    """Raised when a configuration fails validation."""
+
+
+def _require(condition: bool, message: str) -> None:
+    if not condition:
+        raise ConfigError(message)
+
+
+def _coerce(name: str, value: Any, kind: Any) -> Any:
+    """Check a YAML value against a field type, converting where lossless.
+
+    Args:
+        name: Dotted setting name, for error messages.
+        value: Value from the YAML file.
+        kind: Field type: float, int, str or Tuple[int, ...].
+
+    Returns:
+        Any: The value as `kind`.
+
+    Raises:
+        ConfigError: If the value has the wrong type.
+    """
+    if kind is float:
+        _require(
+            isinstance(value, (int, float)) and not isinstance(value, bool),
+            f"{name} must be a number, got {value!r}.",
+        )
+        return float(value)
+    if kind is int:
+        _require(
+            isinstance(value, int) and not isinstance(value, bool),
+            f"{name} must be an integer, got {value!r}.",
+        )
+        return value
+    if kind is str:
+        _require(isinstance(value, str), f"{name} must be a string, got {value!r}.")
+        return value
+    # Tuple[int, ...]
+    _require(
+        isinstance(value, (list, tuple))
+        and all(isinstance(item, int) and not isinstance(item, bool) for item in value),
+        f"{name} must be a list of integers, got {value!r}.",
+    )
+    return tuple(value)
+
+
+class _Section:
+    """Builds a config section dataclass from its YAML mapping."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, name: str, data: Mapping[str, Any]) -> Any:
+        """
+        Validate a YAML mapping and build the section from it.
+
+        Args:
+            name: Section name, for error messages.
+            data: Settings for the section. Missing keys take their defaults.
+
+        Returns:
+            The section.
+
+        Raises:
+            ConfigError: If a key is unknown or a value is invalid.
+        """
+        _require(isinstance(data, Mapping), f"{name} must be a mapping.")
+        kinds: Dict[str, Any] = {f.name: f.type for f in fields(cls)}
+        unknown = sorted(set(data) - set(kinds))
+        _require(not unknown, f"{name} has unknown settings: {', '.join(unknown)}.")
+        return cls(
+            **{
+                key: _coerce(f"{name}.{key}", value, kinds[key])
+                for key, value in data.items()
+            }
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class GeneralConfig(_Section):
+    VIDEO_PATH: str = "outputs/videos"
+
+
+@dataclass(frozen=True, slots=True)
+class PS4ControllerConfig(_Section):
+    PS4_INTERFACE: str = "/dev/input/js0"
+    R2_MAX: int = 32767
+    R2_MIN: int = -32767
+    L2_MAX: int = 32767
+    L2_MIN: int = -32767
+    L3_LEFT_MAX: int = -259
+    L3_LEFT_MIN: int = -32767
+    L3_RIGHT_MAX: int = 32767
+    L3_RIGHT_MIN: int = 258
+
+    def __post_init__(self) -> None:
+        for axis in ("R2", "L2", "L3_LEFT", "L3_RIGHT"):
+            _require(
+                getattr(self, f"{axis}_MIN") != getattr(self, f"{axis}_MAX"),
+                f"ps4_controller_config.{axis}_MIN and {axis}_MAX must differ.",
+            )
+
+
+@dataclass(frozen=True, slots=True)
+class UDPConfig(_Section):
+    HOST: str = "0.0.0.0"
+    PORT: int = 5005
+    MAX_PACKET_AGE: float = 0.0
+
+    def __post_init__(self) -> None:
+        _require(0 <= self.PORT <= 65535, "udp_config.PORT must be 0-65535.")
+        _require(self.MAX_PACKET_AGE >= 0, "udp_config.MAX_PACKET_AGE must be >= 0.")
+
+
+@dataclass(frozen=True, slots=True)
+class UGVConfig(_Section):
+    SPEED_MAX: float = 0.5
+    SPEED_MIN: float = 0.0
+    TURN_VALUE_MAX: float = 1.0
+    TURN_VALUE_MID: float = 0.0
+    TURN_VALUE_MIN: float = -1.0
+    INPUT_TIMEOUT: float = 0.1
+    LOOP_HZ: float = 100.0
+    LOOP_POLICY: str = "skip"
+
+    def __post_init__(self) -> None:
+        _require(
+            self.SPEED_MIN < self.SPEED_MAX,
+            "ugv_config.SPEED_MIN must be below SPEED_MAX.",
+        )
+        _require(
+            self.TURN_VALUE_MIN < self.TURN_VALUE_MID < self.TURN_VALUE_MAX,
+            "ugv_config.TURN_VALUE_MIN, TURN_VALUE_MID and TURN_VALUE_MAX must increase.",
+        )
+        _require(self.INPUT_TIMEOUT >= 0, "ugv_config.INPUT_TIMEOUT must be >= 0.")
+        _require(self.LOOP_HZ > 0, "ugv_config.LOOP_HZ must be positive.")
+        _require(
+            self.LOOP_POLICY in ("skip", "catch_up"),
+            'ugv_config.LOOP_POLICY must be "skip" or "catch_up".',
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RealtimeConfig(_Section):
+    CONTROL_CPUS: Tuple[int, ...] = (3,)
+    CONTROL_PRIORITY: int = 50
+    SERIAL_CPUS: Tuple[int, ...] = (2,)
+    SERIAL_PRIORITY: int = 49
+
+    def __post_init__(self) -> None:
+        for thread in ("CONTROL", "SERIAL"):
+            _require(
+                1 <= getattr(self, f"{thread}_PRIORITY") <= 99,
+                f"realtime_config.{thread}_PRIORITY must be 1-99.",
+            )
+
+
+@dataclass(frozen=True, slots=True)
+class LoggingConfig(_Section):
+    LOG_FILE: str = "outputs/log/app.log"
+    MAX_BYTES: int = 10 * 1024 * 1024
+    ROTATE_INTERVAL: float = 24 * 60 * 60
+    BACKUP_COUNT: int = 5
+    DRIVE_LOG_INTERVAL: float = 0.5
+    DRIVE_RING_SIZE: int = 6000
+    DRIVE_RING_PATH: str = "outputs/log/drive_ring.bin"
+
+    def __post_init__(self) -> None:
+        for name in (
+            "MAX_BYTES",
+            "ROTATE_INTERVAL",
+            "BACKUP_COUNT",
+            "DRIVE_LOG_INTERVAL",
+            "DRIVE_RING_SIZE",
+        ):
+            _require(getattr(self, name) >= 0, f"logging_config.{name} must be >= 0.")
+
+
+@dataclass(frozen=True, slots=True)
+class RecordingConfig(_Section):
+    PREROLL_SECONDS: float = 5.0
+    PREROLL_MB: float = 32.0
+    SEGMENT_SECONDS: float = 60.0
+    SEGMENT_MB: float = 0.0
+    VIDEO_QUOTA_MB: float = 4096.0
+
+    def __post_init__(self) -> None:
+        for name in (
+            "PREROLL_SECONDS",
+            "PREROLL_MB",
+            "SEGMENT_SECONDS",
+            "SEGMENT_MB",
+            "VIDEO_QUOTA_MB",
+        ):
+            _require(getattr(self, name) >= 0, f"recording_config.{name} must be >= 0.")
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """The whole system configuration, one attribute per config.yaml section."""
+
+    general_config: GeneralConfig = field(default_factory=GeneralConfig)
+    ps4_controller_config: PS4ControllerConfig = field(default_factory=PS4ControllerConfig)
+    udp_config: UDPConfig = field(default_factory=UDPConfig)
+    ugv_config: UGVConfig = field(default_factory=UGVConfig)
+    realtime_config: RealtimeConfig = field(default_factory=RealtimeConfig)
+    logging_config: LoggingConfig = field(default_factory=LoggingConfig)
+    recording_config: RecordingConfig = field(default_factory=RecordingConfig)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Config":
+        """
+        Validate parsed YAML and build the configuration from it.
+
+        Args:
+            data: Mapping of section name to settings. Missing sections and
+                settings take their defaults.
+
+        Returns:
+            Config: The validated configuration.
+
+        Raises:
+            ConfigError: If a section or setting is unknown or invalid.
+        """
+        _require(isinstance(data, Mapping), "Configuration must be a mapping.")
+        sections: Dict[str, Any] = {f.name: f.default_factory for f in fields(cls)}
+        unknown = sorted(set(data) - set(sections))
+        _require(not unknown, f"Unknown config sections: {', '.join(unknown)}.")
+        return cls(
+            **{
+                name: sections[name].from_dict(name, values)
+                for name, values in data.items()
+            }
+        )
+
+
+def changed_settings(old: Config, new: Config) -> List[str]:
+    """List the settings that differ between two configurations.
+
+    Args:
+        old: Configuration before the change.
+        new: Configuration after the change.
+
+    Returns:
+        List[str]: Changed settings as "section.KEY".
+    """
+    changed: List[str] = []
+    for section in fields(Config):
+        old_section = getattr(old, section.name)
+        new_section = getattr(new, section.name)
+        if old_section == new_section:
+            continue
+        for setting in fields(old_section):
+            if getattr(old_section, setting.name) != getattr(new_section, setting.name):
+                changed.append(f"{section.name}.{setting.name}")
+    return changed
+
+
+def compile_config(yaml_bytes: bytes) -> Config:
+    """Parse and validate config YAML.
+
+    Args:
+        yaml_bytes: Contents of a config YAML file.
+
+    Returns:
+        Config: The validated configuration.
+
+    Raises:
+        ConfigError: If the configuration is invalid.
+    """
+    import yaml  # only needed when the cache is stale
+
+    return Config.from_dict(yaml.safe_load(yaml_bytes) or {})
+
+
+def as_config(config: Union[Config, Mapping[str, Any]]) -> Config:
+    """Return a compiled configuration, compiling a plain mapping if needed.
+
+    Args:
+        config: Compiled configuration, or a mapping in config.yaml layout.
+
+    Returns:
+        Config: The compiled configuration.
+    """
+    if isinstance(config, Config):
+        return config
+    return Config.from_dict(config)
@@ -1,43 +1,131 @@
 import argparse
 import os
 import sys
+import time
 
-from config.config import config
-from src.ugv_system import UGVSystem
-from src.logger import customLogger
-from src.utils import is_raspberry_pi5, run_tests, delete_file, print_ugv_system_banner
+from src.startup import StartupProfile
+
+# Timed from here, so --profile-startup covers the imports below.
+profile = StartupProfile()
+
+parser = argparse.ArgumentParser(description="UGV System")
+parser.add_argument("--debug", action="store_true", help="output debug to CLI.")
+parser.add_argument(
+    "--input",
+    choices=["ps4", "udp"],
+    default="ps4",
+    help="remote control input source.",
+)
+parser.add_argument(
+    "--camera-process",
+    action="store_true",
+    help="run the camera and recording in a separate worker process.",
+)
+parser.add_argument(
+    "--realtime",
+    action="store_true",
+    help="pin control and serial threads to dedicated CPUs with SCHED_FIFO.",
+)
+parser.add_argument(
+    "--force-tests",
+    action="store_true",
+    help="rerun the self-test even if the tree is unchanged since it last passed.",
+)
+parser.add_argument(
+    "--drive-before-camera",
+    action="store_true",
+    help="start driving while the camera is still initialising.",
+)
+parser.add_argument(
+    "--sequential-init",
+    action="store_true",
+    help="initialise subsystems one after another (for comparing boot times).",
+)
+parser.add_argument(
+    "--profile-startup",
+    action="store_true",
+    help="log an import and initialisation time breakdown before driving.",
+)
+args = parser.parse_args()
+
+with profile.phase("import config"):
+    from config.config import CONFIG_PATH, config
+with profile.phase("import system"):
+    from src.ugv_system import UGVSystem
+    from src.logger import customLogger
+    from src.utils import (
+        SELF_TEST_PATHS,
+        is_raspberry_pi5,
+        print_ugv_system_banner,
+        record_self_test_pass,
+        run_tests,
+        self_test_cached,
+        tree_hash,
+    )
 
 os.environ["LIBCAMERA_LOG_LEVELS"] = "*:ERROR"
 
 
 ### Variables ###
-log_file = "outputs/log/app.log"
+logging_config = config.logging_config
+self_test_cache = "outputs/self_test_cache.json"
 # Determine the GPIO Serial Device Name Based on the Raspberry Pi Model
 base_path = "/dev/ttyAMA0" if is_raspberry_pi5() else "/dev/serial0"
 
-parser = argparse.ArgumentParser(description="UGV System")
-parser.add_argument("--debug", action="store_true", help="output debug to CLI.")
-args = parser.parse_args()
-
 
 ### Setup logging ###
-delete_file(log_file)
-logger = customLogger("main", log_file, args.debug)
+with profile.phase("logging"):
+    logger = customLogger(
+        "main",
+        logging_config.LOG_FILE,
+        args.debug,
+        max_bytes=logging_config.MAX_BYTES,
+        rotate_interval=logging_config.ROTATE_INTERVAL,
+        backup_count=logging_config.BACKUP_COUNT,
+    )
 
 
 ### Run tests ###
-logger.info("Initiating testing...")
+with profile.phase("self-test"):
+    test_start = time.monotonic()
+    source_hash = tree_hash(SELF_TEST_PATHS)
 
-if not run_tests():
-    logger.critical("Tests failed! Exiting.")
-    sys.exit(1)
+    if not args.force_tests and self_test_cached(self_test_cache, source_hash):
+        logger.info(
+            f"Tree unchanged since last passing self-test, skipped testing in "
+            f"{time.monotonic() - test_start:.2f} s."
+        )
+    else:
+        logger.info("Initiating testing...")
 
-logger.info("Testing passed, running UGV system!")
+        if not run_tests():
+            logger.critical("Tests failed! Exiting.")
+            sys.exit(1)
+
+        record_self_test_pass(self_test_cache, source_hash)
+        logger.info(
+            f"Testing passed in {time.monotonic() - test_start:.2f} s, running UGV system!"
+        )
 
 
 ### Run system ###
-print_ugv_system_banner(logger)
-system = UGVSystem(
-    config=config, base_path=base_path, debug_logging=args.debug, camera=True
-)
+with profile.phase("banner"):
+    print_ugv_system_banner(logger)
+with profile.phase("system init"):
+    system = UGVSystem(
+        config=config,
+        base_path=base_path,
+        debug_logging=args.debug,
+        camera=True,
+        camera_process=args.camera_process,
+        input_source=args.input,
+        realtime=args.realtime,
+        config_path=CONFIG_PATH,
+        parallel_init=not args.sequential_init,
+        wait_for_camera=not args.drive_before_camera,
+    )
+profile.extend(system.startup)
+logger.info(f"Ready to drive {profile.elapsed():.2f} s after start.")
+if args.profile_startup:
+    logger.info(profile.report())
 system.run()
@@ -2,21 +2,20 @@ import cv2
 import imutils
 import mediapipe as mp
 import imageio
-import threading
 import datetime, time
 import numpy as np
 import math
 import yaml, os, json, subprocess
 from collections import deque
+import itertools
 import textwrap
 
-# libraries for csi camera
-from picamera2 import Picamera2
-from picamera2.encoders import H264Encoder, Encoder
-from picamera2.outputs import FfmpegOutput
+from src.cv_worker import CVWorker
+from src.frame_stream import FrameStream
+from src.overlay import OverlayLayers
 
-# libraries for oak camera
-import depthai as dai
+# camera libraries (picamera2 for csi, depthai for oak) are imported when
+# the camera is initialised, so a camera backend can run without them
 
 # config file.
 curpath = os.path.realpath(__file__)
@@ -28,10 +27,12 @@ with open(thisPath + "/config.yaml", "r") as yaml_file:
 class OpencvFuncs:
     """docstring for OpencvFuncs"""
 
-    def __init__(self, project_path, base_ctrl):
+    def __init__(self, project_path, base_ctrl, camera_backend=None):
+        # camera_backend: optional src.camera_backends backend (e.g.
+        # SyntheticBackend) used instead of a usb, csi or oak camera
         self.base_ctrl = base_ctrl
-        self.cv_event = threading.Event()
-        self.cv_event.clear()
+        # long-lived cv worker, always given the latest frame
+        self.cv_worker = CVWorker(self.cv_process)
         self.cv_mode = f["code"]["cv_none"]
         self.detection_reaction_mode = f["code"]["re_none"]
 
@@ -43,7 +44,10 @@ class OpencvFuncs:
         self.set_video_record_flag = False
         self.video_record_status_flag = False
         self.writer = None
-        self.overlay = None
+        # cv modes draw into self.overlay; each update becomes a layer of
+        # just the drawn region, composited onto every frame
+        self.overlay_layers = OverlayLayers()
+        self._overlay = None
         self.scale_rate = 1
         self.video_quality = f["video"]["default_quality"]
 
@@ -175,8 +179,25 @@ class OpencvFuncs:
         # osd settings
         self.add_osd = f["base_config"]["add_osd"]
 
+        # camera backend init
+        self.camera_backend = camera_backend
+        if camera_backend is not None:
+            shapes = camera_backend.configure(
+                (f["video"]["default_res_w"], f["video"]["default_res_h"])
+            )
+            self.backend_frames = FrameStream("main", shapes["main"], pool_size=2)
+            self.backend_subscription = self.backend_frames.subscribe()
+            frame_ids = itertools.count()
+            camera_backend.start(
+                lambda arrays, timestamp: self.backend_frames.publish(
+                    arrays["main"], next(frame_ids), timestamp
+                )
+            )
+
         # camera type detection
-        self.usb_camera_connected = self.usb_camera_detection()
+        self.usb_camera_connected = (
+            camera_backend is None and self.usb_camera_detection()
+        )
         self.csi_camera_connected = False
         self.oak_camera_connected = False
 
@@ -187,9 +208,12 @@ class OpencvFuncs:
             self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, f["video"]["default_res_h"])
 
         # csi camera init
-        if not self.usb_camera_connected:
+        if camera_backend is None and not self.usb_camera_connected:
             print("init csi camera.")
             try:
+                from picamera2 import Picamera2
+                from picamera2.encoders import H264Encoder
+
                 self.encoder = H264Encoder(1000000)
                 self.picam2 = Picamera2()
                 self.picam2.configure(
@@ -209,8 +233,14 @@ class OpencvFuncs:
                 self.csi_camera_connected = False
 
         # oak camera init
-        if not self.usb_camera_connected and not self.csi_camera_connected:
+        if (
+            camera_backend is None
+            and not self.usb_camera_connected
+            and not self.csi_camera_connected
+        ):
             try:
+                import depthai as dai
+
                 self.pipeline = dai.Pipeline()
 
                 self.camRgb = self.pipeline.createColorCamera()
@@ -237,7 +267,14 @@ class OpencvFuncs:
 
     def frame_process(self):
         try:
-            if self.usb_camera_connected:
+            if self.camera_backend is not None:
+                frame = self.backend_subscription.get(timeout=1)
+                if frame is None:
+                    raise RuntimeError("no frame from camera backend")
+                with frame:
+                    # XRGB8888 like the csi camera
+                    input_frame = cv2.cvtColor(frame.array, cv2.COLOR_BGR2BGRA)
+            elif self.usb_camera_connected:
                 success, input_frame = self.camera.read()
                 if not success:
                     self.camera.release()
@@ -287,27 +324,23 @@ class OpencvFuncs:
 
         # opencv funcs
         if self.cv_mode != f["code"]["cv_none"]:
-            if not self.cv_event.is_set():
-                self.cv_event.set()
-                self.opencv_threading(input_frame)
+            # a copy, as the overlay is drawn on input_frame below
+            self.cv_worker.submit(input_frame, self.cv_mode, copy=True)
             try:
-                mask = self.overlay.astype(bool)
-                input_frame[mask] = self.overlay[mask]
-                cv2.addWeighted(self.overlay, 1, input_frame, 1, 0, input_frame)
+                self.overlay_layers.composite(input_frame)
             except Exception as e:
                 print("An error occurred:", e)
         elif self.show_info_flag:
             if time.time() - self.info_update_time > self.info_show_time:
                 self.show_info_flag = False
-            self.overlay = input_frame.copy()
-            cv2.rectangle(
-                self.overlay,
-                (round((self.info_scale - 0.005) * 640), round((0.33) * 480)),
-                (round(0.98 * 640), round((0.78) * 480)),
-                self.info_bg_color,
-                -1,
-            )
-            cv2.addWeighted(self.overlay, 0.5, input_frame, 0.5, 0, input_frame)
+            # darken only the info box
+            info_box = input_frame[
+                round(0.33 * 480) : round(0.78 * 480) + 1,
+                round((self.info_scale - 0.005) * 640) : round(0.98 * 640) + 1,
+            ]
+            info_bg = np.empty_like(info_box)
+            info_bg[:] = self.info_bg_color + (0,) * (info_box.shape[2] - 3)
+            cv2.addWeighted(info_bg, 0.5, info_box, 0.5, 0, info_box)
 
             # info_deque.appendleft(time.time())
             for i in range(0, len(self.info_deque)):
@@ -399,6 +432,15 @@ class OpencvFuncs:
         # output frame
         return input_frame
 
+    @property
+    def overlay(self):
+        return self._overlay
+
+    @overlay.setter
+    def overlay(self, overlay_buffer):
+        self._overlay = overlay_buffer
+        self.overlay_layers.set("cv", overlay_buffer)
+
     def usb_camera_detection(self):
         lsusb_output = subprocess.check_output(["lsusb"]).decode("utf-8")
         if "Camera" in lsusb_output:
@@ -468,9 +510,12 @@ class OpencvFuncs:
             self.video_quality = int(input_quality)
 
     def set_cv_mode(self, input_mode):
+        if input_mode != self.cv_mode:
+            self.overlay_layers.clear()
         self.cv_mode = input_mode
         if self.cv_mode == f["code"]["cv_none"]:
             self.set_video_record_flag = False
+            print(f"[cv_ctrl.set_cv_mode] {self.cv_worker.summary()}")
 
     def set_detection_reaction(self, input_reaction):
         self.detection_reaction_mode = input_reaction
@@ -879,7 +924,6 @@ class OpencvFuncs:
                     1,
                 )
 
-        self.overlay = np.zeros_like(img)
         self.overlay = overlay_buffer
 
     def calculate_distance(self, lm1, lm2):
@@ -1406,7 +1450,7 @@ class OpencvFuncs:
         except Exception as e:
             print(f"[cv_ctrl.update_base_data] error: {e}")
 
-    def cv_process(self, frame):
+    def cv_process(self, frame, cv_mode):
         cv_mode_list = {
             f["code"]["cv_moti"]: self.cv_detect_movition,
             f["code"]["cv_face"]: self.cv_detect_faces,
@@ -1417,17 +1461,10 @@ class OpencvFuncs:
             f["code"]["mp_face"]: self.mediaPipe_faces,
             f["code"]["mp_pose"]: self.mediaPipe_pose,
         }
-        try:
-            cv_mode_list[self.cv_mode](frame)
-        except Exception as e:
-            print(f"[cv_ctrl.cv_process] error: {e}")
-        self.cv_event.clear()
-
-    def opencv_threading(self, input_img):
-        cv_thread = threading.Thread(
-            target=self.cv_process, args=(input_img,), daemon=True
-        )
-        cv_thread.start()
+        if cv_mode != self.cv_mode:
+            return  # mode changed since the frame was submitted
+        # errors propagate to the CV worker, which counts them
+        cv_mode_list[cv_mode](frame)
 
     def head_light_ctrl(self, input_mode):
         self.cv_light_mode = input_mode
@@ -2,7 +2,7 @@ import serial
 import json
 import queue
 import threading
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
 
 class BaseController:
@@ -11,17 +11,25 @@ class BaseController:
     and processing commands asynchronously.
     """
 
-    def __init__(self, uart_dev_set: str, buad_set: int) -> None:
+    def __init__(
+        self,
+        uart_dev_set: str,
+        buad_set: int,
+        thread_setup: Optional[Callable[[], None]] = None,
+    ) -> None:
         """
         Initialize the BaseController with a UART device and baud rate.
 
         :param uart_dev_set: The UART device to connect to (e.g., '/dev/ttyUSB0').
         :param buad_set: The baud rate for the serial communication.
+        :param thread_setup: Optional callable run on the command thread before
+            it starts writing, e.g. to apply real-time scheduling.
         """
         self.ser = serial.Serial(uart_dev_set, buad_set, timeout=1)
         self.command_queue: queue.Queue[Dict[str, Any]] = queue.Queue()
+        self.thread_setup = thread_setup
         self.command_thread = threading.Thread(
-            target=self.process_commands, daemon=True
+            target=self.process_commands, name="serial", daemon=True
         )
         self.command_thread.start()
 
@@ -37,6 +45,8 @@ class BaseController:
         """
         Continuously process commands from the queue and send them over the UART interface.
         """
+        if self.thread_setup is not None:
+            self.thread_setup()
         while True:
             data: Dict[str, Any] = self.command_queue.get()
             self.ser.write((json.dumps(data) + "\n").encode("utf-8"))
@@ -1,57 +1,229 @@
-from picamera2 import Picamera2
-from picamera2.encoders import H264Encoder
-from picamera2.outputs import FfmpegOutput
-from typing import Tuple
+import itertools
+import os
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from config.schema import RecordingConfig
+from src.frame_stream import MODE_LATEST, Frame, FrameStream, FrameSubscription
+from src.recording import IndexedSink, Mp4Sink, PrerollRecorder, SegmentedSink, StreamSink
+
+MB: int = 1024 * 1024
 
 
 class Camera:
     """
     A simple class to initialize and operate the camera using the picamera2 library.
 
+    Besides recording, the camera hands its frames to any number of
+    consumers (CV, previews, snapshots) through `subscribe` or
+    `add_callback`, without opening the camera again. Recording uses the
+    full-resolution "main" stream (BGR). Analysis should use the "lores"
+    stream (YUV420, greyscale in `array[:height]`), scaled from the same
+    sensor frames by the ISP.
+
+    The H.264 encoder runs all the time into a pre-roll ring, so a recording
+    starts with the last few seconds and without waiting for the encoder.
+    Recordings are split into segment files, with the oldest deleted to
+    stay within a disk quota; roll, drop and eviction messages are queued
+    in `events` for the owner to log. Each segment has a sidecar frame index
+    (e.g. 'video_000.idx') of its frames' sensor timestamps, on the same
+    monotonic clock as the drive commands.
+
     Attributes:
         resolution (Tuple[int, int]): The resolution of the camera in (width, height).
         flip (bool): Whether to apply flipping to the camera feed.
+        lores (Optional[Tuple[int, int]]): The resolution of the analysis stream.
+        backend: Camera backend capturing and encoding the frames.
+        streams (Dict[str, FrameStream]): Frame delivery for each stream.
+        recorder (PrerollRecorder): Encoder output holding the pre-roll.
+        events (Deque[str]): Recording messages not yet logged.
     """
 
-    def __init__(self, resolution: Tuple[int, int] = (1280, 720), flip: bool = True):
+    def __init__(
+        self,
+        resolution: Tuple[int, int] = (1280, 720),
+        flip: bool = True,
+        lores: Optional[Tuple[int, int]] = (640, 360),
+        backend: Optional[Any] = None,
+        pool_size: int = 4,
+        recording: RecordingConfig = RecordingConfig(),
+    ):
         """
         Initializes the camera with the specified resolution and flipping options.
 
         Args:
             resolution (Tuple[int, int]): Desired resolution as (width, height).
             flip (bool): Set to True to enable horizontal and vertical flipping.
+            lores (Optional[Tuple[int, int]]): Analysis stream resolution as
+                (width, height), or None for no analysis stream.
+            backend: Camera backend from `src.camera_backends`, defaults to
+                the Raspberry Pi camera.
+            pool_size (int): Preallocated frame buffers per stream. Frames
+                arriving while every buffer is held by consumers are dropped.
+            recording (RecordingConfig): Pre-roll, segment and disk quota
+                settings.
+        """
+        self.resolution = resolution
+        self.flip = flip
+        self.lores = lores
+        self.recording = recording
+        self.events: Deque[str] = deque(maxlen=100)
+        if backend is None:
+            from src.camera_backends import Picamera2Backend
+
+            backend = Picamera2Backend(flip)
+        self.backend = backend
+        self.fps: float = backend.fps or 30.0
+        shapes: Dict[str, Tuple[int, ...]] = backend.configure(resolution, lores)
+        self.streams: Dict[str, FrameStream] = {
+            name: FrameStream(name, shape, pool_size) for name, shape in shapes.items()
+        }
+        self._frame_ids = itertools.count()
+        self.recorder = PrerollRecorder(
+            recording.PREROLL_SECONDS, int(recording.PREROLL_MB * MB)
+        )
+        # A keyframe every second: the pre-roll is trimmed a GOP at a time
+        self.encoder = backend.create_encoder(iperiod=max(1, round(self.fps)))
+        backend.start(self._on_frame)
+        backend.start_encoder(self.encoder, self.recorder)
+
+    def _on_frame(self, arrays: Dict[str, np.ndarray], timestamp: int) -> None:
+        """
+        Hand a sensor frame to each stream's consumers. Runs on the backend's thread.
+
+        Args:
+            arrays: Frame of each stream, only valid during the call.
+            timestamp: Sensor timestamp in nanoseconds.
+        """
+        frame_id: int = next(self._frame_ids)
+        for name, array in arrays.items():
+            self.streams[name].publish(array, frame_id, timestamp)
+
+    def subscribe(
+        self, stream: str = "main", mode: str = MODE_LATEST, maxsize: int = 2
+    ) -> FrameSubscription:
+        """
+        Subscribe to a stream's frames.
+
+        Args:
+            stream: Stream name.
+            mode: "latest" to always get the newest frame, dropping any not
+                yet taken, or "every" to queue frames up to `maxsize`.
+            maxsize: Queue length in "every" mode.
+
+        Returns:
+            FrameSubscription: Iterable of frames, which must be released.
+        """
+        return self.streams[stream].subscribe(mode, maxsize)
+
+    def unsubscribe(self, subscription: FrameSubscription) -> None:
+        """
+        Stop a subscription.
+
+        Args:
+            subscription: Subscription returned by `subscribe`.
         """
-        self.camera = Picamera2()
-        self.encoder = H264Encoder()
-        config: dict = self.camera.create_video_configuration(main={"size": resolution})
-        self.camera.configure(config)
-        if flip:
-            self.camera.set_controls({"FlipHorizontal": True, "FlipVertical": True})
-        self.camera.start()
-    
+        self.streams[subscription.stream].unsubscribe(subscription)
+
+    def add_callback(self, callback: Callable[[Frame], None], stream: str = "main") -> None:
+        """
+        Call `callback` with every frame of a stream, on the camera thread.
+        The frame is only valid during the call unless retained.
+
+        Args:
+            callback: Called with each frame.
+            stream: Stream name.
+        """
+        self.streams[stream].add_callback(callback)
+
+    def remove_callback(self, callback: Callable[[Frame], None], stream: str = "main") -> None:
+        """
+        Stop calling a frame callback.
+
+        Args:
+            callback: Callback given to `add_callback`.
+            stream: Stream name.
+        """
+        self.streams[stream].remove_callback(callback)
+
+    def frame_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Frame delivery counts and rates for each stream.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Stream name to its stats.
+        """
+        return {name: stream.stats() for name, stream in self.streams.items()}
+
+    def summary(self) -> str:
+        """
+        Describe each stream's frame rates and drops.
+
+        Returns:
+            str: One line summary.
+        """
+        parts = []
+        for name, stats in self.frame_stats().items():
+            height, width = self.streams[name].shape[:2]
+            if name == "lores":
+                height = height * 2 // 3  # YUV420 rows include the chroma planes
+            parts.append(
+                f"{name} {width}x{height} {stats['fps']:.1f} fps "
+                f"({stats['delivered_fps']:.1f} delivered, "
+                f"{stats['dropped'] + stats['subscriber_dropped']:.0f} dropped)"
+            )
+        return f"Camera streams: {'; '.join(parts)}. {self.recorder.summary()}"
+
     def camera_close(self) -> None:
         """
         Cleans up Camera object.
         """
-        self.camera.stop()
+        self.recorder.stop_recording()
+        self.backend.stop_encoder()
+        self.backend.stop()
+        for stream in self.streams.values():
+            stream.close()
 
     def start_recording(self, path: str, video_file: str) -> None:
         """
-        Starts recording a video to the specified path.
+        Starts recording a video to the specified path, in numbered
+        segments named after `video_file` (e.g. 'video_000.mp4'). Segments
+        are muxed in process, keeping the encoder's frame timestamps.
 
         Args:
             path (str): The directory where the video file will be saved.
-            video_file (str): The name of the video file (e.g., 'video.h264').
+            video_file (str): The name of the video file (e.g., 'video.mp4').
         """
-        output: str = f"{path}/{video_file}"
-        file_output = FfmpegOutput(output, audio=False)
-        self.camera.start_recording(self.encoder, file_output)
+        recording: RecordingConfig = self.recording
+
+        def open_segment(segment_path: str) -> StreamSink:
+            index_path: str = os.path.splitext(segment_path)[0] + ".idx"
+            return IndexedSink(Mp4Sink(segment_path), index_path, self._encoder_epoch)
+
+        sink = SegmentedSink(
+            path,
+            video_file,
+            open_segment,
+            self.fps,
+            segment_seconds=recording.SEGMENT_SECONDS,
+            segment_bytes=int(recording.SEGMENT_MB * MB),
+            quota_bytes=int(recording.VIDEO_QUOTA_MB * MB),
+            on_event=self.events.append,
+        )
+        self.recorder.start_recording(sink)
 
     def stop_recording(self) -> None:
         """
-        Stops the ongoing video recording.
+        Stops the ongoing video recording. The encoder keeps running.
         """
-        self.camera.stop_recording()
+        self.recorder.stop_recording()
+
+    def _encoder_epoch(self) -> Optional[int]:
+        """Sensor timestamp in nanoseconds of the encoder's first frame, if started."""
+        first: Optional[int] = getattr(self.encoder, "firsttimestamp", None)
+        return None if first is None else int(first) * 1000
 
 
 if __name__ == "__main__":
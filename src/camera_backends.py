@@ -0,0 +1,416 @@
+import threading
+import time
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+# Camera backends capture frames and run the H.264 encoder for `Camera`:
+# `Picamera2Backend` for the Raspberry Pi camera, and `SyntheticBackend`
+# (test pattern or video file) to run the video pipeline without hardware.
+# Each one provides:
+#
+#     configure(main, lores) -> shapes
+#                                    set up the BGR main stream and optional
+#                                    YUV420 low-resolution stream, both from
+#                                    the same sensor frames, returning the
+#                                    array shape of each stream's frames
+#     start(on_frame)                start capturing, calling
+#                                    on_frame(arrays, timestamp_ns) per sensor
+#                                    frame with one array per stream; arrays
+#                                    are only valid during the call
+#     stop()                         stop capturing
+#     fps                            frame rate
+#     create_encoder(iperiod)        build an H.264 encoder with a keyframe
+#                                    every `iperiod` frames and SPS/PPS
+#                                    headers repeated on each keyframe
+#     start_encoder(encoder, output) encode the main stream into a picamera2
+#                                    style output, calling
+#                                    output.outputframe(data, keyframe,
+#                                    timestamp_us) per frame, timestamps
+#                                    relative to the encoder's first frame,
+#                                    whose sensor timestamp (microseconds)
+#                                    is kept in encoder.firsttimestamp
+#     stop_encoder()                 stop the encoder
+#     close()                        release the camera
+
+FrameCallback = Callable[[Dict[str, np.ndarray], int], None]
+
+
+def yuv420_shape(size: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Array shape of a planar YUV420 frame: the Y plane's rows followed by the
+    quarter-size U and V planes. `array[:height]` is the greyscale image.
+
+    Args:
+        size: Frame (width, height).
+
+    Returns:
+        Tuple[int, int]: (rows, columns).
+    """
+    width, height = size
+    return height * 3 // 2, width
+
+
+class Picamera2Backend:
+    """Camera backend for the Raspberry Pi camera, using picamera2."""
+
+    def __init__(self, flip: bool = True, fps: float = 30.0) -> None:
+        """
+        Open the camera.
+
+        Args:
+            flip: Set to True to enable horizontal and vertical flipping.
+            fps: Frame rate.
+        """
+        from picamera2 import Picamera2
+
+        self.camera = Picamera2()
+        self.flip: bool = flip
+        self.fps: float = fps
+        self._shapes: Dict[str, Tuple[int, ...]] = {}
+        self._on_frame: Optional[FrameCallback] = None
+
+    def configure(
+        self, main: Tuple[int, int], lores: Optional[Tuple[int, int]] = None
+    ) -> Dict[str, Tuple[int, ...]]:
+        """
+        Configure the camera's streams. The ISP scales the lores stream from
+        the same sensor frames, so it costs no extra capture or CPU resize.
+
+        Args:
+            main: Main stream (width, height).
+            lores: Low-resolution stream (width, height), if wanted. Its width
+                should be a multiple of 64 so rows have no padding.
+
+        Returns:
+            Dict[str, Tuple[int, ...]]: Array shape of each stream's frames.
+        """
+        # RGB888 is BGR in memory: usable by OpenCV as is, and by the encoder.
+        # The Pi 4 ISP only produces YUV420 for the lores stream.
+        streams: Dict[str, dict] = {"main": {"size": main, "format": "RGB888"}}
+        self._shapes = {"main": (main[1], main[0], 3)}
+        if lores is not None:
+            streams["lores"] = {"size": lores, "format": "YUV420"}
+            self._shapes["lores"] = yuv420_shape(lores)
+        config: dict = self.camera.create_video_configuration(
+            controls={"FrameRate": self.fps}, **streams
+        )
+        self.camera.configure(config)
+        if self.flip:
+            self.camera.set_controls({"FlipHorizontal": True, "FlipVertical": True})
+        return dict(self._shapes)
+
+    def start(self, on_frame: FrameCallback) -> None:
+        """
+        Start the camera, passing every frame to `on_frame`.
+
+        Args:
+            on_frame: Called on picamera2's thread for each sensor frame.
+        """
+        self._on_frame = on_frame
+        self.camera.post_callback = self._post_callback
+        self.camera.start()
+
+    def _post_callback(self, request: Any) -> None:
+        from picamera2 import MappedArray
+
+        timestamp: int = request.get_metadata().get("SensorTimestamp", time.monotonic_ns())
+        with ExitStack() as stack:
+            arrays: Dict[str, np.ndarray] = {}
+            for name, (height, width, *_) in self._shapes.items():
+                mapped = stack.enter_context(MappedArray(request, name))
+                arrays[name] = mapped.array[:height, :width]  # drop any stride padding
+            self._on_frame(arrays, timestamp)
+
+    def stop(self) -> None:
+        """Stop the camera."""
+        self.camera.stop()
+
+    def create_encoder(self, iperiod: int = 30) -> Any:
+        """
+        Build a hardware H.264 encoder.
+
+        Args:
+            iperiod: Frames between keyframes.
+        """
+        from picamera2.encoders import H264Encoder
+
+        return H264Encoder(repeat=True, iperiod=iperiod)
+
+    def start_encoder(self, encoder: Any, output: Any) -> None:
+        """
+        Start encoding the main stream. The camera keeps running.
+
+        Args:
+            encoder: Encoder from `create_encoder`.
+            output: picamera2 output receiving the encoded frames.
+        """
+        self.camera.start_encoder(encoder, output)
+
+    def stop_encoder(self) -> None:
+        """Stop the encoder. The camera keeps running."""
+        self.camera.stop_encoder()
+
+    def close(self) -> None:
+        """Release the camera."""
+        self.camera.close()
+
+
+class SyntheticBackend:
+    """
+    Camera backend rendering a moving test pattern, or replaying a video
+    file, for benchmarks and tests without camera hardware.
+
+    Frames are rendered on a background thread at the configured resolution,
+    in BGR for the main stream and YUV420 for the lores stream. The pattern
+    is a static gradient with a white bar sweeping across it; a video is
+    scaled to each stream's size. Timestamps come from the monotonic clock,
+    as picamera2's sensor timestamps do.
+    """
+
+    def __init__(
+        self, fps: Optional[float] = 30.0, video: Optional[str] = None, loop: bool = True
+    ) -> None:
+        """
+        Initialise the SyntheticBackend.
+
+        Args:
+            fps: Frame rate, or 0 to render frames as fast as possible. None
+                uses the video's own frame rate.
+            video: Video file to replay instead of the test pattern.
+            loop: Replay the video from the start once it ends; otherwise its
+                last frame is repeated.
+
+        Raises:
+            ValueError: If the video cannot be opened.
+        """
+        self._capture: Any = None
+        if video is not None:
+            import cv2
+
+            self._capture = cv2.VideoCapture(video)
+            if not self._capture.isOpened():
+                raise ValueError(f"Cannot open video {video!r}.")
+            if fps is None:
+                fps = self._capture.get(cv2.CAP_PROP_FPS)
+        self.fps: float = fps or 0.0
+        self.loop: bool = loop
+        self._frames: Dict[str, np.ndarray] = {}
+        self._backgrounds: Dict[str, np.ndarray] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._encoder: Optional[SyntheticEncoder] = None
+        self._encoder_lock = threading.Lock()
+
+    def configure(
+        self, main: Tuple[int, int], lores: Optional[Tuple[int, int]] = None
+    ) -> Dict[str, Tuple[int, ...]]:
+        """
+        Prepare a pattern for each stream.
+
+        Args:
+            main: Main stream (width, height).
+            lores: Low-resolution stream (width, height), if wanted.
+
+        Returns:
+            Dict[str, Tuple[int, ...]]: Array shape of each stream's frames.
+        """
+        self._frames, self._backgrounds = {}, {}
+        width, height = main
+        background = np.empty((height, width, 3), np.uint8)
+        background[:] = np.linspace(0, 255, width, dtype=np.uint8)[None, :, None]
+        self._backgrounds["main"] = background
+        if lores is not None:
+            width, height = lores
+            background = np.full(yuv420_shape(lores), 128, np.uint8)  # grey chroma
+            background[:height] = np.linspace(0, 255, width, dtype=np.uint8)[None, :]
+            self._backgrounds["lores"] = background
+        for name, background in self._backgrounds.items():
+            self._frames[name] = background.copy()
+        return {name: frame.shape for name, frame in self._frames.items()}
+
+    def start(self, on_frame: FrameCallback) -> None:
+        """
+        Start rendering frames on a background thread.
+
+        Args:
+            on_frame: Called on the render thread for each frame.
+        """
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(on_frame,), name="synthetic_camera", daemon=True
+        )
+        self._thread.start()
+
+    def _render(self, count: int) -> None:
+        """Move the bar in every stream to its position for frame `count`."""
+        if self._capture is not None:
+            self._replay()
+            return
+        for name, frame in self._frames.items():
+            background = self._backgrounds[name]
+            width: int = frame.shape[1]
+            # Only the Y plane of a YUV420 frame is drawn on
+            rows: int = frame.shape[0] if frame.ndim == 3 else frame.shape[0] * 2 // 3
+            bar: int = max(1, width // 32)
+            old: int = (count - 1) * bar % width
+            new: int = count * bar % width
+            frame[:rows, old : old + bar] = background[:rows, old : old + bar]
+            frame[:rows, new : new + bar] = 255
+
+    def _replay(self) -> None:
+        """Scale the video's next frame into every stream."""
+        import cv2
+
+        ok, image = self._capture.read()
+        if not ok and self.loop:
+            self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, image = self._capture.read()
+        if not ok:
+            return  # ended: repeat the last frame
+        main = self._frames["main"]
+        cv2.resize(image, (main.shape[1], main.shape[0]), dst=main)
+        lores: Optional[np.ndarray] = self._frames.get("lores")
+        if lores is not None:
+            size: Tuple[int, int] = (lores.shape[1], lores.shape[0] * 2 // 3)
+            cv2.cvtColor(cv2.resize(image, size), cv2.COLOR_BGR2YUV_I420, dst=lores)
+
+    def _run(self, on_frame: FrameCallback) -> None:
+        period: float = 1.0 / self.fps if self.fps > 0 else 0.0
+        next_frame: float = time.monotonic()
+        count: int = 0
+        while not self._stopped.is_set():
+            if period:
+                delay: float = next_frame - time.monotonic()
+                if delay > 0 and self._stopped.wait(delay):
+                    break
+                next_frame += period
+            count += 1
+            self._render(count)
+            timestamp: int = time.monotonic_ns()
+            with self._encoder_lock:
+                if self._encoder is not None:
+                    self._encoder.encode(self._frames["main"], timestamp)
+            on_frame(self._frames, timestamp)
+
+    def stop(self) -> None:
+        """Stop rendering frames."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def create_encoder(self, iperiod: int = 30) -> "SyntheticEncoder":
+        """
+        Build a software H.264 encoder.
+
+        Args:
+            iperiod: Frames between keyframes.
+        """
+        return SyntheticEncoder(iperiod)
+
+    def start_encoder(self, encoder: "SyntheticEncoder", output: Any) -> None:
+        """
+        Start encoding the main stream on the render thread.
+
+        Args:
+            encoder: Encoder from `create_encoder`.
+            output: picamera2 style output receiving the encoded frames.
+        """
+        height, width = self._frames["main"].shape[:2]
+        encoder.start(output, (width, height), self.fps or 30.0)
+        with self._encoder_lock:
+            self._encoder = encoder
+
+    def stop_encoder(self) -> None:
+        """Stop the encoder."""
+        with self._encoder_lock:
+            encoder, self._encoder = self._encoder, None
+        if encoder is not None:
+            encoder.stop()
+
+    def close(self) -> None:
+        """Stop rendering frames and close any video."""
+        self.stop()
+        if self._capture is not None:
+            self._capture.release()
+
+
+class SyntheticEncoder:
+    """
+    Software H.264 encoder (libx264 through PyAV) standing in for picamera2's
+    hardware encoder.
+
+    Frames are encoded without B-frames or lookahead, so each frame produces
+    one packet straight away, and passed to the output as picamera2's
+    encoders do: Annex B data, keyframe flag and a timestamp in microseconds
+    relative to the first frame.
+    """
+
+    def __init__(self, iperiod: int = 30) -> None:
+        """
+        Initialise the SyntheticEncoder.
+
+        Args:
+            iperiod: Frames between keyframes.
+        """
+        self.iperiod: int = iperiod
+        self._codec: Any = None
+        self._output: Any = None
+        # Sensor timestamp of the first frame in microseconds, as picamera2 keeps it
+        self.firsttimestamp: Optional[int] = None
+
+    def start(self, output: Any, size: Tuple[int, int], fps: float) -> None:
+        """
+        Open the codec and start the output.
+
+        Args:
+            output: picamera2 style output.
+            size: Frame (width, height).
+            fps: Frame rate.
+        """
+        from fractions import Fraction
+
+        import av
+
+        codec = av.CodecContext.create("libx264", "w")
+        codec.width, codec.height = size
+        codec.pix_fmt = "yuv420p"
+        codec.time_base = Fraction(1, 1_000_000)
+        codec.framerate = Fraction(fps).limit_denominator(1001)
+        codec.options = {
+            "preset": "ultrafast",
+            "tune": "zerolatency",
+            "g": str(self.iperiod),
+            "x264-params": "repeat-headers=1",
+        }
+        codec.open()
+        self._codec = codec
+        self.firsttimestamp = None
+        self._output = output
+        output.start()
+
+    def encode(self, array: np.ndarray, timestamp: int) -> None:
+        """
+        Encode a BGR frame and pass the result to the output.
+
+        Args:
+            array: Frame to encode.
+            timestamp: Sensor timestamp in nanoseconds.
+        """
+        import av
+
+        if self.firsttimestamp is None:
+            self.firsttimestamp = timestamp // 1000
+        frame = av.VideoFrame.from_ndarray(array, format="bgr24")
+        frame.pts = timestamp // 1000 - self.firsttimestamp
+        for packet in self._codec.encode(frame):
+            self._output.outputframe(bytes(packet), packet.is_keyframe, packet.pts)
+
+    def stop(self) -> None:
+        """Flush the codec and stop the output."""
+        for packet in self._codec.encode(None):
+            self._output.outputframe(bytes(packet), packet.is_keyframe, packet.pts)
+        self._codec = None
+        self._output.stop()
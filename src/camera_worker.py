@@ -0,0 +1,288 @@
+import multiprocessing
+import queue
+import threading
+import time
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Commands sent to the camera worker, as (name, *args) tuples.
+CMD_START_RECORDING: str = "start_recording"
+CMD_STOP_RECORDING: str = "stop_recording"
+CMD_CLOSE: str = "close"
+
+# Camera worker states, reported in status messages.
+STATE_STARTING: str = "starting"
+STATE_IDLE: str = "idle"
+STATE_RECORDING: str = "recording"
+STATE_CLOSED: str = "closed"
+STATE_ERROR: str = "error"
+
+
+def _run_commands(
+    camera: Any,
+    receive: Callable[[], Tuple[Any, ...]],
+    report: Callable[..., None],
+) -> None:
+    """
+    Execute camera commands until told to close, reporting a status
+    message after each one. Shared by the worker process and thread.
+
+    Args:
+        camera: Camera to drive.
+        receive: Blocks until the next command arrives.
+        report: Called with a state and optional error and extra fields.
+    """
+    report(STATE_IDLE)
+    state: str = STATE_IDLE
+    while True:
+        command: Tuple[Any, ...] = receive()
+        name, args = command[0], command[1:]
+        started: float = time.monotonic()
+        extra: Dict[str, Any] = {}
+        try:
+            if name == CMD_START_RECORDING:
+                camera.start_recording(*args)
+                state = STATE_RECORDING
+            elif name == CMD_STOP_RECORDING:
+                camera.stop_recording()
+                state = STATE_IDLE
+                recorder = getattr(camera, "recorder", None)
+                if recorder is not None:
+                    extra["summary"] = recorder.summary()
+            elif name == CMD_CLOSE:
+                if state == STATE_RECORDING:
+                    camera.stop_recording()
+                camera.camera_close()
+                report(STATE_CLOSED)
+                break
+            else:
+                report(state, f"Unknown command: {name}")
+                continue
+        except Exception as e:
+            report(state, f"{name} failed: {e}")
+            continue
+        report(state, command=name, duration=time.monotonic() - started, **extra)
+
+
+def _camera_worker_main(
+    conn: Connection, camera_factory: Callable[..., Any], camera_kwargs: Dict[str, Any]
+) -> None:
+    """Camera worker process entry point.
+
+    Builds the camera, then executes commands from `conn` until told to
+    close, reporting a status message after each one.
+
+    Args:
+        conn: Worker end of the command/status pipe.
+        camera_factory: Callable returning a camera (e.g. `Camera`).
+        camera_kwargs: Keyword arguments for `camera_factory`.
+    """
+
+    def report(state: str, error: Optional[str] = None, **extra: Any) -> None:
+        conn.send({"state": state, "error": error, "time": time.monotonic(), **extra})
+
+    def receive() -> Tuple[Any, ...]:
+        try:
+            return conn.recv()
+        except EOFError:
+            return (CMD_CLOSE,)
+
+    try:
+        camera = camera_factory(**camera_kwargs)
+    except Exception as e:
+        report(STATE_ERROR, f"Camera initialisation failed: {e}")
+        conn.close()
+        return
+    _run_commands(camera, receive, report)
+    conn.close()
+
+
+class CameraProcess:
+    """
+    Runs a camera in a separate worker process.
+
+    Mirrors the `Camera` recording interface, but every call only posts a
+    command over a pipe and returns straight away. The worker reports its
+    state back, which is picked up without blocking by `poll_status`. This
+    keeps picamera2 callbacks, encoder output and muxing off the
+    control process's GIL.
+    """
+
+    def __init__(self, camera_factory: Callable[..., Any], **camera_kwargs: Any) -> None:
+        """
+        Start the camera worker process.
+
+        Args:
+            camera_factory: Picklable callable returning a camera, e.g. `Camera`.
+            **camera_kwargs: Keyword arguments for `camera_factory`.
+        """
+        # Spawn rather than fork: the control process already runs threads.
+        context = multiprocessing.get_context("spawn")
+        self._conn, worker_conn = context.Pipe()
+        self.process = context.Process(
+            target=_camera_worker_main,
+            args=(worker_conn, camera_factory, camera_kwargs),
+            name="camera_worker",
+            daemon=True,
+        )
+        self.process.start()
+        worker_conn.close()
+        self.status: Dict[str, Any] = {"state": STATE_STARTING, "error": None}
+        self._unreported: List[Dict[str, Any]] = []
+
+    def _send(self, *command: Any) -> None:
+        """
+        Post a command to the worker.
+
+        Args:
+            *command: Command name followed by its arguments.
+        """
+        try:
+            self._conn.send(command)
+        except (BrokenPipeError, OSError) as e:
+            self._record({"state": STATE_ERROR, "error": f"Worker unreachable: {e}"})
+
+    def _record(self, message: Dict[str, Any]) -> None:
+        """
+        Keep a status message until it is returned by `poll_status`.
+
+        Args:
+            message: Status message.
+        """
+        self.status = message
+        self._unreported.append(message)
+
+    def _receive(self) -> None:
+        """Read every status message waiting on the pipe without blocking."""
+        if self._conn.closed:
+            return
+        try:
+            while self._conn.poll():
+                self._record(self._conn.recv())
+        except (EOFError, OSError):
+            if self.status["state"] not in (STATE_CLOSED, STATE_ERROR):
+                self._record({"state": STATE_ERROR, "error": "Worker exited."})
+
+    def poll_status(self) -> List[Dict[str, Any]]:
+        """
+        Collect any status messages from the worker without blocking.
+        The latest one is also kept in `status`.
+
+        Returns:
+            List[Dict[str, Any]]: Status messages received since the last poll.
+        """
+        self._receive()
+        messages, self._unreported = self._unreported, []
+        return messages
+
+    def start_recording(self, path: str, video_file: str) -> None:
+        """
+        Ask the worker to start recording.
+
+        Args:
+            path: The directory where the video file will be saved.
+            video_file: The name of the video file.
+        """
+        self._send(CMD_START_RECORDING, path, video_file)
+
+    def stop_recording(self) -> None:
+        """Ask the worker to stop recording."""
+        self._send(CMD_STOP_RECORDING)
+
+    def camera_close(self, timeout: float = 5.0) -> None:
+        """
+        Close the camera and wait for the worker to exit.
+
+        Args:
+            timeout: Seconds to wait before terminating the worker.
+        """
+        self._send(CMD_CLOSE)
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self._receive()
+        self._conn.close()
+
+
+class CameraThread:
+    """
+    Runs a camera's recording commands on a worker thread.
+
+    Same interface as `CameraProcess`, for a camera in the control process:
+    `start_recording` and `stop_recording` only queue a command and return
+    straight away, so starting the encoder output, opening files and
+    closing them never stall the control loop. Results are picked up
+    without blocking by `poll_status`.
+
+    Anything else (`subscribe`, `summary`, `events`, ...) is passed through
+    to the camera.
+    """
+
+    def __init__(self, camera: Any) -> None:
+        """
+        Start the worker thread.
+
+        Args:
+            camera: Initialised camera, e.g. a `Camera`.
+        """
+        self.camera = camera
+        self._commands: "queue.SimpleQueue[Tuple[Any, ...]]" = queue.SimpleQueue()
+        self._statuses: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+        self.status: Dict[str, Any] = {"state": STATE_STARTING, "error": None}
+        self.thread = threading.Thread(
+            target=_run_commands,
+            args=(camera, self._commands.get, self._report),
+            name="camera_worker",
+            daemon=True,
+        )
+        self.thread.start()
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "camera":  # not set yet
+            raise AttributeError(name)
+        return getattr(self.camera, name)
+
+    def _report(self, state: str, error: Optional[str] = None, **extra: Any) -> None:
+        self._statuses.put({"state": state, "error": error, "time": time.monotonic(), **extra})
+
+    def poll_status(self) -> List[Dict[str, Any]]:
+        """
+        Collect any status messages from the worker without blocking.
+        The latest one is also kept in `status`.
+
+        Returns:
+            List[Dict[str, Any]]: Status messages received since the last poll.
+        """
+        messages: List[Dict[str, Any]] = []
+        while not self._statuses.empty():
+            messages.append(self._statuses.get())
+        if messages:
+            self.status = messages[-1]
+        return messages
+
+    def start_recording(self, path: str, video_file: str) -> None:
+        """
+        Ask the worker to start recording.
+
+        Args:
+            path: The directory where the video file will be saved.
+            video_file: The name of the video file.
+        """
+        self._commands.put((CMD_START_RECORDING, path, video_file))
+
+    def stop_recording(self) -> None:
+        """Ask the worker to stop recording."""
+        self._commands.put((CMD_STOP_RECORDING,))
+
+    def camera_close(self, timeout: float = 5.0) -> None:
+        """
+        Close the camera once queued commands are done, and wait for the worker.
+
+        Args:
+            timeout: Seconds to wait for the worker.
+        """
+        self._commands.put((CMD_CLOSE,))
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            self._report(STATE_ERROR, f"Camera did not close within {timeout:g} s.")
@@ -0,0 +1,173 @@
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, List, NamedTuple, Optional, Tuple
+
+from config.schema import Config, ConfigError, changed_settings, compile_config
+
+# Settings only read at startup. A reload that changes any of them is
+# rejected rather than half applied.
+RESTART_ONLY_SETTINGS: Tuple[str, ...] = (
+    "ps4_controller_config.PS4_INTERFACE",
+    "udp_config.HOST",
+    "udp_config.PORT",
+    "realtime_config.CONTROL_CPUS",
+    "realtime_config.CONTROL_PRIORITY",
+    "realtime_config.SERIAL_CPUS",
+    "realtime_config.SERIAL_PRIORITY",
+    "logging_config.LOG_FILE",
+    "logging_config.MAX_BYTES",
+    "logging_config.ROTATE_INTERVAL",
+    "logging_config.BACKUP_COUNT",
+    "logging_config.DRIVE_RING_SIZE",
+    "recording_config.PREROLL_SECONDS",
+    "recording_config.PREROLL_MB",
+    "recording_config.SEGMENT_SECONDS",
+    "recording_config.SEGMENT_MB",
+    "recording_config.VIDEO_QUOTA_MB",
+)
+
+
+class PendingConfig(NamedTuple):
+    """A validated configuration waiting to be applied by the control loop."""
+
+    config: Config
+    changed: List[str]
+    detected_at: float
+    validation_time: float
+
+
+class ConfigReloader:
+    """
+    Watches the config file and validates changes on a background thread.
+
+    The file's mtime and size are polled every `interval` seconds. A change
+    is parsed and validated off the control loop; a valid configuration is
+    left in a single pending slot for the control loop to `take` between
+    ticks, replacing any not yet taken. Invalid files, and changes to
+    settings that need a restart, are rejected with a reason passed to
+    `on_reject`.
+    """
+
+    def __init__(
+        self,
+        current: Config,
+        path: Path,
+        interval: float = 0.5,
+        on_reject: Optional[Callable[[str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        history: int = 100,
+    ) -> None:
+        """
+        Initialise the ConfigReloader.
+
+        Args:
+            current: Configuration currently in use.
+            path: Config YAML file to watch.
+            interval: Seconds between checks of the file.
+            on_reject: Called with the reason whenever a change is rejected.
+            clock: Monotonic time source, shared with the control loop.
+            history: Number of reload latencies and rejections to keep.
+        """
+        self.path = Path(path)
+        self.interval: float = interval
+        self.on_reject = on_reject
+        self._clock = clock
+        self._accepted: Config = current  # newest valid config, applied or not
+        self._signature: Optional[Tuple[int, int]] = self._stat()
+        self._pending: Optional[PendingConfig] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.reloads: int = 0
+        self.latencies: Deque[float] = deque(maxlen=history)
+        self.rejections: Deque[str] = deque(maxlen=history)
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def start(self) -> None:
+        """Start watching the file on a background thread."""
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="config_reload", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching the file."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.poll()
+
+    def poll(self) -> bool:
+        """
+        Check the file once, validating it if it has changed.
+
+        Returns:
+            bool: True if a new configuration is now pending.
+        """
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        detected_at: float = self._clock()
+
+        import yaml  # off the control loop, so the import cost does not matter
+
+        try:
+            new: Config = compile_config(self.path.read_bytes())
+        except (OSError, ConfigError, yaml.YAMLError) as e:
+            self._reject(f"{self.path.name} is invalid: {e}")
+            return False
+
+        changed: List[str] = changed_settings(self._accepted, new)
+        if not changed:
+            return False
+        needs_restart: List[str] = [s for s in changed if s in RESTART_ONLY_SETTINGS]
+        if needs_restart:
+            self._reject(f"{', '.join(needs_restart)} cannot change without a restart.")
+            return False
+
+        self._accepted = new
+        validation_time: float = self._clock() - detected_at
+        with self._lock:
+            if self._pending is not None:
+                # Superseded before it was applied; report both sets of changes
+                changed = sorted(set(self._pending.changed) | set(changed))
+            self._pending = PendingConfig(new, changed, detected_at, validation_time)
+        return True
+
+    def _reject(self, reason: str) -> None:
+        self.rejections.append(reason)
+        if self.on_reject is not None:
+            self.on_reject(reason)
+
+    @property
+    def pending(self) -> bool:
+        """Whether a validated configuration is waiting to be taken."""
+        return self._pending is not None
+
+    def take(self) -> Optional[PendingConfig]:
+        """
+        Take the pending configuration, recording its reload latency.
+
+        Returns:
+            Optional[PendingConfig]: The configuration to apply now, if any.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            self.reloads += 1
+            self.latencies.append(self._clock() - pending.detected_at)
+        return pending
@@ -1,6 +1,15 @@
-from typing import Dict, Any
+import logging
+import os
+import select
+import struct
+import time
+from typing import Any, Mapping, Optional, Union
 from pyPS4Controller.controller import Controller
+from config.schema import Config, as_config
 from src.utils import normalise_to_range
+from src.watchdog import InputWatchdog
+
+logger = logging.getLogger(__name__)
 
 
 class UGVRemoteController(Controller):
@@ -11,25 +20,30 @@ class UGVRemoteController(Controller):
     PS4 controller inputs and map them to UGV commands like speed and turn value.
     """
 
-    def __init__(self, config: Dict[str, Any], **kwargs: Any) -> None:
+    def __init__(self, config: Union[Config, Mapping[str, Any]], **kwargs: Any) -> None:
         """
         Initialize the UGVRemoteController.
 
         Args:
-            config: Configuration dictionary with PS4 controller and UGV parameters.
+            config: Configuration with PS4 controller and UGV parameters, compiled
+                or as a dictionary in config.yaml layout.
             **kwargs: Additional keyword arguments passed to the parent class.
         """
+        config = as_config(config)
         super().__init__(
-            interface=config["ps4_controller_config"]["PS4_INTERFACE"],
+            interface=config.ps4_controller_config.PS4_INTERFACE,
             connecting_using_ds4drv=False,
             **kwargs
         )
-        self.config: Dict[str, Any] = config
+        self.config: Config = config
         self.debug: bool = False  # debug event stream
 
         self.recording: bool = False
         self._speed: float = 0.0
         self._turn: int = 0.0
+        self.watchdog: Optional[InputWatchdog] = None  # fed on events and heartbeats
+        # Longest the listener waits for an event before signalling it is alive
+        self.heartbeat_interval: float = 0.02
 
     @property
     def speed(self) -> float:
@@ -71,6 +85,81 @@ class UGVRemoteController(Controller):
         """
         self._turn = val
 
+    def heartbeat(self) -> None:
+        """
+        Signal from the listener thread that it is still reading the pad.
+        """
+        self._input_received()
+
+    def listen(self, timeout: int = 60) -> None:
+        """
+        Read pad events until stopped or the pad disconnects.
+
+        Replaces pyPS4Controller's blocking read loop. The pad only sends
+        events when a value changes, so a trigger held steady sends nothing;
+        this loop wakes at least every `heartbeat_interval` seconds and feeds
+        the watchdog each time round. A listener that hangs, or a device that
+        stops being readable, stops the feed and the watchdog trips.
+
+        Args:
+            timeout: Seconds to wait for the pad's device to appear.
+        """
+        deadline: float = time.monotonic() + timeout
+        while not os.path.exists(self.interface):
+            if self.stop or time.monotonic() >= deadline:
+                logger.warning(f"Timeout({timeout} sec). Interface not available.")
+                return
+            time.sleep(0.1)
+        try:
+            with open(self.interface, "rb", buffering=0) as device:
+                self.is_connected = True
+                while not self.stop:
+                    readable, _, _ = select.select([device], [], [], self.heartbeat_interval)
+                    if readable:
+                        data: bytes = device.read(self.event_size)
+                        if len(data) < self.event_size:
+                            break  # device gone
+                        self._dispatch(data)
+                    self.heartbeat()
+        except OSError:
+            logger.warning("Interface lost. Device disconnected?")
+        finally:
+            self.is_connected = False
+
+    def _dispatch(self, data: bytes) -> None:
+        """
+        Hand one raw event to pyPS4Controller's event mapping.
+
+        Args:
+            data: One event read from the device.
+        """
+        event = struct.unpack(self.event_format, data)
+        button_id, button_type, value, overflow = event[0], event[1], event[2], event[3:]
+        if button_id not in self.black_listed_buttons:
+            self._Controller__handle_event(
+                button_id=button_id,
+                button_type=button_type,
+                value=value,
+                overflow=overflow,
+                debug=self.debug,
+            )
+
+    def apply_config(self, config: Config) -> None:
+        """
+        Switch to a reloaded configuration.
+
+        Args:
+            config: The new configuration.
+        """
+        self.config = config
+
+    def _input_received(self) -> None:
+        """
+        Feed the input watchdog, if one is attached.
+        """
+        if self.watchdog is not None:
+            self.watchdog.feed()
+
     def on_R2_press(self, val: int) -> None:
         """
         Event handler for pressing the R2 button.
@@ -78,12 +167,14 @@ class UGVRemoteController(Controller):
         Args:
             val: The pressure value of the R2 button.
         """
+        self._input_received()
+        config: Config = self.config  # one snapshot, in case of a reload
         speed: float = normalise_to_range(
             val,
-            self.config["ps4_controller_config"]["R2_MIN"],
-            self.config["ps4_controller_config"]["R2_MAX"],
-            self.config["ugv_config"]["SPEED_MIN"],
-            self.config["ugv_config"]["SPEED_MAX"],
+            config.ps4_controller_config.R2_MIN,
+            config.ps4_controller_config.R2_MAX,
+            config.ugv_config.SPEED_MIN,
+            config.ugv_config.SPEED_MAX,
         )
         self.speed = speed
 
@@ -93,6 +184,7 @@ class UGVRemoteController(Controller):
 
         Sets the left motor speed to 0.
         """
+        self._input_received()
         self.speed = 0.0
 
     def on_L2_press(self, val: int) -> None:
@@ -102,12 +194,14 @@ class UGVRemoteController(Controller):
         Args:
             val: The pressure value of the L2 button.
         """
+        self._input_received()
+        config: Config = self.config
         speed: float = normalise_to_range(
             val,
-            self.config["ps4_controller_config"]["L2_MIN"],
-            self.config["ps4_controller_config"]["L2_MAX"],
-            self.config["ugv_config"]["SPEED_MIN"],
-            self.config["ugv_config"]["SPEED_MAX"],
+            config.ps4_controller_config.L2_MIN,
+            config.ps4_controller_config.L2_MAX,
+            config.ugv_config.SPEED_MIN,
+            config.ugv_config.SPEED_MAX,
         )
         speed = -speed  # reverse
         self.speed = speed
@@ -118,6 +212,7 @@ class UGVRemoteController(Controller):
 
         Sets the right motor speed to 0.
         """
+        self._input_received()
         self.speed = 0.0
 
     def on_L3_right(self, val: int) -> None:
@@ -127,12 +222,14 @@ class UGVRemoteController(Controller):
         Args:
             val: The pressure value of the L3 analogue.
         """
+        self._input_received()
+        config: Config = self.config
         turn: int = normalise_to_range(
             val,
-            self.config["ps4_controller_config"]["L3_RIGHT_MIN"],
-            self.config["ps4_controller_config"]["L3_RIGHT_MAX"],
-            self.config["ugv_config"]["TURN_VALUE_MID"],
-            self.config["ugv_config"]["TURN_VALUE_MAX"],
+            config.ps4_controller_config.L3_RIGHT_MIN,
+            config.ps4_controller_config.L3_RIGHT_MAX,
+            config.ugv_config.TURN_VALUE_MID,
+            config.ugv_config.TURN_VALUE_MAX,
         )
         self.turn = turn
 
@@ -143,12 +240,14 @@ class UGVRemoteController(Controller):
         Args:
             val: The pressure value of the L3 analogue.
         """
+        self._input_received()
+        config: Config = self.config
         turn: int = normalise_to_range(
             val,
-            self.config["ps4_controller_config"]["L3_LEFT_MIN"],
-            self.config["ps4_controller_config"]["L3_LEFT_MAX"],
-            self.config["ugv_config"]["TURN_VALUE_MIN"],
-            self.config["ugv_config"]["TURN_VALUE_MID"],
+            config.ps4_controller_config.L3_LEFT_MIN,
+            config.ps4_controller_config.L3_LEFT_MAX,
+            config.ugv_config.TURN_VALUE_MIN,
+            config.ugv_config.TURN_VALUE_MID,
         )
         self.turn = turn
 
@@ -158,6 +257,7 @@ class UGVRemoteController(Controller):
 
         Stops the controller.
         """
+        self._input_received()
         self.stop = True
 
     def on_square_release(self) -> None:
@@ -166,6 +266,7 @@ class UGVRemoteController(Controller):
 
         Toggles recording.
         """
+        self._input_received()
         self.recording = not self.recording
 
     def _ignore_event(self, *args: Any, **kwargs: Any) -> None:
@@ -176,7 +277,7 @@ class UGVRemoteController(Controller):
             *args: Positional arguments for the event.
             **kwargs: Keyword arguments for the event.
         """
-        pass
+        self._input_received()
 
     # Ignore all other buttons
     on_x_press = _ignore_event
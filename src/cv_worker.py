@@ -0,0 +1,220 @@
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Frame analysis (CV) off the camera loop. Frames are offered to a
+# single-slot mailbox: a frame not yet taken by a worker is replaced by the
+# newer one and counted as dropped, so the workers always analyse the latest
+# frame and a slow mode never builds up a backlog.
+
+
+class ModeStats:
+    """Processing time of one CV mode."""
+
+    __slots__ = ("frames", "total", "max")
+
+    def __init__(self) -> None:
+        self.frames: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def add(self, duration: float) -> None:
+        """
+        Count a processed frame.
+
+        Args:
+            duration: Seconds spent processing it.
+        """
+        self.frames += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    @property
+    def mean(self) -> float:
+        """Mean seconds per frame."""
+        return self.total / self.frames if self.frames else 0.0
+
+
+class CVWorker:
+    """
+    Long-lived worker threads processing the latest submitted frame.
+
+    `submit` never blocks: the frame goes into the mailbox, replacing any
+    frame no worker has taken yet. Each worker takes the mailbox's frame,
+    calls `process(frame, mode)` and waits for the next one. Processed and
+    dropped frames are counted, and processing time is kept per mode.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[np.ndarray, Any], None],
+        workers: int = 1,
+        name: str = "cv_worker",
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """
+        Start the workers.
+
+        Args:
+            process: Called on a worker thread with each frame taken and the
+                mode it was submitted with.
+            workers: Number of worker threads. More than one only helps if
+                `process` releases the GIL (e.g. OpenCV or model inference)
+                and can run concurrently with itself.
+            name: Worker thread name prefix.
+            clock: Time source for processing times.
+
+        Raises:
+            ValueError: If `workers` is not positive.
+        """
+        if workers <= 0:
+            raise ValueError("Number of workers must be positive.")
+        self.process = process
+        self._clock = clock
+        self._ready = threading.Condition()
+        self._slot: Optional[Tuple[int, Any, np.ndarray]] = None
+        self._ids = itertools.count()
+        self._idle: int = 0  # workers waiting for a frame
+        self.closed: bool = False
+        self.submitted: int = 0
+        self.processed: int = 0
+        self.dropped: int = 0
+        self.errors: int = 0
+        self.last_error: Optional[Exception] = None
+        self.last_id: Optional[int] = None
+        self.modes: Dict[Any, ModeStats] = {}
+        self._threads: List[threading.Thread] = [
+            threading.Thread(target=self._run, name=f"{name}_{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        frame: np.ndarray,
+        mode: Any = None,
+        frame_id: Optional[int] = None,
+        copy: bool = False,
+    ) -> int:
+        """
+        Offer a frame to the workers, replacing one not yet taken.
+
+        The frame is processed later on a worker thread, so the caller must
+        not modify it afterwards, unless it is submitted with `copy`.
+
+        Args:
+            frame: Frame to analyse.
+            mode: Passed to `process`; processing time is counted per mode.
+            frame_id: Frame sequence number, numbered from 0 if not given.
+            copy: Submit a copy of the frame, e.g. one about to be drawn on.
+                The copy is only made if a worker is waiting to take it;
+                otherwise the frame is dropped straight away, as it would
+                most likely be replaced before a worker got to it.
+
+        Returns:
+            int: The frame's ID.
+        """
+        if frame_id is None:
+            frame_id = next(self._ids)
+        if copy:
+            with self._ready:
+                if self.closed:
+                    return frame_id
+                if not self._idle:
+                    self.submitted += 1
+                    self.dropped += 1
+                    return frame_id
+            frame = frame.copy()
+        with self._ready:
+            if self.closed:
+                return frame_id
+            if self._slot is not None:
+                self.dropped += 1
+            self._slot = (frame_id, mode, frame)
+            self.submitted += 1
+            self._ready.notify()
+        return frame_id
+
+    def _run(self) -> None:
+        while True:
+            with self._ready:
+                self._idle += 1
+                self._ready.wait_for(lambda: self._slot is not None or self.closed)
+                self._idle -= 1
+                if self._slot is None:
+                    return  # closed
+                (frame_id, mode, frame), self._slot = self._slot, None
+            started: float = self._clock()
+            error: Optional[Exception] = None
+            try:
+                self.process(frame, mode)
+            except Exception as e:
+                error = e
+            duration: float = self._clock() - started
+            with self._ready:
+                self.processed += 1
+                self.last_id = frame_id
+                self.modes.setdefault(mode, ModeStats()).add(duration)
+                if error is not None:
+                    self.errors += 1
+                    self.last_error = error
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Frame counts and processing times.
+
+        Returns:
+            Dict[str, Any]: Frames submitted, processed and dropped, errors,
+            and per mode the frames processed and mean and max processing
+            time in seconds.
+        """
+        with self._ready:
+            return {
+                "submitted": self.submitted,
+                "processed": self.processed,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "modes": {
+                    mode: {"frames": stats.frames, "mean": stats.mean, "max": stats.max}
+                    for mode, stats in self.modes.items()
+                },
+            }
+
+    def summary(self) -> str:
+        """
+        Describe the frames processed and dropped and the time per mode.
+
+        Returns:
+            str: One line summary.
+        """
+        stats = self.stats()
+        modes = "; ".join(
+            f"{mode}: {mode_stats['frames']} frames, {mode_stats['mean'] * 1000:.1f} ms mean, "
+            f"{mode_stats['max'] * 1000:.1f} ms max"
+            for mode, mode_stats in stats["modes"].items()
+        )
+        return (
+            f"CV: {stats['processed']} of {stats['submitted']} frames processed, "
+            f"{stats['dropped']} dropped, {stats['errors']} errors"
+            + (f" ({modes})." if modes else ".")
+        )
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the workers after any frames being processed, dropping one not yet taken.
+
+        Args:
+            timeout: Seconds to wait for each worker.
+        """
+        with self._ready:
+            self.closed = True
+            if self._slot is not None:
+                self._slot = None
+                self.dropped += 1
+            self._ready.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
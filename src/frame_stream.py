@@ -0,0 +1,348 @@
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Frame delivery for camera consumers (CV, previews, snapshots). Frames are
+# copied once into preallocated pool buffers and shared by every consumer;
+# a buffer returns to the pool when the last consumer releases it.
+
+MODE_LATEST: str = "latest"
+MODE_EVERY: str = "every"
+
+
+class Frame:
+    """
+    A camera frame held in a pool buffer.
+
+    The buffer is reused once every holder has called `release`, so consumers
+    must not keep `array` after releasing the frame. Frames are context
+    managers that release themselves on exit:
+
+        with subscription.get() as frame:
+            process(frame.array)
+    """
+
+    __slots__ = ("id", "timestamp", "stream", "array", "_pool", "_index", "_refs")
+
+    def __init__(
+        self, pool: "FramePool", index: int, frame_id: int, timestamp: int, stream: str
+    ) -> None:
+        """
+        Initialise the Frame.
+
+        Args:
+            pool: Pool owning the buffer.
+            index: Buffer index in the pool.
+            frame_id: Camera frame sequence number, shared by every stream
+                captured from the same sensor frame.
+            timestamp: Sensor timestamp in nanoseconds (CLOCK_MONOTONIC).
+            stream: Name of the stream the frame came from, e.g. "main".
+        """
+        self.id: int = frame_id
+        self.timestamp: int = timestamp
+        self.stream: str = stream
+        self.array: np.ndarray = pool.buffers[index]
+        self._pool = pool
+        self._index: int = index
+        self._refs: int = 1
+
+    def retain(self) -> "Frame":
+        """Add a holder. Each `retain` must be matched by a `release`."""
+        with self._pool.lock:
+            self._refs += 1
+        return self
+
+    def release(self) -> None:
+        """
+        Drop a holder, returning the buffer to the pool after the last one.
+
+        Raises:
+            RuntimeError: If every holder has already released the frame.
+        """
+        with self._pool.lock:
+            if self._refs == 0:
+                raise RuntimeError(f"Frame {self.id} released more times than held.")
+            self._refs -= 1
+            if self._refs == 0:
+                self._pool.free.append(self._index)
+
+    def __enter__(self) -> "Frame":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.release()
+
+
+class FramePool:
+    """Fixed set of preallocated frame buffers with a LIFO free list."""
+
+    def __init__(self, shape: Tuple[int, ...], size: int, dtype: type = np.uint8) -> None:
+        """
+        Allocate the pool's buffers.
+
+        Args:
+            shape: Array shape of one frame.
+            size: Number of buffers.
+            dtype: Array element type.
+        """
+        self.buffers: List[np.ndarray] = [np.empty(shape, dtype) for _ in range(size)]
+        self.free: Deque[int] = deque(range(size))
+        self.lock = threading.Lock()
+
+    def acquire(self, frame_id: int, timestamp: int, stream: str) -> Optional[Frame]:
+        """
+        Take a free buffer for a new frame.
+
+        Args:
+            frame_id: Camera frame sequence number.
+            timestamp: Sensor timestamp in nanoseconds.
+            stream: Name of the stream the frame came from.
+
+        Returns:
+            Optional[Frame]: The frame, or None if every buffer is in use.
+        """
+        with self.lock:
+            if not self.free:
+                return None
+            index: int = self.free.pop()  # most recently released, still in cache
+        return Frame(self, index, frame_id, timestamp, stream)
+
+    @property
+    def in_use(self) -> int:
+        """Number of buffers currently held by consumers."""
+        return len(self.buffers) - len(self.free)
+
+
+class FrameSubscription:
+    """
+    A consumer's queue of frames from one camera stream.
+
+    In "latest" mode the subscription holds at most one frame: a new frame
+    replaces one not yet taken, so a slow consumer always gets the newest
+    frame. In "every" mode frames queue up to `maxsize`; frames arriving at a
+    full queue are dropped, since the camera thread must never block.
+    Dropped frames are counted in `dropped`.
+
+    Frames are taken with `get`, or by iterating until the subscription is
+    closed, and must be released by the consumer.
+    """
+
+    def __init__(self, stream: str, mode: str = MODE_LATEST, maxsize: int = 2) -> None:
+        """
+        Initialise the FrameSubscription.
+
+        Args:
+            stream: Name of the stream subscribed to.
+            mode: "latest" or "every".
+            maxsize: Queue length in "every" mode.
+
+        Raises:
+            ValueError: If `mode` is unknown.
+        """
+        if mode not in (MODE_LATEST, MODE_EVERY):
+            raise ValueError(f'Subscription mode must be "latest" or "every", not {mode!r}.')
+        self.stream: str = stream
+        self.mode: str = mode
+        self.maxsize: int = 1 if mode == MODE_LATEST else maxsize
+        self._frames: Deque[Frame] = deque()
+        self._ready = threading.Condition()
+        self.closed: bool = False
+        self.received: int = 0
+        self.dropped: int = 0
+
+    def put(self, frame: Frame) -> None:
+        """
+        Offer a frame to the consumer. Called on the camera thread; the
+        subscription takes its own hold on the frame if it keeps it.
+
+        Args:
+            frame: New frame.
+        """
+        stale: Optional[Frame] = None
+        with self._ready:
+            if self.closed:
+                return
+            if len(self._frames) >= self.maxsize:
+                self.dropped += 1
+                if self.mode == MODE_EVERY:
+                    return
+                stale = self._frames.popleft()
+            self._frames.append(frame.retain())
+            self.received += 1
+            self._ready.notify()
+        if stale is not None:
+            stale.release()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Frame]:
+        """
+        Take the next frame, waiting for one if none is queued.
+
+        Args:
+            timeout: Seconds to wait, or None to wait until a frame arrives
+                or the subscription is closed.
+
+        Returns:
+            Optional[Frame]: The frame, which the caller must release, or None
+            on timeout or once closed.
+        """
+        with self._ready:
+            if not self._ready.wait_for(lambda: self._frames or self.closed, timeout):
+                return None
+            if not self._frames:
+                return None
+            return self._frames.popleft()
+
+    def __iter__(self) -> Iterator[Frame]:
+        while True:
+            frame: Optional[Frame] = self.get()
+            if frame is None:
+                return
+            yield frame
+
+    def close(self) -> None:
+        """Stop receiving frames, releasing any not yet taken."""
+        with self._ready:
+            self.closed = True
+            frames, self._frames = self._frames, deque()
+            self._ready.notify_all()
+        for frame in frames:
+            frame.release()
+
+
+class FrameStream:
+    """
+    Delivers one camera stream's frames to its subscribers and callbacks.
+
+    Each captured frame is copied once into a pool buffer, and only if
+    anyone is listening. Callbacks run on the camera thread with a frame that
+    is released as soon as they return, so they must be quick and must
+    `retain` the frame to keep it.
+    """
+
+    def __init__(self, name: str, shape: Tuple[int, ...], pool_size: int) -> None:
+        """
+        Initialise the FrameStream.
+
+        Args:
+            name: Stream name, e.g. "main".
+            shape: Array shape of one frame.
+            pool_size: Number of preallocated frame buffers.
+        """
+        self.name: str = name
+        self.shape: Tuple[int, ...] = shape
+        self.pool = FramePool(shape, pool_size)
+        self.subscriptions: List[FrameSubscription] = []
+        self.callbacks: List[Callable[[Frame], None]] = []
+        self.frames: int = 0
+        self.delivered: int = 0
+        self.dropped: int = 0  # no free buffer
+        self._subscriber_dropped: int = 0  # by subscriptions since removed
+        self._first_timestamp: Optional[int] = None
+        self._last_timestamp: Optional[int] = None
+
+    def subscribe(self, mode: str = MODE_LATEST, maxsize: int = 2) -> FrameSubscription:
+        """
+        Add a subscriber.
+
+        Args:
+            mode: "latest" or "every", see `FrameSubscription`.
+            maxsize: Queue length in "every" mode.
+
+        Returns:
+            FrameSubscription: The new subscription.
+        """
+        subscription = FrameSubscription(self.name, mode, maxsize)
+        # Replaced rather than mutated, so the camera thread can iterate safely
+        self.subscriptions = self.subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: FrameSubscription) -> None:
+        """
+        Remove and close a subscriber.
+
+        Args:
+            subscription: Subscription returned by `subscribe`.
+        """
+        self.subscriptions = [s for s in self.subscriptions if s is not subscription]
+        subscription.close()
+        self._subscriber_dropped += subscription.dropped
+
+    def add_callback(self, callback: Callable[[Frame], None]) -> None:
+        """
+        Call `callback` with every frame, on the camera thread.
+
+        Args:
+            callback: Called with each frame.
+        """
+        self.callbacks = self.callbacks + [callback]
+
+    def remove_callback(self, callback: Callable[[Frame], None]) -> None:
+        """
+        Stop calling `callback`.
+
+        Args:
+            callback: Callback given to `add_callback`.
+        """
+        self.callbacks = [c for c in self.callbacks if c is not callback]
+
+    def publish(self, array: np.ndarray, frame_id: int, timestamp: int) -> None:
+        """
+        Copy a captured frame into the pool and hand it to every consumer.
+
+        Args:
+            array: Captured frame, only valid for the duration of the call.
+            frame_id: Camera frame sequence number.
+            timestamp: Sensor timestamp in nanoseconds.
+        """
+        self.frames += 1
+        if self._first_timestamp is None:
+            self._first_timestamp = timestamp
+        self._last_timestamp = timestamp
+        subscriptions = [s for s in self.subscriptions if not s.closed]
+        callbacks = self.callbacks
+        if not subscriptions and not callbacks:
+            return
+        frame: Optional[Frame] = self.pool.acquire(frame_id, timestamp, self.name)
+        if frame is None:
+            self.dropped += 1
+            return
+        np.copyto(frame.array, array)
+        self.delivered += 1
+        try:
+            for callback in callbacks:
+                callback(frame)
+            for subscription in subscriptions:
+                subscription.put(frame)
+        finally:
+            frame.release()
+
+    def close(self) -> None:
+        """Close every subscription."""
+        subscriptions, self.subscriptions = self.subscriptions, []
+        for subscription in subscriptions:
+            subscription.close()
+            self._subscriber_dropped += subscription.dropped
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Frame counts and rates for the stream.
+
+        Returns:
+            Dict[str, float]: Frames captured, delivered to consumers, dropped
+            for lack of a free buffer and dropped by subscribers, and the
+            captured and delivered frame rates measured by sensor timestamps.
+        """
+        fps: float = 0.0
+        if self.frames > 1 and self._last_timestamp > self._first_timestamp:
+            fps = (self.frames - 1) * 1e9 / (self._last_timestamp - self._first_timestamp)
+        return {
+            "frames": self.frames,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "subscriber_dropped": self._subscriber_dropped
+            + sum(s.dropped for s in self.subscriptions),
+            "fps": fps,
+            "delivered_fps": fps * self.delivered / self.frames if self.frames else 0.0,
+        }
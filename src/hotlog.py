@@ -0,0 +1,165 @@
+import logging
+import os
+import struct
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+# Logging helpers for code that runs on every control loop tick.
+
+
+class HotPathLogger:
+    """
+    Per-call-site rate limited debug logging with deferred formatting.
+
+    Call sites check `due` before building any log arguments, so a disabled
+    or rate limited site costs one attribute check and one method call:
+
+        if hotlog.enabled and hotlog.due("drive"):
+            logger.debug("speed: %s, turn: %s", speed, turn)
+
+    Messages use logging's %-style arguments so formatting happens later,
+    on the log writer thread rather than on the hot path.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        enabled: bool,
+        min_interval: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialise the HotPathLogger.
+
+        Args:
+            logger: Logger that receives the messages.
+            enabled: Whether hot-path debug logging is on at all.
+            min_interval: Minimum seconds between messages from one call site.
+            clock: Monotonic time source.
+        """
+        self.logger = logger
+        self.enabled: bool = enabled
+        self.min_interval: float = min_interval
+        self._clock = clock
+        self._last: Dict[str, float] = {}
+        self.suppressed: Dict[str, int] = {}
+
+    def due(self, site: str) -> bool:
+        """
+        Check whether a call site may log now, and if so mark it as logged.
+
+        Args:
+            site: Name identifying the call site.
+
+        Returns:
+            bool: True if the call site should log.
+        """
+        if not self.enabled:
+            return False
+        now: float = self._clock()
+        last: float = self._last.get(site, float("-inf"))
+        if now - last < self.min_interval:
+            self.suppressed[site] = self.suppressed.get(site, 0) + 1
+            return False
+        self._last[site] = now
+        return True
+
+    def debug(self, site: str, msg: str, *args: Any) -> None:
+        """
+        Log a debug message if the call site is due.
+
+        Args:
+            site: Name identifying the call site.
+            msg: %-style message format.
+            *args: Message arguments, formatted only if the message is written.
+        """
+        if self.enabled and self.due(site):
+            self.logger.debug(msg, *args)
+
+
+class DriveRing:
+    """
+    Fixed-size binary ring buffer of recent drive decisions.
+
+    Each record is (time, speed, turn, r_speed, l_speed) packed into a
+    preallocated buffer, so recording allocates nothing. The buffer is only
+    written to disk by `dump`, e.g. on error or shutdown.
+    """
+
+    RECORD = struct.Struct("<d4f")
+    MAGIC = b"UGVDRV1\n"
+
+    def __init__(self, size: int) -> None:
+        """
+        Initialise the DriveRing.
+
+        Args:
+            size: Number of records to keep.
+        """
+        if size <= 0:
+            raise ValueError("Ring size must be positive.")
+        self.size: int = size
+        self._buffer = bytearray(self.RECORD.size * size)
+        self._next: int = 0
+        self.count: int = 0
+
+    def record(
+        self, t: float, speed: float, turn: float, r_speed: float, l_speed: float
+    ) -> None:
+        """
+        Record a drive decision, overwriting the oldest when full.
+
+        Args:
+            t: Monotonic time of the decision.
+            speed: Requested speed.
+            turn: Requested turn value.
+            r_speed: Speed sent for the right track.
+            l_speed: Speed sent for the left track.
+        """
+        self.RECORD.pack_into(
+            self._buffer, self._next * self.RECORD.size, t, speed, turn, r_speed, l_speed
+        )
+        self._next = (self._next + 1) % self.size
+        self.count += 1
+
+    def dump(self, path: str) -> int:
+        """
+        Write the buffered records, oldest first, to a file.
+
+        Args:
+            path: Destination file.
+
+        Returns:
+            int: Number of records written.
+        """
+        held: int = min(self.count, self.size)
+        split: int = (self._next if self.count >= self.size else 0) * self.RECORD.size
+        end: int = held * self.RECORD.size if self.count < self.size else len(self._buffer)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as dump_file:
+            dump_file.write(self.MAGIC)
+            dump_file.write(self._buffer[split:end])
+            dump_file.write(self._buffer[:split])
+        return held
+
+    @classmethod
+    def load(cls, path: str) -> List[Tuple[float, float, float, float, float]]:
+        """
+        Read records written by `dump`.
+
+        Args:
+            path: Dump file.
+
+        Returns:
+            List[Tuple[float, float, float, float, float]]: Records, oldest first.
+
+        Raises:
+            ValueError: If the file is not a drive ring dump.
+        """
+        with open(path, "rb") as dump_file:
+            if dump_file.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"{path} is not a drive ring dump.")
+            data: bytes = dump_file.read()
+        return list(cls.RECORD.iter_unpack(data))
@@ -0,0 +1,31 @@
+from typing import Tuple, Union
+
+import numpy as np
+
+# Vectorised drive kinematics for offline analysis and simulation.
+
+
+def calculate_track_speeds_batch(
+    speed: Union[np.ndarray, float], turn: Union[np.ndarray, float]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorised counterpart of `UGVSystem._calculate_track_speeds`.
+
+    Evaluates many speed/turn samples at once with identical semantics,
+    including the element order: the first array holds the values the scalar
+    version returns first (which `UGVSystem._drive` sends as the right track),
+    the second array those it returns second (sent as the left track).
+
+    Args:
+        speed: Overall speeds, ranging from -0.5 (reverse) to +0.5 (forward).
+        turn: Turning values, ranging from -1 (sharp left) to +1 (sharp right).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The first and second track speeds.
+    """
+    speed = np.asarray(speed, dtype=np.float64)
+    turn = np.asarray(turn, dtype=np.float64)
+    # Turning right scales the first value down, turning left the second.
+    # Stationary or straight samples fall through to speed for both.
+    first: np.ndarray = np.where(turn > 0.0, speed * (1 - turn), speed)
+    second: np.ndarray = np.where(turn < 0.0, speed * (1 + turn), speed)
+    return first, second
@@ -1,18 +1,371 @@
+import atexit
+import copy
+import glob
+import gzip
 import logging
+import logging.handlers
+import os
+import queue
 import random
-from termcolor import colored
+import shutil
+import threading
+import time
+from dataclasses import replace
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+from config.schema import Config, LoggingConfig, as_config
+
+# All loggers created by customLogger share one bounded queue, drained by a
+# single background thread that does the formatting and I/O. Callers only pay
+# for an enqueue; when the queue is full the record is dropped and counted.
+LOG_QUEUE_SIZE: int = 10000
+LOG_FORMAT: str = "{asctime} - {name} - {levelname} - {message}"
+LOG_DATEFMT: str = "%Y-%m-%d %H:%M:%S"
+COLOURS = ["red", "green", "yellow", "blue", "magenta", "cyan"]
+# Rotation defaults come from the logging_config schema.
+_ROTATION_DEFAULTS: LoggingConfig = LoggingConfig()
+
+
+class ColouredFormatter(logging.Formatter):
+    """Formatter that colours the whole line."""
+
+    def __init__(self, colour: str) -> None:
+        super().__init__(LOG_FORMAT, style="{", datefmt=LOG_DATEFMT)
+        self.colour = colour
+        self._colored = None  # termcolor is imported on first use
+
+    def format(self, record: logging.LogRecord) -> str:
+        if self._colored is None:
+            from termcolor import colored
+
+            self._colored = colored
+        log_message = super().format(record)
+        colored_message = self._colored(log_message, self.colour)
+        return colored_message
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks the caller; drops records when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self._lock_dropped = threading.Lock()
+        self.dropped: int = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Queue the record with its message and arguments untouched, so merging
+        them and line formatting both happen on the listener thread.
+
+        Arguments are read when the record is written, so callers must not
+        mutate them after logging; pass immutable values on hot paths.
+        """
+        return copy.copy(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock_dropped:
+                self.dropped += 1
+
+
+class _LogCompressor:
+    """
+    Background thread that gzips rotated log files and prunes old ones.
+
+    Runs at the lowest CPU priority so compression never competes with the
+    control loop.
+    """
+
+    def __init__(self) -> None:
+        self.jobs: queue.Queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="log_compressor", daemon=True)
+        self.thread.start()
+
+    def submit(self, path: str, base_filename: str, backup_count: int) -> None:
+        """
+        Queue a rotated log file for compression and retention.
+
+        Args:
+            path: Rotated log file to compress.
+            base_filename: Live log file the rotated file came from.
+            backup_count: Number of rotated files to keep.
+        """
+        self.jobs.put((path, base_filename, backup_count))
+
+    def wait(self) -> None:
+        """Block until every queued file has been handled."""
+        self.jobs.join()
+
+    def _run(self) -> None:
+        try:
+            # On Linux this lowers the priority of this thread only.
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except (AttributeError, OSError):
+            pass
+        while True:
+            path, base_filename, backup_count = self.jobs.get()
+            try:
+                self._compress(path)
+                self._prune(base_filename, backup_count)
+            except OSError:
+                pass  # a failed compression leaves the plain file behind
+            finally:
+                self.jobs.task_done()
+
+    @staticmethod
+    def _compress(path: str) -> None:
+        if not os.path.exists(path):
+            return
+        tmp_path: str = path + ".gz.tmp"
+        with open(path, "rb") as source, gzip.open(tmp_path, "wb") as target:
+            shutil.copyfileobj(source, target)
+        os.replace(tmp_path, path + ".gz")
+        os.remove(path)
+
+    @staticmethod
+    def _prune(base_filename: str, backup_count: int) -> None:
+        rotated: List[str] = rotated_logs(base_filename)
+        for old in rotated[: max(0, len(rotated) - backup_count)]:
+            os.remove(old)
+
+
+_compressor: Optional[_LogCompressor] = None
+_compressor_lock = threading.Lock()
+
+
+def _shared_compressor() -> _LogCompressor:
+    """Return the one compressor thread shared by every log file, starting it if needed."""
+    global _compressor
+    with _compressor_lock:
+        if _compressor is None:
+            _compressor = _LogCompressor()
+        return _compressor
+
+
+def rotated_logs(base_filename: str) -> List[str]:
+    """List rotated log files for a log, oldest first.
+
+    Args:
+        base_filename: Path of the live log file.
+
+    Returns:
+        List[str]: Rotated files, compressed or not yet compressed.
+    """
+    return sorted(
+        (
+            path
+            for path in glob.glob(glob.escape(base_filename) + ".*")
+            if not path.endswith(".tmp")
+        ),
+        key=lambda path: path[: -len(".gz")] if path.endswith(".gz") else path,
+    )
+
+
+class SizeTimedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    File handler that rotates when the file reaches `max_bytes` or has been
+    open for `interval` seconds, whichever comes first.
+
+    Rotated files are renamed with a timestamp suffix and handed to a
+    background thread for gzip compression and pruning to `backup_count`,
+    so the writer only pays for a rename.
+    """
+
+    def __init__(
+        self, filename: str, max_bytes: int, interval: float, backup_count: int
+    ) -> None:
+        """
+        Initialise the handler.
+
+        Args:
+            filename: Path of the live log file.
+            max_bytes: Rotate before the file exceeds this size (0 disables).
+            interval: Rotate after this many seconds (0 disables).
+            backup_count: Number of rotated files to keep.
+        """
+        directory: str = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        super().__init__(
+            filename, mode="a", maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        self.interval: float = interval
+        self.rollover_at: float = self._next_rollover()
+        self._last_stamp: str = ""
+        self._next_suffix: int = 0
+        self.compressor = _shared_compressor()
+        # Finish anything left uncompressed by a previous run.
+        for leftover in rotated_logs(self.baseFilename):
+            if not leftover.endswith(".gz"):
+                self.compressor.submit(leftover, self.baseFilename, backup_count)
+
+    def _next_rollover(self) -> float:
+        return time.time() + self.interval if self.interval > 0 else float("inf")
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if time.time() >= self.rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename):
+            stamp: str = time.strftime("%Y%m%d-%H%M%S")
+            if stamp != self._last_stamp:
+                self._last_stamp, self._next_suffix = stamp, 0
+            # Suffixes keep counting up within a second, even once earlier
+            # files are pruned, so names always sort in rotation order.
+            suffix: int = self._next_suffix
+            while True:
+                # Zero padded so rotations within one second sort in order
+                rotated: str = f"{self.baseFilename}.{stamp}" + (
+                    f"-{suffix:03d}" if suffix else ""
+                )
+                if not (os.path.exists(rotated) or os.path.exists(rotated + ".gz")):
+                    break
+                suffix += 1
+            self._next_suffix = suffix + 1
+            os.rename(self.baseFilename, rotated)
+            self.compressor.submit(rotated, self.baseFilename, self.backupCount)
+        self.stream = self._open()
+        self.rollover_at = self._next_rollover()
+
+
+class _DispatchHandler(logging.Handler):
+    """Routes each record to the handlers registered for its logger."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.routes: Dict[str, Dict[str, logging.Handler]] = {}
+        self._reported_dropped: int = 0
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        dropped: int = _queue_handler.dropped
+        if dropped != self._reported_dropped:
+            lost: int = dropped - self._reported_dropped
+            self._reported_dropped = dropped
+            self._dispatch(
+                logging.makeLogRecord(
+                    {
+                        "name": record.name,
+                        "levelno": logging.WARNING,
+                        "levelname": "WARNING",
+                        "msg": f"Log queue full, dropped {lost} records.",
+                    }
+                )
+            )
+        self._dispatch(record)
+        return True
+
+    def _dispatch(self, record: logging.LogRecord) -> None:
+        for handler in list(self.routes.get(record.name, {}).values()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+class _BlockingSentinelListener(logging.handlers.QueueListener):
+    """QueueListener that waits for room to enqueue its stop sentinel."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+_log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+_queue_handler = DroppingQueueHandler(_log_queue)
+_dispatcher = _DispatchHandler()
+_file_handlers: Dict[str, SizeTimedRotatingFileHandler] = {}
+_listener: Optional[_BlockingSentinelListener] = None
+_setup_lock = threading.Lock()
+
+
+def _ensure_listener() -> None:
+    """Start the background writer thread if it is not running."""
+    global _listener
+    if _listener is None:
+        _listener = _BlockingSentinelListener(_log_queue, _dispatcher)
+        _listener.start()
+        atexit.register(stop_logging)
+
+
+def flush_logs() -> None:
+    """Block until every queued record has been written."""
+    if _listener is not None:
+        _log_queue.join()
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the background writer thread."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        for file_handler in _file_handlers.values():
+            file_handler.flush()
+
+
+def isolated_logging(config: Union[Config, Mapping[str, Any]], log_dir: str) -> Config:
+    """
+    Move a configuration's log file and drive ring dump into their own directory.
+
+    Simulated and test runs use this so they never append to the rover's log
+    or overwrite the drive ring dump of its last real run.
+
+    Args:
+        config: System configuration.
+        log_dir: Directory for the log and dump; the caller removes it.
+
+    Returns:
+        Config: The configuration with the moved paths.
+    """
+    config = as_config(config)
+    logging_config = replace(
+        config.logging_config,
+        LOG_FILE=os.path.join(log_dir, "app.log"),
+        DRIVE_RING_PATH=os.path.join(log_dir, "drive_ring.bin"),
+    )
+    return replace(config, logging_config=logging_config)
+
+
+def dropped_log_records() -> int:
+    """
+    Returns:
+        int: Number of records dropped because the log queue was full.
+    """
+    return _queue_handler.dropped
 
 
 class customLogger:
-    def __new__(cls, name: str, log_file: str, debug: bool) -> logging.Logger:
+    def __new__(
+        cls,
+        name: str,
+        log_file: str,
+        debug: bool,
+        max_bytes: int = _ROTATION_DEFAULTS.MAX_BYTES,
+        rotate_interval: float = _ROTATION_DEFAULTS.ROTATE_INTERVAL,
+        backup_count: int = _ROTATION_DEFAULTS.BACKUP_COUNT,
+    ) -> logging.Logger:
         """
-        Create a custom logger with both console and file handlers.
+        Create a custom logger with both console and file output.
+
+        Records are handed to a shared background thread, so logging never
+        does formatting or I/O on the calling thread. Calling this again for
+        the same name does not add duplicate output, and with another
+        `log_file` moves the logger to that file. The log file is rotated
+        by size and age, and rotated files are compressed in the background.
 
         Args:
             cls: The class being instantiated.
             name: Name for the logger.
             log_file: Path to the log file.
             debug: Whether to enable debug-level logging.
+            max_bytes: Rotate the log file before it exceeds this size (0 disables).
+            rotate_interval: Rotate the log file after this many seconds (0 disables).
+            backup_count: Number of rotated log files to keep.
 
         Returns:
             logger: Configured logger instance.
@@ -20,42 +373,44 @@ class customLogger:
         logger = logging.getLogger(name)
         logger.setLevel(logging.DEBUG)
 
-        # Create a console handler to output logs to the console
-        console_handler = logging.StreamHandler()
-        # Create a file handler to save logs to a file
-        file_handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
+        with _setup_lock:
+            routes: Dict[str, logging.Handler] = _dispatcher.routes.setdefault(name, {})
 
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+            console_handler = routes.get("console")
+            if console_handler is None:
+                # Create a console handler with a random colour per logger
+                console_handler = logging.StreamHandler()
+                console_handler.setFormatter(ColouredFormatter(random.choice(COLOURS)))
+                routes["console"] = console_handler
+            console_handler.setLevel(logging.DEBUG if debug else logging.INFO)
 
-        # Log format for both handlers
-        formatter = logging.Formatter(
-            "{asctime} - {name} - {levelname} - {message}",
-            style="{",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-
-        # Pick a random color from the COLOURS list for console output
-        colour: str = random.choice(
-            ["red", "green", "yellow", "blue", "magenta", "cyan"]
-        )
+            # One file per logger: pointing it at another file replaces the route
+            log_path: str = os.path.abspath(log_file)
+            previous: Optional[logging.Handler] = routes.get("file")
+            if previous is None or previous.baseFilename != log_path:
+                if previous is not None:
+                    flush_logs()  # records already queued go to the old file
+                # File handlers are shared by every logger writing to the same file
+                file_handler = _file_handlers.get(log_path)
+                if file_handler is None:
+                    file_handler = SizeTimedRotatingFileHandler(
+                        log_file, max_bytes, rotate_interval, backup_count
+                    )
+                    file_handler.setFormatter(
+                        logging.Formatter(LOG_FORMAT, style="{", datefmt=LOG_DATEFMT)
+                    )
+                    file_handler.setLevel(logging.DEBUG)
+                    _file_handlers[log_path] = file_handler
+                routes["file"] = file_handler
+                if previous is not None and not any(
+                    logger_routes.get("file") is previous
+                    for logger_routes in _dispatcher.routes.values()
+                ):
+                    _file_handlers.pop(previous.baseFilename, None)
+                    previous.close()
 
-        # Create a custom formatter with color
-        class ColouredFormatter(logging.Formatter):
-            def format(self, record: logging.LogRecord) -> str:
-                log_message = super().format(record)
-                colored_message = colored(log_message, colour)
-                return colored_message
-
-        # Configure console handler formatter with color
-        colored_formatter = ColouredFormatter(
-            "{asctime} - {name} - {levelname} - {message}",
-            style="{",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        console_handler.setFormatter(colored_formatter)
-        console_handler.setLevel(logging.DEBUG if debug else logging.INFO)
-        file_handler.setFormatter(formatter)
-        file_handler.setLevel(logging.DEBUG)
+            if _queue_handler not in logger.handlers:
+                logger.addHandler(_queue_handler)
+            _ensure_listener()
 
         return logger
@@ -0,0 +1,106 @@
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Overlays drawn by CV (boxes, lines, text) over the video. CV draws into a
+# full-frame buffer that is mostly black; each update is turned once into a
+# layer holding only the drawn region, so compositing a frame touches just
+# that region instead of masking and blending the whole frame.
+
+
+class OverlayLayer(NamedTuple):
+    """An overlay's drawn region, ready to composite."""
+
+    version: int
+    box: Optional[Tuple[int, int, int, int]]  # x, y, width, height; None if nothing drawn
+    pixels: Optional[np.ndarray]  # composited values within `box`
+    mask: Optional[np.ndarray]  # where `pixels` replace the frame, within `box`
+
+
+def make_layer(image: np.ndarray, version: int = 0) -> OverlayLayer:
+    """
+    Build a layer from a full-frame overlay, black where nothing is drawn.
+
+    Drawn channels replace the frame's at double intensity (saturating),
+    matching the earlier masked copy followed by
+    `cv2.addWeighted(overlay, 1, frame, 1, 0)` over the whole frame.
+
+    Args:
+        image: Overlay, the same shape as the frames.
+        version: Version number of the update.
+
+    Returns:
+        OverlayLayer: The layer.
+    """
+    # Maxima along whole rows and columns reduce far faster than a per-pixel mask
+    rows: np.ndarray = np.flatnonzero(image.reshape(image.shape[0], -1).max(axis=1))
+    if not len(rows):
+        return OverlayLayer(version, None, None, None)
+    columns: np.ndarray = image.max(axis=0)
+    if columns.ndim == 2:
+        columns = columns.max(axis=1)
+    columns = np.flatnonzero(columns)
+    x, y = int(columns[0]), int(rows[0])
+    width, height = int(columns[-1]) - x + 1, int(rows[-1]) - y + 1
+    crop: np.ndarray = image[y : y + height, x : x + width]
+    return OverlayLayer(version, (x, y, width, height), cv2.add(crop, crop), crop != 0)
+
+
+class OverlayLayers:
+    """
+    Named overlay layers composited onto each frame.
+
+    Layers are replaced whole by `set`, which may run on a CV thread while
+    another thread composites, and are composited in the order first set.
+    """
+
+    def __init__(self) -> None:
+        """Initialise the OverlayLayers, with no layers."""
+        self.layers: Dict[str, OverlayLayer] = {}
+        self.version: int = 0
+        self._lock = threading.Lock()
+
+    def set(self, name: str, image: Optional[np.ndarray]) -> OverlayLayer:
+        """
+        Replace a layer with a new overlay.
+
+        Args:
+            name: Layer name, e.g. "cv".
+            image: Full-frame overlay, black where nothing is drawn, or None
+                to clear the layer.
+
+        Returns:
+            OverlayLayer: The new layer.
+        """
+        with self._lock:
+            self.version += 1
+            version: int = self.version
+        if image is None:
+            layer = OverlayLayer(version, None, None, None)
+        else:
+            layer = make_layer(image, version)
+        with self._lock:
+            # replaced, not updated, so composite can iterate without the lock
+            self.layers = {**self.layers, name: layer}
+        return layer
+
+    def clear(self) -> None:
+        """Remove every layer."""
+        with self._lock:
+            self.version += 1
+            self.layers = {}
+
+    def composite(self, frame: np.ndarray) -> None:
+        """
+        Draw every layer onto a frame in place.
+
+        Args:
+            frame: Frame, the same shape as the overlays.
+        """
+        for layer in self.layers.values():
+            if layer.box is None:
+                continue
+            x, y, width, height = layer.box
+            np.copyto(frame[y : y + height, x : x + width], layer.pixels, where=layer.mask)
@@ -0,0 +1,75 @@
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+# Real-time scheduling helpers for latency sensitive threads (Linux only).
+
+
+def apply_realtime(
+    cpus: Optional[Iterable[int]] = None, priority: Optional[int] = None
+) -> Dict[str, Any]:
+    """Pin the calling thread to CPUs and raise it to SCHED_FIFO.
+
+    Each setting is applied independently and falls back cleanly: if the
+    platform does not support it or permission is denied, the thread keeps
+    its current affinity or scheduling class and the reason is reported.
+
+    Args:
+        cpus: CPUs to pin the thread to, or None to leave affinity alone.
+        priority: SCHED_FIFO priority (1-99), or None to leave scheduling alone.
+
+    Returns:
+        Dict[str, Any]: What was applied: thread name, "cpus" (the resulting
+        affinity or None), "policy" ("SCHED_FIFO" or "default"), "priority"
+        and "errors" (reasons for any fallback).
+    """
+    report: Dict[str, Any] = {
+        "thread": threading.current_thread().name,
+        "cpus": None,
+        "policy": "default",
+        "priority": None,
+        "errors": [],
+    }
+
+    if cpus is not None:
+        try:
+            # On Linux pid 0 refers to the calling thread, not the whole process.
+            os.sched_setaffinity(0, set(cpus))
+            report["cpus"] = sorted(os.sched_getaffinity(0))
+        except AttributeError:
+            report["errors"].append("CPU affinity not supported on this platform")
+        except OSError as e:
+            report["errors"].append(f"CPU affinity {sorted(cpus)} rejected: {e.strerror}")
+
+    if priority is not None:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+            report["policy"] = "SCHED_FIFO"
+            report["priority"] = priority
+        except AttributeError:
+            report["errors"].append("SCHED_FIFO not supported on this platform")
+        except OSError as e:
+            report["errors"].append(f"SCHED_FIFO priority {priority} rejected: {e.strerror}")
+
+    return report
+
+
+def describe_realtime(report: Dict[str, Any]) -> str:
+    """Describe an `apply_realtime` report for logging.
+
+    Args:
+        report: Report returned by `apply_realtime`.
+
+    Returns:
+        str: One line summary.
+    """
+    cpus: str = f"CPUs {report['cpus']}" if report["cpus"] is not None else "all CPUs"
+    policy: str = (
+        f"SCHED_FIFO priority {report['priority']}"
+        if report["policy"] == "SCHED_FIFO"
+        else "default scheduling"
+    )
+    summary: str = f"Realtime: {report['thread']} thread on {cpus} with {policy}."
+    if report["errors"]:
+        summary += " Fell back: " + "; ".join(report["errors"]) + "."
+    return summary
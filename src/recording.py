@@ -0,0 +1,860 @@
+import bisect
+import operator
+import os
+import queue
+import re
+import struct
+import subprocess
+import threading
+import time
+from collections import deque
+from fractions import Fraction
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+)
+
+# Recording from an always-running H.264 encoder. The encoder's output keeps
+# the last few seconds in memory, so a recording starts with what happened
+# before it was asked for, and without waiting for the encoder to start.
+
+
+class EncodedFrame(NamedTuple):
+    """One encoded H.264 frame (Annex B), as produced by the encoder."""
+
+    data: bytes
+    keyframe: bool
+    timestamp: int  # microseconds, relative to the encoder's first frame
+
+
+class StreamSink:
+    """
+    Destination for a recording's encoded frames.
+
+    `write` only queues the frame, so it is safe to call from the encoder's
+    thread; frames are written in order by the sink's own writer thread.
+    The queue holds `QUEUE_FRAMES` frames, more than a full pre-roll. If the
+    destination falls that far behind, frames are dropped and counted in
+    `queue_dropped` rather than blocking the encoder, and so are the frames
+    after a drop up to the next keyframe, since they cannot be decoded.
+    Frames are written from one thread at a time. Subclasses implement
+    `_write` and `_close`.
+    """
+
+    QUEUE_FRAMES: int = 1024
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Start the writer thread.
+
+        Args:
+            clock: Monotonic time source, for latency measurements.
+        """
+        self._clock = clock
+        self._queue: "queue.Queue[Optional[EncodedFrame]]" = queue.Queue(self.QUEUE_FRAMES)
+        self.queue_dropped: int = 0
+        self._resync: bool = False  # dropping until the next keyframe
+        self.frames: int = 0
+        self.bytes: int = 0
+        self.first_write_at: Optional[float] = None
+        self.error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._run, name="recording_sink", daemon=True)
+        self._thread.start()
+
+    def write(self, frame: EncodedFrame) -> bool:
+        """
+        Queue a frame to be written.
+
+        Args:
+            frame: Encoded frame.
+
+        Returns:
+            bool: Whether the frame was queued, rather than dropped.
+        """
+        if self._resync and not frame.keyframe:
+            self.queue_dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(frame)
+        except queue.Full:
+            self.queue_dropped += 1
+            self._resync = True
+            return False
+        self._resync = False
+        return True
+
+    def _run(self) -> None:
+        while True:
+            frame: Optional[EncodedFrame] = self._queue.get()
+            if frame is None:
+                break
+            if self.error is not None:
+                continue  # keep draining, so close() does not hang
+            try:
+                self._write(frame)
+            except Exception as e:
+                self.error = e
+                continue
+            if self.first_write_at is None:
+                self.first_write_at = self._clock()
+            self.frames += 1
+            self.bytes += len(frame.data)
+        try:
+            self._close()
+        except Exception as e:
+            self.error = self.error or e
+
+    def close(self) -> None:
+        """Write any queued frames, then close the destination."""
+        self._queue.put(None)  # waits for room; the writer thread is draining
+        self._thread.join()
+
+    def _write(self, frame: EncodedFrame) -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        raise NotImplementedError
+
+
+class H264FileSink(StreamSink):
+    """Writes the raw H.264 elementary stream to a file."""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Open the file.
+
+        Args:
+            path: File to write, e.g. "video.h264".
+            clock: Monotonic time source, for latency measurements.
+        """
+        self.path: str = path
+        self._file: BinaryIO = open(path, "wb")
+        super().__init__(clock)
+
+    def _write(self, frame: EncodedFrame) -> None:
+        self._file.write(frame.data)
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class FfmpegSink(StreamSink):
+    """
+    Remuxes the H.264 stream into a container (e.g. MP4) with an ffmpeg
+    process, without re-encoding.
+
+    A raw H.264 pipe carries no timestamps, so frames are timed at a
+    constant `fps`. Wallclock timestamps, as picamera2's FfmpegOutput uses,
+    would squash the pre-roll, which is written all at once.
+    """
+
+    def __init__(
+        self, path: str, fps: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Start ffmpeg.
+
+        Args:
+            path: Output file; the container is chosen from its extension.
+            fps: Frame rate of the stream.
+            clock: Monotonic time source, for latency measurements.
+        """
+        self.path: str = path
+        # fmt: off
+        command = [
+            "ffmpeg", "-loglevel", "warning", "-y",
+            "-f", "h264", "-framerate", f"{fps:g}", "-i", "-",
+            "-c:v", "copy", path,
+        ]
+        # fmt: on
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        super().__init__(clock)
+
+    def _write(self, frame: EncodedFrame) -> None:
+        self._process.stdin.write(frame.data)
+
+    def _close(self) -> None:
+        self._process.stdin.close()
+        self._process.wait()
+
+
+class Mp4Sink(StreamSink):
+    """
+    Muxes the H.264 stream into a fragmented MP4 file in process, with
+    PyAV, without re-encoding.
+
+    Frames keep the encoder's timestamps (relative to the first frame
+    written), so the pre-roll and any dropped frames are timed as they were
+    captured. Each keyframe starts a new fragment, so a file cut short by a
+    crash or power loss still plays up to its last keyframe. The stream's
+    parameters are read from the first keyframe's SPS/PPS headers; frames
+    before it cannot be decoded and are counted in `skipped`.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Open the file.
+
+        Args:
+            path: Output file, e.g. "video.mp4". Other extensions (e.g.
+                ".mkv") choose their container but are not fragmented.
+            clock: Monotonic time source, for latency measurements.
+        """
+        import av
+
+        self.path: str = path
+        options: Dict[str, str] = {}
+        if os.path.splitext(path)[1].lower() in (".mp4", ".mov", ".m4v"):
+            options["movflags"] = "frag_keyframe+empty_moov+default_base_moof"
+        self._container: Any = av.open(path, "w", options=options)
+        self._stream: Any = None
+        # The muxer picks the stream's own time base when the header is written
+        self._time_base = Fraction(1, 1_000_000)
+        self._first_timestamp: int = 0
+        self.skipped: int = 0
+        self._keyframe_seen: bool = False
+        super().__init__(clock)
+
+    def _add_stream(self, keyframe: bytes) -> None:
+        """Add the video stream, with parameters parsed from a keyframe's headers."""
+        import io
+
+        import av
+
+        with av.open(io.BytesIO(keyframe), format="h264") as probe:
+            template = probe.streams.video[0]
+            # Copies the codec parameters without opening an encoder
+            add = getattr(self._container, "add_stream_from_template", None)
+            if add is not None:
+                self._stream = add(template)
+            else:  # PyAV < 12
+                self._stream = self._container.add_stream(template=template)
+        self._stream.time_base = self._time_base
+
+    def write(self, frame: EncodedFrame) -> bool:
+        if not self._keyframe_seen:
+            if not frame.keyframe:
+                self.skipped += 1
+                return False
+            self._keyframe_seen = True
+        return super().write(frame)
+
+    def _write(self, frame: EncodedFrame) -> None:
+        import av
+
+        # The first frame queued is a keyframe: frames before one are skipped
+        # in `write`, and after a dropped frame the queue resumes at one.
+        if self._stream is None:
+            self._add_stream(frame.data)
+            self._first_timestamp = frame.timestamp
+        packet = av.Packet(frame.data)
+        packet.stream = self._stream
+        packet.time_base = self._time_base
+        packet.pts = packet.dts = frame.timestamp - self._first_timestamp
+        packet.is_keyframe = frame.keyframe
+        self._container.mux(packet)
+
+    def _close(self) -> None:
+        self._container.close()
+
+
+class IndexRecord(NamedTuple):
+    """One recorded frame in a frame index."""
+
+    sequence: int  # frame number in the recording file, from 0
+    timestamp: int  # sensor timestamp in nanoseconds (CLOCK_MONOTONIC)
+    pts: int  # microseconds from the file's first frame
+    keyframe: bool
+
+
+class IndexedSink(StreamSink):
+    """
+    Writes a sidecar index of each recorded frame's sequence number and
+    sensor timestamp alongside another sink's recording.
+
+    Sensor timestamps are on CLOCK_MONOTONIC, the clock of `time.monotonic`
+    and so of the drive commands in a `DriveRing` dump: a frame's
+    `timestamp / 1e9` compares directly with a drive record's time. With
+    `find_frame`, a recording can be seeked to a telemetry event, and
+    glass-to-command latency computed, without decoding the video.
+
+    The index is a fixed-size binary record per frame after a magic header,
+    read back with `load`. Only frames the wrapped sink takes are indexed, so
+    frames it skips (e.g. before an MP4's first keyframe) or drops do not
+    shift the sequence numbers. Frames always reach the wrapped sink: if indexing
+    fails, e.g. the encoder's start time is unknown, the index stops where
+    it got to and the reason is kept in `index_error`.
+    """
+
+    RECORD = struct.Struct("<IqqB")
+    MAGIC = b"UGVIDX1\n"
+
+    def __init__(
+        self,
+        sink: StreamSink,
+        path: str,
+        epoch: Callable[[], Optional[int]],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Open the index file.
+
+        Args:
+            sink: Sink writing the recording itself; closed with this one.
+            path: Index file, e.g. "video_000.idx".
+            epoch: Returns the sensor timestamp in nanoseconds of the
+                encoder's first frame, which frame timestamps are relative
+                to, or None if not known yet.
+            clock: Monotonic time source, for latency measurements.
+        """
+        self.sink = sink
+        self.path: str = path
+        self._epoch = epoch
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        self._file.write(self.MAGIC)
+        self.index_error: Optional[Exception] = None
+        self._epoch_ns: Optional[int] = None
+        self._first_timestamp: int = 0
+        self._sequence: int = 0
+        super().__init__(clock)
+
+    def _write(self, frame: EncodedFrame) -> None:
+        if not self.sink.write(frame):
+            return  # not in the recording, so not indexed
+        if self._file is None:
+            return  # indexing stopped
+        try:
+            self._index(frame)
+        except Exception as e:
+            self.index_error = e
+            self._file.close()
+            self._file = None
+
+    def _index(self, frame: EncodedFrame) -> None:
+        if self._epoch_ns is None:
+            self._epoch_ns = self._epoch()
+            if self._epoch_ns is None:
+                raise RuntimeError("Encoder start time unknown, cannot index frames.")
+            self._first_timestamp = frame.timestamp
+        self._file.write(
+            self.RECORD.pack(
+                self._sequence,
+                self._epoch_ns + frame.timestamp * 1000,
+                frame.timestamp - self._first_timestamp,
+                frame.keyframe,
+            )
+        )
+        self._sequence += 1
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        if self._sequence == 0:
+            try:
+                os.remove(self.path)  # nothing indexed, e.g. an unused segment
+            except OSError:
+                pass
+        self.sink.close()
+        self.error = self.error or self.sink.error
+
+    @classmethod
+    def load(cls, path: str) -> List[IndexRecord]:
+        """
+        Read an index written by an `IndexedSink`.
+
+        Args:
+            path: Index file.
+
+        Returns:
+            List[IndexRecord]: Records in recording order.
+
+        Raises:
+            ValueError: If the file is not a frame index.
+        """
+        with open(path, "rb") as index_file:
+            if index_file.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"{path} is not a frame index.")
+            data: bytes = index_file.read()
+        usable: int = len(data) - len(data) % cls.RECORD.size  # cut short by a crash
+        return [
+            IndexRecord(sequence, timestamp, pts, bool(keyframe))
+            for sequence, timestamp, pts, keyframe in cls.RECORD.iter_unpack(data[:usable])
+        ]
+
+
+_record_timestamp = operator.attrgetter("timestamp")
+
+
+def find_frame(records: List[IndexRecord], t: float) -> Optional[IndexRecord]:
+    """
+    Find the frame on screen at a monotonic time, e.g. a drive command's.
+
+    A binary search over the records' own timestamps, so each lookup is
+    O(log n) with no per-call copy of a long index.
+
+    Args:
+        records: Frame index from `IndexedSink.load`.
+        t: `time.monotonic` time in seconds.
+
+    Returns:
+        Optional[IndexRecord]: The last frame captured at or before `t`, or
+        None if `t` is before the recording.
+    """
+    position: int = bisect.bisect_right(records, t * 1e9, key=_record_timestamp)
+    return records[position - 1] if position else None
+
+
+# Names SegmentedSink gives the segments of recordings from `UGVSystem`
+# ("video_2024-05-01_12-00-00_003.mp4") or named "video.*" ("video_003.mp4").
+# Only these are ever evicted, with the sidecar files written beside them.
+SEGMENT_NAME: Pattern[str] = re.compile(
+    r"video_(?:\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}_)?\d{3,}\.(?:mp4|mov|m4v|mkv|h264)"
+)
+SIDECAR_EXTENSIONS: Tuple[str, ...] = (".idx",)
+
+
+def evict_oldest(
+    directory: str,
+    quota_bytes: int,
+    pattern: Pattern[str] = SEGMENT_NAME,
+    keep: Iterable[str] = (),
+) -> List[Tuple[str, int]]:
+    """
+    Delete the oldest recording segments, each with its sidecar files, until
+    those left fit within a disk quota.
+
+    Files whose whole name does not match `pattern`, other than the sidecars
+    of matching segments, are neither counted nor deleted.
+
+    Args:
+        directory: Directory holding the recordings.
+        quota_bytes: Total size allowed for the segments and their sidecars.
+        pattern: Matches the whole file name of a segment.
+        keep: Segments never to delete, with their sidecars, e.g. segments
+            still being written.
+
+    Returns:
+        List[Tuple[str, int]]: Path and size of each deleted file.
+    """
+    keep_paths = {os.path.abspath(path) for path in keep}
+    segments: List[Tuple[float, str, List[Tuple[str, int]]]] = []
+    for name in os.listdir(directory):
+        if not pattern.fullmatch(name):
+            continue
+        path: str = os.path.join(directory, name)
+        stem: str = os.path.splitext(path)[0]
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue  # deleted meanwhile
+        files: List[Tuple[str, int]] = [(path, stat.st_size)]
+        for sidecar in [stem + extension for extension in SIDECAR_EXTENSIONS]:
+            try:
+                files.append((sidecar, os.stat(sidecar).st_size))
+            except OSError:
+                pass  # none written
+        segments.append((stat.st_mtime, path, files))
+    segments.sort()
+    total: int = sum(size for _, _, files in segments for _, size in files)
+    evicted: List[Tuple[str, int]] = []
+    for _, path, files in segments:
+        if total <= quota_bytes:
+            break
+        if os.path.abspath(path) in keep_paths:
+            continue
+        for file_path, size in files:
+            try:
+                os.remove(file_path)
+            except OSError:
+                continue
+            total -= size
+            evicted.append((file_path, size))
+    return evicted
+
+
+class SegmentedSink(StreamSink):
+    """
+    Splits a recording into segment files, rolling at a keyframe once a
+    segment reaches `segment_seconds` or `segment_bytes`. With neither set,
+    the recording is a single segment.
+
+    Each segment is a complete file, so a crash loses at most the segment
+    being written. The next segment is opened in the background before it is
+    needed, and finished segments are closed in the background, so a roll
+    only switches where frames are queued: the encoder is never stopped and
+    no frame is lost. After each segment closes, the oldest segments in the
+    directory (named as in `SEGMENT_NAME`) are deleted with their sidecars to
+    keep them within `quota_bytes`.
+
+    Roll latencies are kept in `roll_latencies`. Gaps in the encoder's
+    timestamps (frames dropped before they reached the recording) are
+    counted in `dropped`. Both, and any evictions, are reported through
+    `on_event`.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        video_file: str,
+        open_segment: Callable[[str], StreamSink],
+        fps: float,
+        segment_seconds: float = 60.0,
+        segment_bytes: int = 0,
+        quota_bytes: int = 0,
+        on_event: Optional[Callable[[str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Open the first segment.
+
+        Args:
+            directory: Directory for the segments.
+            video_file: Recording name; segments are numbered after it, e.g.
+                "video.mp4" becomes "video_000.mp4", "video_001.mp4", ...
+            open_segment: Opens a sink writing to the given path.
+            fps: Encoder frame rate, to detect dropped frames.
+            segment_seconds: Segment length in seconds, or 0 for no limit.
+            segment_bytes: Segment size in bytes, or 0 for no limit.
+            quota_bytes: Disk space for all recordings in `directory`, or 0
+                for no limit.
+            on_event: Called with a message for each roll, drop and eviction.
+            clock: Monotonic time source, for latency measurements.
+        """
+        self.directory: str = directory
+        self._stem, self._extension = os.path.splitext(video_file)
+        self._open_segment = open_segment
+        self._frame_interval: float = 1e6 / fps
+        self.segment_seconds: float = segment_seconds
+        self.segment_bytes: int = segment_bytes
+        self.quota_bytes: int = quota_bytes
+        self.on_event = on_event
+        self.segments: List[str] = []
+        self.roll_latencies: List[float] = []
+        self.dropped: int = 0
+        self.evicted: List[Tuple[str, int]] = []
+        self._current: Optional[StreamSink] = None
+        self._current_bytes: int = 0
+        self._current_start: int = 0
+        self._last_timestamp: Optional[int] = None
+        self._next: Optional[StreamSink] = None
+        self._opener: Optional[threading.Thread] = None
+        self._closers: List[threading.Thread] = []
+        self._clock = clock
+        self._preopen()
+        super().__init__(clock)
+
+    def _path(self, index: int) -> str:
+        return os.path.join(self.directory, f"{self._stem}_{index:03d}{self._extension}")
+
+    def _preopen(self) -> None:
+        """Open the next segment on a background thread."""
+        path: str = self._path(len(self.segments))
+
+        def run() -> None:
+            self._next = self._open_segment(path)
+
+        self._next = None
+        self._opener = threading.Thread(target=run, name="segment_open", daemon=True)
+        self._opener.start()
+
+    def _take_next(self) -> StreamSink:
+        """Take the pre-opened segment, waiting for it if still opening."""
+        self._opener.join()
+        segment = self._next
+        if segment is None:  # opening failed on the background thread
+            segment = self._open_segment(self._path(len(self.segments)))
+        self.segments.append(self._path(len(self.segments)))
+        return segment
+
+    def _report(self, message: str) -> None:
+        if self.on_event is not None:
+            self.on_event(message)
+
+    def _write(self, frame: EncodedFrame) -> None:
+        if self._last_timestamp is not None:
+            gap: int = frame.timestamp - self._last_timestamp
+            missing: int = round(gap / self._frame_interval) - 1
+            if missing > 0:
+                self.dropped += missing
+                self._report(
+                    f"{missing} frames missing from the encoder before "
+                    f"{frame.timestamp / 1e6:.2f} s in {os.path.basename(self.segments[-1])}."
+                )
+        self._last_timestamp = frame.timestamp
+
+        if self._current is None:
+            self._current = self._take_next()
+            self._current_start = frame.timestamp
+            self._preopen()
+        elif frame.keyframe and self._segment_full(frame):
+            self._roll(frame)
+        self._current.write(frame)
+        self._current_bytes += len(frame.data)
+
+    def _segment_full(self, frame: EncodedFrame) -> bool:
+        """Whether the current segment has reached its length or size."""
+        return (
+            self.segment_seconds > 0
+            and frame.timestamp - self._current_start >= self.segment_seconds * 1e6
+        ) or (self.segment_bytes > 0 and self._current_bytes >= self.segment_bytes)
+
+    def _roll(self, frame: EncodedFrame) -> None:
+        """Switch to the pre-opened segment, closing the old one in the background."""
+        started: float = self._clock()
+        finished, finished_path = self._current, self.segments[-1]
+        self._current = self._take_next()
+        self._current_start = frame.timestamp
+        self._current_bytes = 0
+        latency: float = self._clock() - started
+        self.roll_latencies.append(latency)
+        self._report(
+            f"Rolled to {os.path.basename(self.segments[-1])} in {latency * 1000:.2f} ms."
+        )
+        closer = threading.Thread(
+            target=self._finish, args=(finished, finished_path), name="segment_close", daemon=True
+        )
+        self._closers.append(closer)
+        closer.start()
+        self._preopen()
+
+    def _finish(self, segment: StreamSink, path: str) -> None:
+        """Close a finished segment, then enforce the disk quota."""
+        segment.close()
+        if segment.error is not None:
+            self._report(f"Writing {os.path.basename(path)} failed: {segment.error}")
+        index_error: Optional[Exception] = getattr(segment, "index_error", None)
+        if index_error is not None:
+            self._report(f"Indexing {os.path.basename(path)} stopped: {index_error}")
+        self._evict()
+
+    def _evict(self) -> None:
+        if self.quota_bytes <= 0:
+            return
+        open_paths = [self.segments[-1], self._path(len(self.segments))]
+        for path, size in evict_oldest(self.directory, self.quota_bytes, keep=open_paths):
+            self.evicted.append((path, size))
+            self._report(
+                f"Deleted {os.path.basename(path)} ({size / 1024 / 1024:.1f} MB) "
+                "to stay within the video disk quota."
+            )
+
+    def _close(self) -> None:
+        self._opener.join()
+        unused, self._next = self._next, None
+        if unused is not None:
+            unused.close()
+            try:
+                os.remove(self._path(len(self.segments)))
+            except OSError:
+                pass  # nothing was written
+        if self._current is not None:
+            self._finish(self._current, self.segments[-1])
+        for closer in self._closers:
+            closer.join()
+
+
+class PrerollRecorder:
+    """
+    Output for an always-running H.264 encoder that keeps a pre-roll ring.
+
+    Encoded frames are kept in memory for at least the last `seconds`,
+    bounded by `max_bytes`, trimmed a whole GOP at a time so the ring always
+    starts at a keyframe. `start_recording` hands the ring to a sink
+    followed by every new frame, so the recording begins `seconds` before it
+    was requested, with no gap and no encoder start-up delay. The encoder needs
+    SPS/PPS headers repeated on every keyframe for this.
+
+    Implements the picamera2 output interface (`start`, `stop`,
+    `outputframe`), so it can be given straight to `start_encoder`.
+    """
+
+    def __init__(
+        self,
+        seconds: float = 5.0,
+        max_bytes: int = 32 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialise the PrerollRecorder.
+
+        Args:
+            seconds: Pre-roll to keep. At least the current GOP is always
+                kept, so a recording can start at a keyframe.
+            max_bytes: Memory limit for the pre-roll.
+            clock: Monotonic time source, for latency measurements.
+        """
+        self.seconds: float = seconds
+        self.max_bytes: int = max_bytes
+        self._clock = clock
+        self._ring: Deque[EncodedFrame] = deque()
+        self._ring_bytes: int = 0
+        self._keyframe_times: Deque[int] = deque()  # of keyframes in the ring
+        self._sink: Optional[StreamSink] = None
+        self._lock = threading.Lock()
+        self.frames: int = 0
+        self.skipped: int = 0  # frames before the first keyframe
+        self._started_at: Optional[float] = None
+        self._preroll_frames: int = 0
+        self._preroll_seconds: float = 0.0
+        self.last_recording: Optional[Dict[str, Any]] = None
+
+    # picamera2 output interface
+
+    def start(self) -> None:
+        """
+        Called by the encoder when it starts. Timestamps restart, so any
+        pre-roll from an earlier run is discarded.
+        """
+        with self._lock:
+            self._ring.clear()
+            self._ring_bytes = 0
+            self._keyframe_times.clear()
+
+    def stop(self) -> None:
+        """Called by the encoder when it stops."""
+
+    def outputframe(
+        self,
+        frame: Any,
+        keyframe: bool = True,
+        timestamp: Optional[int] = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Take an encoded frame from the encoder.
+
+        Args:
+            frame: Encoded frame data.
+            keyframe: Whether the frame is a keyframe.
+            timestamp: Frame timestamp in microseconds.
+        """
+        if timestamp is None:
+            timestamp = int(self._clock() * 1e6)
+        encoded = EncodedFrame(bytes(frame), keyframe, timestamp)
+        with self._lock:
+            self.frames += 1
+            if self._sink is not None:
+                self._sink.write(encoded)
+            self._append(encoded)
+
+    def _append(self, frame: EncodedFrame) -> None:
+        """Add a frame to the ring, then trim it to its limits."""
+        if not self._ring and not frame.keyframe:
+            self.skipped += 1  # undecodable without its keyframe
+            return
+        self._ring.append(frame)
+        self._ring_bytes += len(frame.data)
+        if frame.keyframe:
+            self._keyframe_times.append(frame.timestamp)
+        limit_us: float = self.seconds * 1e6
+        # Drop the oldest GOP if over the memory limit, or if the rest still
+        # covers the pre-roll time
+        while len(self._keyframe_times) > 1 and (
+            self._ring_bytes > self.max_bytes
+            or frame.timestamp - self._keyframe_times[1] >= limit_us
+        ):
+            self._drop_gop()
+
+    def _drop_gop(self) -> None:
+        """Drop the oldest keyframe and the frames that depend on it."""
+        dropped: EncodedFrame = self._ring.popleft()
+        self._ring_bytes -= len(dropped.data)
+        self._keyframe_times.popleft()
+        while not self._ring[0].keyframe:
+            self._ring_bytes -= len(self._ring.popleft().data)
+
+    # recording
+
+    @property
+    def recording(self) -> bool:
+        """Whether frames are being written to a sink."""
+        return self._sink is not None
+
+    def start_recording(self, sink: StreamSink) -> None:
+        """
+        Write the pre-roll to `sink`, followed by every new frame.
+
+        Args:
+            sink: Destination for the recording.
+
+        Raises:
+            RuntimeError: If already recording.
+        """
+        with self._lock:
+            if self._sink is not None:
+                raise RuntimeError("Already recording.")
+            self._started_at = self._clock()
+            for frame in self._ring:
+                sink.write(frame)
+            self._preroll_frames = len(self._ring)
+            self._preroll_seconds = self.buffered_seconds
+            self._sink = sink
+
+    def stop_recording(self) -> Optional[Dict[str, Any]]:
+        """
+        Stop writing to the sink and close it.
+
+        Returns:
+            Optional[Dict[str, Any]]: Stats for the recording, also kept in
+            `last_recording`, or None if not recording.
+        """
+        with self._lock:
+            sink, self._sink = self._sink, None
+        if sink is None:
+            return None
+        sink.close()
+        first_write_at = sink.first_write_at
+        self.last_recording = {
+            "frames": sink.frames,
+            "bytes": sink.bytes,
+            "queue_dropped": sink.queue_dropped,
+            "preroll_frames": self._preroll_frames,
+            "preroll_seconds": self._preroll_seconds,
+            "start_latency": (
+                first_write_at - self._started_at if first_write_at is not None else None
+            ),
+            "error": sink.error,
+        }
+        return self.last_recording
+
+    @property
+    def buffered_bytes(self) -> int:
+        """Bytes of encoded video held in the pre-roll ring."""
+        return self._ring_bytes
+
+    @property
+    def buffered_seconds(self) -> float:
+        """Seconds of video held in the pre-roll ring."""
+        if not self._ring:
+            return 0.0
+        return (self._ring[-1].timestamp - self._ring[0].timestamp) / 1e6
+
+    def summary(self) -> str:
+        """
+        Describe the pre-roll and the last recording.
+
+        Returns:
+            str: One line summary.
+        """
+        text: str = (
+            f"Pre-roll: {self.buffered_seconds:.1f} s in "
+            f"{self.buffered_bytes / 1024 / 1024:.1f} MB"
+        )
+        last = self.last_recording
+        if last is not None and last["start_latency"] is not None:
+            text += (
+                f"; last recording {last['frames']} frames, started "
+                f"{last['preroll_seconds']:.1f} s early, first frame written "
+                f"{last['start_latency'] * 1000:.1f} ms after the request"
+            )
+        return text + "."
@@ -0,0 +1,148 @@
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List
+
+POLICY_SKIP: str = "skip"
+POLICY_CATCH_UP: str = "catch_up"
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list.
+
+    Args:
+        sorted_values: Values sorted in ascending order.
+        fraction: Percentile as a fraction, e.g. 0.99.
+
+    Returns:
+        float: The percentile value, or 0.0 for an empty list.
+    """
+    if not sorted_values:
+        return 0.0
+    index: int = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class FixedRateScheduler:
+    """
+    Runs a tick function at a fixed rate using absolute deadlines on a
+    monotonic clock, so the rate does not drift with the cost of each tick.
+
+    When a tick overruns, the `policy` decides what happens to the ticks that
+    were missed:
+        - "skip": realign to the next deadline in the future and drop the
+          missed ticks.
+        - "catch_up": run the missed ticks back to back until the schedule is
+          met again.
+
+    Per-tick durations and wake-up jitter (how late each tick started relative
+    to its deadline) are kept for the last `history` ticks.
+    """
+
+    def __init__(
+        self,
+        hz: float,
+        policy: str = POLICY_SKIP,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        history: int = 1000,
+    ) -> None:
+        """
+        Initialise the FixedRateScheduler.
+
+        Args:
+            hz: Tick rate in Hz.
+            policy: Missed tick policy, "skip" or "catch_up".
+            clock: Monotonic time source.
+            sleep: Sleep function matching `clock`.
+            history: Number of ticks to keep statistics for.
+
+        Raises:
+            ValueError: If the rate is not positive or the policy is unknown.
+        """
+        if hz <= 0:
+            raise ValueError("Tick rate must be positive.")
+        if policy not in (POLICY_SKIP, POLICY_CATCH_UP):
+            raise ValueError(f"Unknown missed tick policy: {policy}")
+        self.period: float = 1.0 / hz
+        self.policy: str = policy
+        self._clock = clock
+        self._sleep = sleep
+
+        self.ticks: int = 0
+        self.overruns: int = 0
+        self.skipped: int = 0
+        self.durations: Deque[float] = deque(maxlen=history)
+        self.jitter: Deque[float] = deque(maxlen=history)
+
+    def run(self, tick: Callable[[], None], should_stop: Callable[[], bool]) -> None:
+        """
+        Call `tick` once per period until `should_stop` returns True.
+
+        Args:
+            tick: Work to do each period.
+            should_stop: Checked before every tick.
+        """
+        deadline: float = self._clock()
+        while not should_stop():
+            start: float = self._clock()
+            self.jitter.append(start - deadline)
+
+            tick()
+
+            end: float = self._clock()
+            self.durations.append(end - start)
+            self.ticks += 1
+
+            deadline += self.period
+            if end > deadline:
+                self.overruns += 1
+                if self.policy == POLICY_SKIP:
+                    missed: int = int((end - deadline) / self.period) + 1
+                    self.skipped += missed
+                    deadline += missed * self.period
+                else:
+                    continue
+
+            self._sleep(max(0.0, deadline - self._clock()))
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Tick statistics over the retained history.
+
+        Returns:
+            Dict[str, float]: Counters plus duration and jitter percentiles in seconds.
+        """
+        durations: List[float] = sorted(self.durations)
+        jitter: List[float] = sorted(self.jitter)
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "duration_p50": percentile(durations, 0.50),
+            "duration_p99": percentile(durations, 0.99),
+            "duration_max": durations[-1] if durations else 0.0,
+            "jitter_p50": percentile(jitter, 0.50),
+            "jitter_p90": percentile(jitter, 0.90),
+            "jitter_p99": percentile(jitter, 0.99),
+            "jitter_max": jitter[-1] if jitter else 0.0,
+        }
+
+    def summary(self) -> str:
+        """
+        Summarise tick statistics.
+
+        Returns:
+            str: Human readable summary for logging.
+        """
+        stats: Dict[str, float] = self.stats()
+        return (
+            f"Scheduler at {1 / self.period:.0f} Hz: {stats['ticks']} ticks, "
+            f"{stats['overruns']} overruns, {stats['skipped']} skipped. "
+            f"Tick duration p50 {stats['duration_p50'] * 1000:.2f} ms, "
+            f"p99 {stats['duration_p99'] * 1000:.2f} ms, "
+            f"max {stats['duration_max'] * 1000:.2f} ms. "
+            f"Jitter p50 {stats['jitter_p50'] * 1000:.2f} ms, "
+            f"p90 {stats['jitter_p90'] * 1000:.2f} ms, "
+            f"p99 {stats['jitter_p99'] * 1000:.2f} ms, "
+            f"max {stats['jitter_max'] * 1000:.2f} ms."
+        )
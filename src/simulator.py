@@ -0,0 +1,385 @@
+import csv
+import math
+import tempfile
+from collections import deque
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from config.schema import Config
+from src.logger import flush_logs, isolated_logging
+from src.ugv_system import UGVSystem
+from src.watchdog import InputWatchdog
+
+# Headless differential-drive simulation of the UGV, run in virtual time.
+
+
+class VirtualClock:
+    """
+    A clock where time only advances when something sleeps, so a control
+    loop driven by it runs as fast as the CPU allows.
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        """
+        Initialise the VirtualClock.
+
+        Args:
+            start: Initial time in seconds.
+        """
+        self.now: float = start
+
+    def monotonic(self) -> float:
+        """
+        Returns:
+            float: Current virtual time in seconds.
+        """
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Advance virtual time.
+
+        Args:
+            seconds: Seconds to advance by.
+        """
+        self.now += max(0.0, seconds)
+
+
+class Pose(NamedTuple):
+    """Planar pose in metres and radians (counter-clockwise positive)."""
+
+    x: float
+    y: float
+    heading: float
+
+
+class DiffDriveSimulator:
+    """
+    Kinematic model of the tracked UGV base.
+
+    Drop-in replacement for `BaseController`: consumes T:1 track speed
+    commands through `send_command` and emits T:1001-style feedback. Each
+    track follows its commanded speed through a first-order motor lag, a
+    fraction of the track speed is lost to slip, and the pose is integrated
+    from the resulting differential-drive velocities.
+
+    The model integrates lazily up to the clock's current time whenever it
+    is commanded or queried, and records feedback every `feedback_interval`
+    seconds of simulated time.
+    """
+
+    def __init__(
+        self,
+        clock: VirtualClock,
+        track_width: float = 0.17,
+        motor_time_constant: float = 0.1,
+        slip: float = 0.05,
+        max_track_speed: float = 0.5,
+        voltage: float = 12.0,
+        feedback_interval: float = 0.1,
+        feedback_history: int = 100_000,
+    ) -> None:
+        """
+        Initialise the DiffDriveSimulator.
+
+        Args:
+            clock: Virtual clock driving the simulation.
+            track_width: Distance between the tracks in metres.
+            motor_time_constant: First-order motor lag in seconds (0 for none).
+            slip: Fraction of track speed lost to slip, between 0 and 1.
+            max_track_speed: Commands are clamped to +/- this speed in m/s.
+            voltage: Battery voltage reported in feedback.
+            feedback_interval: Seconds of simulated time between feedback records.
+            feedback_history: Maximum number of feedback records kept.
+        """
+        if not 0.0 <= slip < 1.0:
+            raise ValueError("Slip must be in [0, 1).")
+        self.clock = clock
+        self.track_width: float = track_width
+        self.motor_time_constant: float = motor_time_constant
+        self.slip: float = slip
+        self.max_track_speed: float = max_track_speed
+        self.voltage: float = voltage
+        self.feedback_interval: float = feedback_interval
+
+        self.commanded: Tuple[float, float] = (0.0, 0.0)  # left, right
+        self.track_speeds: Tuple[float, float] = (0.0, 0.0)  # left, right
+        self.pose: Pose = Pose(0.0, 0.0, 0.0)
+        self.distance: float = 0.0
+        self.commands_received: int = 0
+        self.feedback_log: Deque[Dict[str, Any]] = deque(maxlen=feedback_history)
+
+        self._time: float = clock.monotonic()
+        self._next_feedback: float = self._time + feedback_interval
+
+    def send_command(self, data: Dict[str, Any]) -> None:
+        """
+        Apply a command, integrating the model up to now first.
+
+        Args:
+            data: The command data. Only T:1 track speed commands are modelled.
+        """
+        self._advance()
+        self.commands_received += 1
+        if data.get("T") == 1:
+            self.commanded = (
+                self._clamp(data["L"]),
+                self._clamp(data["R"]),
+            )
+
+    def base_json_ctrl(self, input_json: Dict[str, Any]) -> None:
+        """
+        Send a JSON command, mirroring `BaseController.base_json_ctrl`.
+
+        Args:
+            input_json: The command data.
+        """
+        self.send_command(input_json)
+
+    def feedback(self) -> Dict[str, Any]:
+        """
+        Current T:1001 chassis feedback.
+
+        Returns:
+            Dict[str, Any]: Track speeds (L, R), roll (r), pitch (p), yaw in
+            degrees (y) and battery voltage (v).
+        """
+        left, right = self.track_speeds
+        return {
+            "T": 1001,
+            "L": round(left, 4),
+            "R": round(right, 4),
+            "r": 0.0,
+            "p": 0.0,
+            "y": round(math.degrees(self.pose.heading), 2),
+            "v": self.voltage,
+        }
+
+    def _clamp(self, value: float) -> float:
+        return max(-self.max_track_speed, min(self.max_track_speed, float(value)))
+
+    def _advance(self) -> None:
+        """
+        Integrate the model up to the clock's current time, recording
+        feedback at every feedback instant passed on the way.
+        """
+        now: float = self.clock.monotonic()
+        while self._next_feedback <= now:
+            self._integrate(self._next_feedback - self._time)
+            self.feedback_log.append(self.feedback())
+            self._next_feedback += self.feedback_interval
+        self._integrate(now - self._time)
+
+    def _integrate(self, dt: float) -> None:
+        """
+        Advance the model by `dt` seconds with the current command held.
+
+        Args:
+            dt: Time step in seconds.
+        """
+        if dt <= 0.0:
+            return
+        self._time += dt
+
+        # Motor lag, solved exactly for a constant command over the step.
+        if self.motor_time_constant > 0:
+            alpha: float = 1.0 - math.exp(-dt / self.motor_time_constant)
+        else:
+            alpha = 1.0
+        left, right = self.track_speeds
+        left += (self.commanded[0] - left) * alpha
+        right += (self.commanded[1] - right) * alpha
+        self.track_speeds = (left, right)
+
+        grip: float = 1.0 - self.slip
+        linear: float = (left + right) / 2 * grip
+        angular: float = (right - left) / self.track_width * grip
+
+        x, y, heading = self.pose
+        mid_heading: float = heading + angular * dt / 2
+        self.pose = Pose(
+            x + linear * math.cos(mid_heading) * dt,
+            y + linear * math.sin(mid_heading) * dt,
+            heading + angular * dt,
+        )
+        self.distance += abs(linear) * dt
+
+
+class ReplayEvent(NamedTuple):
+    """A recorded remote control state change at time `t` seconds."""
+
+    t: float
+    speed: float
+    turn: float
+    recording: bool = False
+
+
+def load_replay(path: str) -> List[ReplayEvent]:
+    """Load replay events from a CSV file with t, speed, turn[, recording] columns.
+
+    Args:
+        path: Path to the CSV file, with a header row.
+
+    Returns:
+        List[ReplayEvent]: Events sorted by time.
+    """
+    with open(path, "r", newline="") as csv_file:
+        events: List[ReplayEvent] = [
+            ReplayEvent(
+                float(row["t"]),
+                float(row["speed"]),
+                float(row["turn"]),
+                row.get("recording", "0").strip().lower() in ("1", "true"),
+            )
+            for row in csv.DictReader(csv_file)
+        ]
+    return sorted(events, key=lambda event: event.t)
+
+
+class ReplayController:
+    """
+    Input source that replays recorded remote control events in virtual time.
+
+    Exposes the same speed/turn/recording/stop interface as the real input
+    sources. Events are applied lazily as the clock passes their timestamps,
+    and the controller stops once `duration` seconds have elapsed.
+    """
+
+    def __init__(
+        self,
+        events: Sequence[ReplayEvent],
+        clock: VirtualClock,
+        duration: Optional[float] = None,
+        connected: bool = True,
+    ) -> None:
+        """
+        Initialise the ReplayController.
+
+        Args:
+            events: Events sorted by time, relative to the clock's current time.
+            clock: Virtual clock driving the replay.
+            duration: Seconds to run for. Defaults to the last event's time.
+            connected: Whether the simulated listener is alive. While it
+                is, the watchdog is fed whenever the input is read, as the
+                pad's listener feeds it while idle; set False to simulate
+                a hung listener or lost link, so only events feed it.
+        """
+        self.events: Sequence[ReplayEvent] = events
+        self.clock = clock
+        self.start: float = clock.monotonic()
+        if duration is None:
+            duration = events[-1].t if events else 0.0
+        self.end: float = self.start + duration
+        self.connected: bool = connected
+        self.watchdog: Optional[InputWatchdog] = None
+        self._index: int = 0
+        self._speed: float = 0.0
+        self._turn: float = 0.0
+        self._recording: bool = False
+        self._stop: bool = False
+
+    def _advance(self) -> None:
+        """Apply every event whose time has passed."""
+        elapsed: float = self.clock.monotonic() - self.start
+        applied: bool = False
+        while self._index < len(self.events) and self.events[self._index].t <= elapsed:
+            event: ReplayEvent = self.events[self._index]
+            self._speed, self._turn, self._recording = (
+                event.speed,
+                event.turn,
+                event.recording,
+            )
+            self._index += 1
+            applied = True
+        if self.watchdog is not None and (applied or self.connected):
+            self.watchdog.feed()
+
+    @property
+    def speed(self) -> float:
+        """Current replayed speed."""
+        self._advance()
+        return self._speed
+
+    @speed.setter
+    def speed(self, val: float) -> None:
+        self._speed = val
+
+    @property
+    def turn(self) -> float:
+        """Current replayed turn value."""
+        self._advance()
+        return self._turn
+
+    @turn.setter
+    def turn(self, val: float) -> None:
+        self._turn = val
+
+    @property
+    def recording(self) -> bool:
+        """Current replayed recording state."""
+        self._advance()
+        return self._recording
+
+    @recording.setter
+    def recording(self, val: bool) -> None:
+        self._recording = val
+
+    @property
+    def stop(self) -> bool:
+        """Whether the replay has been stopped or has run its duration."""
+        return self._stop or self.clock.monotonic() >= self.end
+
+    @stop.setter
+    def stop(self, val: bool) -> None:
+        self._stop = val
+
+    def listen(self, timeout: int = 60) -> None:
+        """Nothing to listen to; events are applied as virtual time passes."""
+
+
+def run_simulation(
+    config: Union[Config, Mapping[str, Any]],
+    events: Sequence[ReplayEvent],
+    duration: Optional[float] = None,
+    log_dir: Optional[str] = None,
+    **simulator_kwargs: Any,
+) -> Tuple[UGVSystem, DiffDriveSimulator]:
+    """Drive a UGVSystem end to end against the simulator in virtual time.
+
+    Args:
+        config: System configuration.
+        events: Remote control events to replay.
+        duration: Seconds of simulated time. Defaults to the last event's time.
+        log_dir: Directory for the run's log and drive ring dump. If not
+            given, a temporary directory removed after the run.
+        **simulator_kwargs: Passed on to `DiffDriveSimulator`.
+
+    Returns:
+        Tuple[UGVSystem, DiffDriveSimulator]: The finished system and simulator.
+    """
+    clock = VirtualClock()
+    simulator = DiffDriveSimulator(clock, **simulator_kwargs)
+    controller = ReplayController(events, clock, duration)
+    with tempfile.TemporaryDirectory(prefix="ugv_sim_") as scratch_dir:
+        system = UGVSystem(
+            config=isolated_logging(config, log_dir or scratch_dir),
+            base_path="simulator",
+            debug_logging=False,
+            base=simulator,
+            controller=controller,
+            clock=clock.monotonic,
+            sleep=clock.sleep,
+        )
+        system._loop()
+        flush_logs()  # written before the directory goes
+    return system, simulator
@@ -0,0 +1,103 @@
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, NamedTuple, Tuple
+
+# Startup timing, kept to the standard library so it is cheap to import first.
+
+_IGNORED_MODULES = set(getattr(sys, "stdlib_module_names", ())) | {
+    "src",
+    "config",
+    "cython_runtime",
+}
+
+
+class StartupPhase(NamedTuple):
+    """A timed step of startup and the third-party packages it imported."""
+
+    name: str
+    duration: float
+    modules: Tuple[str, ...]
+    depth: int = 0
+
+
+class StartupProfile:
+    """
+    Records how long each step of startup takes and which packages it pulls
+    in, so slow imports and initialisation can be found:
+
+        with profile.phase("import config"):
+            from config.config import config
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        """
+        Initialise the StartupProfile.
+
+        Args:
+            clock: Time source for phase durations.
+        """
+        self._clock = clock
+        self.start: float = clock()
+        self.phases: List[StartupPhase] = []
+
+    @contextmanager
+    def phase(self, name: str, imports: bool = True) -> Iterator[None]:
+        """
+        Time the enclosed block as a phase.
+
+        Imports are attributed by comparing `sys.modules` before and after,
+        so they are only right for a phase nothing else runs alongside.
+
+        Args:
+            name: Name of the phase.
+            imports: Record the packages the phase imported. Pass False for
+                phases run concurrently, and record imports in one phase
+                enclosing them all instead.
+        """
+        before = set(sys.modules) if imports else None
+        started: float = self._clock()
+        try:
+            yield
+        finally:
+            duration: float = self._clock() - started
+            modules: Tuple[str, ...] = ()
+            if before is not None:
+                imported = {module.split(".")[0] for module in set(sys.modules) - before}
+                # Only third-party packages are listed; the stdlib is noise here.
+                imported -= _IGNORED_MODULES
+                imported = {module for module in imported if not module.startswith("_")}
+                modules = tuple(sorted(imported))
+            self.phases.append(StartupPhase(name, duration, modules))
+
+    def extend(self, other: "StartupProfile") -> None:
+        """
+        Add another profile's phases as sub-phases of the last phase.
+
+        Args:
+            other: Profile recorded inside the last phase.
+        """
+        self.phases.extend(phase._replace(depth=phase.depth + 1) for phase in other.phases)
+
+    def elapsed(self) -> float:
+        """
+        Returns:
+            float: Seconds since the profile was created.
+        """
+        return self._clock() - self.start
+
+    def report(self) -> str:
+        """
+        Describe every phase for logging.
+
+        Returns:
+            str: Multi-line breakdown, with the packages each phase imported.
+        """
+        lines: List[str] = [f"Startup profile, {self.elapsed():.3f} s since start:"]
+        for phase in self.phases:
+            label: str = "  " * (phase.depth + 1) + phase.name
+            line: str = f"{label:<28}{phase.duration * 1000:9.1f} ms"
+            if phase.modules:
+                line += "  imported " + ", ".join(phase.modules)
+            lines.append(line)
+        return "\n".join(lines)
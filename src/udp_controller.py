@@ -0,0 +1,334 @@
+import logging
+import select
+import socket
+import struct
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Mapping, Optional, Tuple, Union
+
+from config.schema import Config, UGVConfig, as_config
+from src.watchdog import InputWatchdog
+
+# Datagram layout (network byte order):
+#   sequence number (uint32), send timestamp (float64, seconds since epoch),
+#   speed (float32), turn (float32), flags (uint8)
+PACKET_FORMAT: str = "!Id2fB"
+PACKET_SIZE: int = struct.calcsize(PACKET_FORMAT)
+FLAG_RECORDING: int = 0x01
+FLAG_STOP: int = 0x02
+
+_SEQ_MODULO: int = 2**32
+
+logger = logging.getLogger(__name__)
+
+
+def pack_command(
+    seq: int,
+    sent: float,
+    speed: float,
+    turn: float,
+    recording: bool = False,
+    stop: bool = False,
+) -> bytes:
+    """Pack a teleoperation command into a datagram.
+
+    Args:
+        seq: Sequence number, wraps at 2**32.
+        sent: Send timestamp in seconds since the epoch.
+        speed: Requested speed in the UGV speed range.
+        turn: Requested turn value in the UGV turn range.
+        recording: Requested camera recording state.
+        stop: Request the system to stop.
+
+    Returns:
+        bytes: The packed datagram.
+    """
+    flags: int = (FLAG_RECORDING if recording else 0) | (FLAG_STOP if stop else 0)
+    return struct.pack(PACKET_FORMAT, seq % _SEQ_MODULO, sent, speed, turn, flags)
+
+
+def unpack_command(data: bytes) -> Tuple[int, float, float, float, bool, bool]:
+    """Unpack a teleoperation datagram.
+
+    Args:
+        data: Raw datagram payload.
+
+    Returns:
+        Tuple: (seq, sent, speed, turn, recording, stop).
+
+    Raises:
+        struct.error: If the datagram has the wrong size.
+    """
+    seq, sent, speed, turn, flags = struct.unpack(PACKET_FORMAT, data)
+    return seq, sent, speed, turn, bool(flags & FLAG_RECORDING), bool(flags & FLAG_STOP)
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+class UDPRemoteController:
+    """
+    Converts UDP teleoperation datagrams to actionable commands for the UGV system.
+
+    Exposes the same `speed`, `turn`, `recording`, `stop` and `listen` interface
+    as `UGVRemoteController`, so `UGVSystem` can use either input source.
+
+    Every datagram carries a sequence number and a send timestamp. Datagrams
+    older than the newest accepted one are dropped. When a backlog builds up
+    in the socket buffer only the newest datagram is applied, so latency never
+    accumulates.
+
+    Send timestamps come from the sender's wall clock, so dropping datagrams
+    older than `MAX_PACKET_AGE` is opt-in: it is only meaningful when both
+    clocks are synchronised (e.g. with chrony), and is disabled by the
+    default of 0. Reported latencies include any clock offset.
+    """
+
+    def __init__(
+        self, config: Union[Config, Mapping[str, Any]], latency_history: int = 1000
+    ) -> None:
+        """
+        Initialize the UDPRemoteController.
+
+        Args:
+            config: Configuration with UDP and UGV parameters, compiled or as a
+                dictionary in config.yaml layout.
+            latency_history: Number of send-to-apply latencies to keep.
+        """
+        self.config: Config = as_config(config)
+        self.host: str = self.config.udp_config.HOST
+        self.port: int = self.config.udp_config.PORT
+        self.max_packet_age: float = self.config.udp_config.MAX_PACKET_AGE
+        self.stop: bool = False
+        self.recording: bool = False
+        self.watchdog: Optional[InputWatchdog] = None  # fed on every datagram
+        self._speed: float = 0.0
+        self._turn: float = 0.0
+        self._socket: Optional[socket.socket] = None
+
+        self._last_seq: Optional[int] = None
+        self._last_sent: float = 0.0
+        self.received: int = 0
+        self.accepted: int = 0
+        self.dropped_out_of_order: int = 0
+        self.dropped_stale: int = 0
+        self.dropped_superseded: int = 0
+        self.malformed: int = 0
+        self.latencies: Deque[float] = deque(maxlen=latency_history)
+
+    @property
+    def speed(self) -> float:
+        """
+        Getter for the speed attribute.
+
+        Returns:
+            float: Current requested speed.
+        """
+        return self._speed
+
+    @speed.setter
+    def speed(self, val: float) -> None:
+        """
+        Setter for the speed attribute.
+
+        Args:
+            val: New speed value.
+        """
+        self._speed = val
+
+    @property
+    def turn(self) -> float:
+        """
+        Getter for the turn attribute.
+
+        Returns:
+            float: turning value (0.0: straight, -1.0: full left, 1.0: full right).
+        """
+        return self._turn
+
+    @turn.setter
+    def turn(self, val: float) -> None:
+        """
+        Setter for the turn attribute.
+
+        Args:
+            val: New turn value (0.0: straight, -1.0: full left, 1.0: full right).
+        """
+        self._turn = val
+
+    def apply_config(self, config: Config) -> None:
+        """
+        Switch to a reloaded configuration. The socket address is unchanged.
+
+        Args:
+            config: The new configuration.
+        """
+        self.config = config
+        self.max_packet_age = config.udp_config.MAX_PACKET_AGE
+
+    def bind(self) -> Tuple[str, int]:
+        """
+        Open the UDP socket if it is not already open.
+
+        Returns:
+            Tuple[str, int]: The bound address, useful when PORT is 0.
+        """
+        if self._socket is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((self.host, self.port))
+            sock.setblocking(False)
+            self._socket = sock
+        return self._socket.getsockname()
+
+    def close(self) -> None:
+        """Close the UDP socket."""
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def listen(self, timeout: int = 60) -> None:
+        """
+        Receive datagrams until stopped.
+
+        Args:
+            timeout: Seconds to wait for the first datagram before giving up.
+        """
+        self.bind()
+        started: float = time.monotonic()
+        try:
+            while not self.stop:
+                readable, _, _ = select.select([self._socket], [], [], 0.1)
+                if readable:
+                    self._receive_pending()
+                elif self.accepted == 0 and time.monotonic() - started > timeout:
+                    logger.warning(f"Timeout({timeout} sec). No teleoperation datagrams.")
+                    return
+        finally:
+            self.close()
+
+    def _receive_pending(self) -> None:
+        """
+        Drain every datagram queued on the socket and apply only the newest.
+
+        A stop request is never coalesced away: if any accepted datagram in
+        the batch asks to stop, the applied one does too.
+        """
+        newest: Optional[Tuple[int, float, float, float, bool, bool]] = None
+        stop_requested: bool = False
+        while True:
+            try:
+                data: bytes = self._socket.recv(PACKET_SIZE + 1)
+            except BlockingIOError:
+                break
+            received_at: float = time.time()
+            self.received += 1
+            try:
+                packet = unpack_command(data)
+            except struct.error:
+                self.malformed += 1
+                continue
+            if not self._accept(packet, received_at):
+                continue
+            if newest is not None:
+                self.dropped_superseded += 1
+            newest = packet
+            stop_requested = stop_requested or packet[5]
+
+        if newest is not None:
+            self._apply(newest[:5] + (stop_requested,))
+
+    def _accept(
+        self, packet: Tuple[int, float, float, float, bool, bool], received_at: float
+    ) -> bool:
+        """
+        Decide whether a datagram is fresh and in order, and advance the
+        sequence tracking if it is.
+
+        Args:
+            packet: Unpacked datagram.
+            received_at: Receive timestamp in seconds since the epoch.
+
+        Returns:
+            bool: True if the datagram should be applied.
+        """
+        seq, sent = packet[0], packet[1]
+        if self.max_packet_age > 0 and received_at - sent > self.max_packet_age:
+            self.dropped_stale += 1
+            return False
+
+        if self._last_seq is not None:
+            # Serial number arithmetic so the sequence can wrap around.
+            delta: int = (seq - self._last_seq) % _SEQ_MODULO
+            in_order: bool = 0 < delta < _SEQ_MODULO // 2
+            # An older sequence number with a newer send time means the
+            # sender restarted, so start tracking afresh.
+            restarted: bool = not in_order and sent > self._last_sent
+            if not in_order and not restarted:
+                self.dropped_out_of_order += 1
+                return False
+
+        self._last_seq = seq
+        self._last_sent = sent
+        return True
+
+    def _apply(self, packet: Tuple[int, float, float, float, bool, bool]) -> None:
+        """
+        Apply a datagram to the controller state.
+
+        Args:
+            packet: Unpacked datagram.
+        """
+        _, sent, speed, turn, recording, stop = packet
+        ugv_config: UGVConfig = self.config.ugv_config
+        self.speed = _clamp(speed, -ugv_config.SPEED_MAX, ugv_config.SPEED_MAX)
+        self.turn = _clamp(turn, ugv_config.TURN_VALUE_MIN, ugv_config.TURN_VALUE_MAX)
+        self.recording = recording
+        if stop:
+            self.stop = True
+        self.accepted += 1
+        if self.watchdog is not None:
+            self.watchdog.feed()
+        self.latencies.append(time.time() - sent)
+
+
+class UDPTeleopSender:
+    """
+    Sends teleoperation datagrams to a `UDPRemoteController`.
+    """
+
+    def __init__(self, host: str, port: int) -> None:
+        """
+        Initialize the UDPTeleopSender.
+
+        Args:
+            host: Address of the UGV.
+            port: UDP port the UGV listens on.
+        """
+        self.address: Tuple[str, int] = (host, port)
+        self.seq: int = 0
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def send(
+        self, speed: float, turn: float, recording: bool = False, stop: bool = False
+    ) -> None:
+        """
+        Send a command, stamping it with the next sequence number and the
+        current time.
+
+        Args:
+            speed: Requested speed in the UGV speed range.
+            turn: Requested turn value in the UGV turn range.
+            recording: Requested camera recording state.
+            stop: Request the system to stop.
+        """
+        self._socket.sendto(
+            pack_command(self.seq, time.time(), speed, turn, recording, stop),
+            self.address,
+        )
+        self.seq = (self.seq + 1) % _SEQ_MODULO
+
+    def close(self) -> None:
+        """Close the sending socket."""
+        self._socket.close()
@@ -1,11 +1,19 @@
+from collections import deque
+from contextlib import nullcontext
+from pathlib import Path
 from threading import Thread
 import time
-from typing import Dict, Any, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
 
-from src.base_ctrl import BaseController
-from src.camera import Camera
-from src.controller import UGVRemoteController
+from config.schema import Config, LoggingConfig, RealtimeConfig, as_config
+from src.config_reload import ConfigReloader
+from src.hotlog import DriveRing, HotPathLogger
 from src.logger import customLogger
+from src.realtime import apply_realtime, describe_realtime
+from src.scheduler import FixedRateScheduler
+from src.startup import StartupProfile
+from src.udp_controller import UDPRemoteController
+from src.watchdog import InputWatchdog
 
 
 class UGVSystem:
@@ -13,44 +21,280 @@ class UGVSystem:
 
     def __init__(
         self,
-        config: Dict[str, Any],
+        config: Union[Config, Mapping[str, Any]],
         base_path: str,
         debug_logging: bool,
         camera: bool = False,
+        camera_process: bool = False,
+        input_source: str = "ps4",
+        realtime: bool = False,
+        base: Optional[Any] = None,
+        controller: Optional[Any] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        config_path: Optional[Path] = None,
+        parallel_init: bool = True,
+        wait_for_camera: bool = True,
+        camera_factory: Optional[Callable[..., Any]] = None,
     ) -> None:
         """
         Initialize the UGVSystem with configuration and base path.
 
         Args:
-            config: Configuration dictionary for the remote controller.
+            config: System configuration, compiled or as a dictionary in
+                config.yaml layout.
             base_path: Path to the base device connection.
             debug_logging: Flag to enable or disable debug-level logging.
             camera: Whether to initialise a camera.
+            camera_process: Run the camera and recording in a separate worker
+                process instead of the control process. Either way, recording
+                starts and stops on a camera worker, never in the control loop.
+            input_source: Remote control input, either "ps4" or "udp".
+            realtime: Pin the control and serial threads to dedicated CPUs and
+                run them with SCHED_FIFO, as set in `realtime_config`.
+            base: Pre-built base controller (e.g. a simulator) used instead of
+                opening `base_path`.
+            controller: Pre-built input source used instead of `input_source`.
+            clock: Monotonic time source for the control loop.
+            sleep: Sleep function matching `clock`.
+            config_path: Config file to watch while running. Valid changes are
+                applied between ticks without a restart.
+            parallel_init: Initialise the base, controller and camera
+                concurrently rather than one after another.
+            wait_for_camera: Wait for the camera before returning. If False,
+                driving can start while the camera is still initialising;
+                recording starts once it is ready.
+            camera_factory: Callable building the camera from `resolution`,
+                `flip` and `recording` keyword arguments, defaults to `Camera`.
         """
-        self.config = config
+        config = as_config(config)
+        self.config: Config = config
         self.base_path = base_path
         self.is_recording: bool = False
-        self.base = BaseController(base_path, 115200)
-        self.controller = UGVRemoteController(config=config)
-        self.logger = customLogger("ugv_system", "outputs/log/app.log", debug_logging)
-        self.logger.debug("Initialised UGVRemoteController, BaseController")
-        self.camera_exists: bool = False
-        if camera:
-            self.camera_exists = True
-            self.camera = Camera(resolution=(1920, 1080), flip=False)
-            self.logger.debug("Initialised Camera")
+        self._clock = clock
+        self.realtime: bool = realtime
+        self.realtime_reports: List[Dict[str, Any]] = []
+        self._init_started: float = clock()
+        self.first_drive_at: Optional[float] = None
+        self.startup = StartupProfile()
+        with self.startup.phase("logging"):
+            logging_config: LoggingConfig = config.logging_config
+            self.logger = customLogger(
+                "ugv_system",
+                logging_config.LOG_FILE,
+                debug_logging,
+                max_bytes=logging_config.MAX_BYTES,
+                rotate_interval=logging_config.ROTATE_INTERVAL,
+                backup_count=logging_config.BACKUP_COUNT,
+            )
+
+        # Hardware libraries are only imported for the subsystems in use.
+        def build_base() -> Any:
+            if base is not None:
+                return base
+            from src.base_ctrl import BaseController
+
+            return BaseController(
+                base_path,
+                115200,
+                thread_setup=self._apply_serial_realtime if realtime else None,
+            )
+
+        def build_controller() -> Any:
+            if controller is not None:
+                return controller
+            if input_source == "udp":
+                return UDPRemoteController(config=config)
+            if input_source == "ps4":
+                from src.controller import UGVRemoteController
+
+                return UGVRemoteController(config=config)
+            raise ValueError(f"Unknown input source: {input_source}")
+
+        def build_camera() -> Any:
+            factory = camera_factory
+            if factory is None:
+                from src.camera import Camera
+
+                factory = Camera
+            if camera_process:
+                from src.camera_worker import CameraProcess
+
+                built = CameraProcess(
+                    factory,
+                    resolution=(1920, 1080),
+                    flip=False,
+                    recording=config.recording_config,
+                )
+                self.logger.debug("Started camera worker process")
+            else:
+                from src.camera_worker import CameraThread
+
+                built = CameraThread(
+                    factory(resolution=(1920, 1080), flip=False, recording=config.recording_config)
+                )
+                self.logger.debug("Initialised Camera")
+            return built
+
+        # Subsystems are independent, so they are brought up concurrently and
+        # collected at a barrier. The camera, the slowest, may be left behind.
+        self._init_threads: Dict[str, Thread] = {}
+        self._init_results: Dict[str, Any] = {}
+        self._init_errors: Dict[str, BaseException] = {}
+        self.camera_exists: bool = camera
+        # Concurrent phases cannot tell whose imports are whose, so under
+        # parallel init imports are attributed to the init as a whole.
+        with self.startup.phase("parallel init") if parallel_init else nullcontext():
+            self._start_init("base", build_base, parallel_init)
+            self._start_init("controller", build_controller, parallel_init)
+            if camera:
+                self._start_init("camera", build_camera, parallel_init)
+            try:
+                self.base = self._await_init("base")
+                self.controller = self._await_init("controller")
+                if camera and (wait_for_camera or "camera" not in self._init_threads):
+                    self.camera = self._await_init("camera")
+            except BaseException:
+                self._abandon_camera_init()
+                raise
+        timings: str = ", ".join(
+            f"{phase.name} in {phase.duration * 1000:.0f} ms" for phase in self.startup.phases
+        )
+        pending: str = " (camera still starting)" if "camera" in self._init_threads else ""
+        self.logger.info(
+            f"Initialised {timings}; ready after {clock() - self._init_started:.2f} s{pending}."
+        )
+        self.watchdog = InputWatchdog(
+            config.ugv_config.INPUT_TIMEOUT,
+            on_trip=self._on_input_stall,
+            clock=clock,
+        )
+        self.controller.watchdog = self.watchdog
+        self.scheduler = FixedRateScheduler(
+            config.ugv_config.LOOP_HZ,
+            config.ugv_config.LOOP_POLICY,
+            clock=clock,
+            sleep=sleep,
+        )
+        self.hotlog = HotPathLogger(
+            self.logger,
+            enabled=debug_logging,
+            min_interval=logging_config.DRIVE_LOG_INTERVAL,
+            clock=clock,
+        )
+        self.drive_ring: Optional[DriveRing] = None
+        if logging_config.DRIVE_RING_SIZE > 0:
+            self.drive_ring = DriveRing(logging_config.DRIVE_RING_SIZE)
+        self.logger.debug(
+            f"Initialised {type(self.controller).__name__}, {type(self.base).__name__}"
+        )
+        self.config_reloader: Optional[ConfigReloader] = None
+        if config_path is not None:
+            self.config_reloader = ConfigReloader(
+                config, config_path, on_reject=self._on_config_rejected, clock=clock
+            )
+
+    def _start_init(self, name: str, build: Callable[[], Any], parallel: bool) -> None:
+        """
+        Initialise a subsystem, on its own thread if `parallel`.
+
+        Args:
+            name: Subsystem name, used for timing and `_await_init`.
+            build: Callable returning the initialised subsystem.
+            parallel: Run `build` on a background thread.
+        """
+
+        def run() -> None:
+            try:
+                with self.startup.phase(name, imports=not parallel):
+                    self._init_results[name] = build()
+            except BaseException as e:  # re-raised by _await_init
+                self._init_errors[name] = e
+
+        if parallel:
+            thread = Thread(target=run, name=f"init_{name}", daemon=True)
+            self._init_threads[name] = thread
+            thread.start()
+        else:
+            run()
+
+    def _await_init(self, name: str) -> Any:
+        """
+        Wait for a subsystem to finish initialising.
+
+        Args:
+            name: Subsystem name given to `_start_init`.
+
+        Returns:
+            Any: The initialised subsystem.
+
+        Raises:
+            BaseException: Whatever the subsystem's initialisation raised.
+        """
+        thread: Optional[Thread] = self._init_threads.pop(name, None)
+        if thread is not None:
+            thread.join()
+        if name in self._init_errors:
+            raise self._init_errors.pop(name)
+        return self._init_results.pop(name)
+
+    def _abandon_camera_init(self) -> None:
+        """
+        Wait for a camera still initialising and close it, after another
+        subsystem failed to initialise.
+        """
+        thread: Optional[Thread] = self._init_threads.pop("camera", None)
+        if thread is not None:
+            thread.join()
+        self._init_errors.pop("camera", None)
+        camera = self._init_results.pop("camera", None)
+        if camera is not None:
+            camera.camera_close()
+
+    def _camera_available(self, wait: bool = False) -> bool:
+        """
+        Check whether the camera is ready, collecting it if it finished
+        initialising in the background.
+
+        Args:
+            wait: Block until a camera still initialising is ready.
+
+        Returns:
+            bool: True if `self.camera` can be used.
+        """
+        if "camera" not in self._init_threads:
+            return self.camera_exists
+        if not wait and self._init_threads["camera"].is_alive():
+            return False
+        try:
+            self.camera = self._await_init("camera")
+        except Exception as e:
+            self.camera_exists = False
+            self.logger.error(f"Camera initialisation failed, continuing without it: {e}")
+            return False
+        self.logger.info(
+            f"Camera ready {self._clock() - self._init_started:.2f} s after init started."
+        )
+        return True
 
     def _tidy_up(self) -> None:
         """
         Method to tidy up after receiving exit command.
         """
-        self._drive(0.0, 0.0, True)
+        self._drive(0.0, 0.0, log=True)
         self.controller.speed = 0.0
-        if self.camera_exists and self.is_recording:
-            self._toggle_camera_recording()
-            self.camera.camera_close()
-        elif self.camera_exists:
+        if self._camera_available(wait=True):
+            if self.is_recording:
+                self._toggle_camera_recording()
             self.camera.camera_close()
+            self._check_camera_worker()
+            self._log_camera_events()
+            summary = getattr(self.camera, "summary", None)
+            if summary is not None:  # not available from the camera worker process
+                self.logger.info(summary())
+        self.logger.info(self.watchdog.summary())
+        self.logger.info(self.scheduler.summary())
+        self._dump_drive_ring()
         self.logger.info("Tidy up complete.")
 
     def _drive(self, speed: float, turn: float, log: bool = False) -> None:
@@ -60,19 +304,30 @@ class UGVSystem:
         Args:
             speed: Overall speed, ranges from -0.5 (reverse) to +0.5 (forward).
             turn: Turning value, ranges from -1 (sharp left) to +1 (sharp right).
-            log: Flag to indicate if the command should be logged.
+            log: Flag to indicate if the command may be logged, subject to the
+                hot-path rate limit.
         """
-        if log:
-            self.logger.debug(f"Drive Command OUT 1: speed: {speed}, turn: {turn}")
-
         r_speed, l_speed = self._calculate_track_speeds(speed, turn)
+        if self.first_drive_at is None:
+            self.first_drive_at = self._clock()
+            self.logger.info(
+                f"First drive command {self.first_drive_at - self._init_started:.2f} s "
+                "after init started."
+            )
 
         # Send the command to the base controller
         self.base.send_command({"T": 1, "R": r_speed, "L": l_speed})
 
-        if log:
+        if self.drive_ring is not None:
+            self.drive_ring.record(self._clock(), speed, turn, r_speed, l_speed)
+
+        if log and self.hotlog.enabled and self.hotlog.due("drive"):
             self.logger.debug(
-                f"Drive Command OUT 2: r_speed: {r_speed}, l_speed: {l_speed}"
+                "Drive Command OUT: speed: %s, turn: %s, r_speed: %s, l_speed: %s",
+                speed,
+                turn,
+                r_speed,
+                l_speed,
             )
 
     @staticmethod
@@ -104,48 +359,164 @@ class UGVSystem:
         return l_speed, r_speed
 
     def _toggle_camera_recording(self):
-        """Toggles camera recording."""
+        """
+        Toggles camera recording. The camera worker carries it out; its
+        result is logged by `_check_camera_worker`.
+        """
         video_name = f"video_{time.strftime('%Y-%m-%d_%H-%M-%S')}.mp4"
         if self.is_recording:
             self.camera.stop_recording()
-            self.logger.info("Stopped camera recording.")
+            self.logger.info("Requested camera recording stop.")
         else:
             self.camera.start_recording(
-                self.config["general_config"]["VIDEO_PATH"], video_name
+                self.config.general_config.VIDEO_PATH, video_name
             )
-            self.logger.info("Started camera recording.")
+            self.logger.info("Requested camera recording start.")
         self.is_recording = not self.is_recording
 
+    def _log_camera_events(self) -> None:
+        """Log recording messages (segment rolls, drops, evictions) from the camera."""
+        events = getattr(self.camera, "events", None)
+        if not isinstance(events, deque):  # camera worker process, or a stand-in
+            return
+        while events:
+            self.logger.info(events.popleft())
+
+    def _check_camera_worker(self) -> None:
+        """Log the results and errors reported by the camera worker."""
+        poll_status = getattr(self.camera, "poll_status", None)
+        if poll_status is None:  # bare camera, nothing to report
+            return
+        for status in poll_status():
+            if status["error"]:
+                self.logger.error(f"Camera worker: {status['error']}")
+            elif "command" in status:
+                self.logger.info(
+                    f"Camera worker: {status['command']} done in "
+                    f"{status['duration'] * 1000:.0f} ms."
+                )
+            if "summary" in status:
+                self.logger.info(status["summary"])
+
+    def _apply_serial_realtime(self) -> None:
+        """Apply real-time settings to the serial writer thread."""
+        realtime_config: RealtimeConfig = self.config.realtime_config
+        self.realtime_reports.append(
+            apply_realtime(realtime_config.SERIAL_CPUS, realtime_config.SERIAL_PRIORITY)
+        )
+
+    def _apply_control_realtime(self) -> None:
+        """Apply real-time settings to the control thread and report all settings."""
+        realtime_config: RealtimeConfig = self.config.realtime_config
+        self.realtime_reports.append(
+            apply_realtime(realtime_config.CONTROL_CPUS, realtime_config.CONTROL_PRIORITY)
+        )
+        for report in self.realtime_reports:
+            self.logger.info(describe_realtime(report))
+
+    def _on_input_stall(self, stale_for: float, latency: float) -> None:
+        """
+        Zero the drive when the input watchdog trips.
+
+        Args:
+            stale_for: Seconds since the last remote control input.
+            latency: Seconds between the watchdog deadline and detection.
+        """
+        self.controller.speed = 0.0
+        self.controller.turn = 0.0
+        self.logger.warning(
+            f"No remote control input for {stale_for * 1000:.0f} ms, drive zeroed "
+            f"(trigger latency {latency * 1000:.1f} ms)."
+        )
+
+    def _reload_config(self) -> None:
+        """Apply a validated configuration from the reloader to every consumer."""
+        pending = self.config_reloader.take()
+        if pending is None:
+            return
+        config: Config = pending.config
+        self.config = config
+        apply_config = getattr(self.controller, "apply_config", None)
+        if apply_config is not None:
+            apply_config(config)
+        self.watchdog.timeout = config.ugv_config.INPUT_TIMEOUT
+        self.scheduler.period = 1.0 / config.ugv_config.LOOP_HZ
+        self.scheduler.policy = config.ugv_config.LOOP_POLICY
+        self.hotlog.min_interval = config.logging_config.DRIVE_LOG_INTERVAL
+        self.logger.info(
+            f"Reloaded config ({', '.join(pending.changed)}): validated in "
+            f"{pending.validation_time * 1000:.1f} ms, applied "
+            f"{self.config_reloader.latencies[-1] * 1000:.1f} ms after the change "
+            f"was seen."
+        )
+
+    def _on_config_rejected(self, reason: str) -> None:
+        """
+        Report a rejected config reload. The current config stays in use.
+
+        Args:
+            reason: Why the reload was rejected.
+        """
+        self.logger.warning(f"Config reload rejected: {reason}")
+
     def _terminate(self) -> None:
         """Kill system by killing controller"""
         self.controller.stop = True
 
-    def _loop(self) -> None:
+    def _tick(self) -> None:
         """
-        Main system loop to send commands to the UGV based on remote controller input.
-        Logs output at a reduced frequency.
+        One iteration of the main system loop.
         """
-        log_freq: float = 0.5  # Frequency of logging in seconds
-        last_log: float = time.time()
-        while not self.controller.stop:
-            # Determine if it's time to log
-            log: bool = False
-            if (time.time() - last_log) > log_freq:
-                log = True
-                last_log = time.time()
+        # Config changes are only applied here, between ticks
+        if self.config_reloader is not None and self.config_reloader.pending:
+            self._reload_config()
 
-            # Drive the UGV using current remote controller inputs
-            self._drive(self.controller.speed, self.controller.turn, log=log)
+        # Drive the UGV using current remote controller inputs, unless stale
+        if self.watchdog.check():
+            self._drive(0.0, 0.0, log=True)
+        else:
+            self._drive(self.controller.speed, self.controller.turn, log=True)
 
-            if self.camera_exists and self.is_recording != self.controller.recording:
+        # Recording changes are only posted to the camera worker
+        if self.camera_exists and self._camera_available():
+            if self.is_recording != self.controller.recording:
                 self._toggle_camera_recording()
+            self._check_camera_worker()
+            self._log_camera_events()
 
-            time.sleep(0.01)  # Sleep to reduce CPU usage
+    def _loop(self) -> None:
+        """
+        Main system loop to send commands to the UGV based on remote controller input.
+        Runs `_tick` at a fixed rate until the controller stops.
+        """
+        # Started first, so the reloader does not inherit the control thread's
+        # real-time policy and CPUs
+        if self.config_reloader is not None:
+            self.config_reloader.start()
+        if self.realtime:
+            self._apply_control_realtime()
+        try:
+            self.scheduler.run(self._tick, lambda: self.controller.stop)
+        except Exception:
+            self.logger.exception("Control loop failed!")
+            self._dump_drive_ring()
+            raise
+        finally:
+            if self.config_reloader is not None:
+                self.config_reloader.stop()
 
         if self.controller.stop:
             self.logger.info("Stop command received, exiting!")
             self._tidy_up()
 
+    def _dump_drive_ring(self) -> None:
+        """Write the recent drive decisions to disk, if they are being kept."""
+        if self.drive_ring is None:
+            return
+        path: str = self.config.logging_config.DRIVE_RING_PATH
+        written: int = self.drive_ring.dump(path)
+        self.logger.info(f"Dumped {written} recent drive commands to {path}.")
+
     def run(self) -> None:
         """
         Start the system threads for remote control and main loop.
@@ -156,7 +527,7 @@ class UGVSystem:
             target=self.controller.listen, args=(60,)
         )
         # Thread to handle the system's main loop
-        system_loop_thread: Thread = Thread(target=self._loop)
+        system_loop_thread: Thread = Thread(target=self._loop, name="control")
 
         remote_control_thread.start()
         system_loop_thread.start()
@@ -1,9 +1,21 @@
+import hashlib
+import json
 import os
-import pyfiglet
 import subprocess
-from typing import Union
+import sys
+from pathlib import Path
+from typing import Iterable, Union
 import logging
 
+ROOT_PATH = Path(__file__).resolve().parent.parent
+# Everything that can change the outcome of the boot self-test.
+SELF_TEST_PATHS = [
+    ROOT_PATH / "src",
+    ROOT_PATH / "tests",
+    ROOT_PATH / "config",
+    ROOT_PATH / "main.py",
+]
+
 # General util functions
 
 
@@ -53,6 +65,9 @@ def normalise_to_range(
 def run_tests() -> bool:
     """Run pytest tests.
 
+    The suite logs to a temporary file of its own without rotation (see
+    tests/conftest.py), so it never rotates the log this process writes.
+
     Returns:
         bool: True if tests pass, False otherwise.
     """
@@ -62,14 +77,66 @@ def run_tests() -> bool:
     return result.returncode == 0
 
 
-def delete_file(file_path: str) -> None:
-    """Deletes the specified file if it exists.
+def tree_hash(paths: Iterable[Path]) -> str:
+    """Hash the contents of files and directory trees.
+
+    Python caches and the compiled config cache (`*.cache`, rewritten on
+    every load) are ignored. The Python version is included, since the same
+    source can behave differently under another interpreter.
+
+    Args:
+        paths: Files and directories to hash.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256(sys.version.encode("utf-8"))
+    for path in paths:
+        files = sorted(path.rglob("*")) if path.is_dir() else [path]
+        for file in files:
+            if (
+                not file.is_file()
+                or "__pycache__" in file.parts
+                or file.suffix == ".pyc"
+                or file.name.endswith((".cache", ".cache.tmp"))
+            ):
+                continue
+            digest.update(str(file.relative_to(path.parent)).encode("utf-8"))
+            digest.update(b"\0")
+            digest.update(file.read_bytes())
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def self_test_cached(cache_file: str, source_hash: str) -> bool:
+    """Check whether the self-test last passed for the given source hash.
+
+    Args:
+        cache_file: Path to the self-test cache.
+        source_hash: Hash of the current tree, from `tree_hash`.
+
+    Returns:
+        bool: True if a passing result is cached for this hash.
+    """
+    try:
+        with open(cache_file, "r") as file:
+            return json.load(file).get("passed_hash") == source_hash
+    except (OSError, ValueError):
+        return False
+
+
+def record_self_test_pass(cache_file: str, source_hash: str) -> None:
+    """Cache a passing self-test result for the given source hash.
 
     Args:
-        file_path: Path to the file to delete.
+        cache_file: Path to the self-test cache.
+        source_hash: Hash of the tree that passed, from `tree_hash`.
     """
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    directory = os.path.dirname(cache_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(cache_file, "w") as file:
+        json.dump({"passed_hash": source_hash}, file)
 
 
 def print_ugv_system_banner(logger: logging.Logger) -> None:
@@ -78,5 +145,7 @@ def print_ugv_system_banner(logger: logging.Logger) -> None:
     Args:
         logger: Logger instance to log the banner output.
     """
+    import pyfiglet  # only needed once, at startup
+
     banner: str = pyfiglet.figlet_format("UGV System")
     logger.info("Starting System...\n" + banner)
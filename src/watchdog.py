@@ -0,0 +1,100 @@
+import time
+from collections import deque
+from typing import Callable, Deque, Optional
+
+
+class InputWatchdog:
+    """
+    Monitors the freshness of remote control input.
+
+    The input source calls `feed` from its listener thread for every event
+    it receives, and periodically while that thread is reading but idle, and
+    the control loop calls `check` once per tick. When no input has been seen
+    for longer than `timeout` seconds the watchdog trips, so the caller can
+    zero the drive. Neither call blocks.
+
+    The watchdog is only armed once the first input has been received, so the
+    system does not trip while waiting for the remote control to connect.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        on_trip: Optional[Callable[[float, float], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        history: int = 100,
+    ) -> None:
+        """
+        Initialise the InputWatchdog.
+
+        Args:
+            timeout: Seconds without input before tripping. 0 disables the watchdog.
+            on_trip: Callback invoked once per trip with (stale_for, latency),
+                both in seconds. Latency is how long after the deadline the
+                stall was detected.
+            clock: Monotonic time source, replaceable for testing.
+            history: Number of trigger latencies to keep for reporting.
+        """
+        self.timeout: float = timeout
+        self.on_trip = on_trip
+        self._clock = clock
+        self._last_input: Optional[float] = None
+        self.tripped: bool = False
+        self.trip_count: int = 0
+        self.trip_latencies: Deque[float] = deque(maxlen=history)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the watchdog is configured to trip at all."""
+        return self.timeout > 0
+
+    def feed(self) -> None:
+        """Record that input was received now."""
+        self._last_input = self._clock()
+
+    def reset(self) -> None:
+        """Disarm the watchdog until the next call to `feed`."""
+        self._last_input = None
+        self.tripped = False
+
+    def check(self) -> bool:
+        """
+        Check input freshness.
+
+        Returns:
+            bool: True if the input is stale and the drive should be zeroed.
+        """
+        last_input = self._last_input
+        if not self.enabled or last_input is None:
+            return False
+
+        now: float = self._clock()
+        stale_for: float = now - last_input
+        if stale_for <= self.timeout:
+            self.tripped = False
+            return False
+
+        if not self.tripped:
+            self.tripped = True
+            self.trip_count += 1
+            latency: float = stale_for - self.timeout
+            self.trip_latencies.append(latency)
+            if self.on_trip is not None:
+                self.on_trip(stale_for, latency)
+        return True
+
+    def summary(self) -> str:
+        """
+        Summarise trips and trigger latencies.
+
+        Returns:
+            str: Human readable summary for logging.
+        """
+        if not self.trip_latencies:
+            return f"Input watchdog: {self.trip_count} trips."
+        latencies_ms = [latency * 1000 for latency in self.trip_latencies]
+        return (
+            f"Input watchdog: {self.trip_count} trips, trigger latency "
+            f"mean {sum(latencies_ms) / len(latencies_ms):.1f} ms, "
+            f"max {max(latencies_ms):.1f} ms."
+        )
@@ -0,0 +1,22 @@
+import shutil
+import tempfile
+from dataclasses import replace
+
+import config.config as config_module
+from src.logger import isolated_logging
+
+# Tests, including the boot self-test, log and dump the drive ring into a
+# temporary directory instead of over the rover's own post-mortem files.
+# The self-test runs while main.py is logging, so its log is never rotated
+# either: two processes rotating one file would race.
+_log_dir: str = tempfile.mkdtemp(prefix="ugv_tests_")
+config_module.config = isolated_logging(config_module.config, _log_dir)
+config_module.config = replace(
+    config_module.config,
+    logging_config=replace(config_module.config.logging_config, MAX_BYTES=0, ROTATE_INTERVAL=0),
+)
+
+
+def pytest_unconfigure(config):
+    """Remove the temporary log directory."""
+    shutil.rmtree(_log_dir, ignore_errors=True)
@@ -0,0 +1,145 @@
+import os
+import time
+
+from config.schema import RecordingConfig
+from src.camera import Camera
+from src.camera_backends import SyntheticBackend
+
+
+def test_frames_from_backend():
+    """Test that subscribers and callbacks get consecutive frames with sensor timestamps."""
+    camera = Camera(
+        resolution=(64, 48), lores=None, backend=SyntheticBackend(fps=200), pool_size=10
+    )
+    seen = []
+    camera.add_callback(lambda frame: seen.append(frame.id))
+    subscription = camera.subscribe(mode="every", maxsize=8)
+
+    frames = []
+    for frame in subscription:
+        with frame:
+            assert frame.array.shape == (48, 64, 3)
+            frames.append((frame.id, frame.timestamp))
+        if len(frames) == 5:
+            break
+    camera.camera_close()
+
+    ids = [frame_id for frame_id, _ in frames]
+    assert ids == list(range(ids[0], ids[0] + 5))
+    timestamps = [timestamp for _, timestamp in frames]
+    assert timestamps == sorted(timestamps)
+    assert seen == list(range(seen[0], seen[0] + len(seen)))
+    assert camera.frame_stats()["main"]["dropped"] == 0
+
+
+def test_lores_stream_from_same_frames():
+    """Test that the lores stream is YUV420 and shares frame IDs with the main stream."""
+    camera = Camera(
+        resolution=(128, 96), lores=(64, 48), backend=SyntheticBackend(fps=200), pool_size=8
+    )
+    main = camera.subscribe("main", mode="every", maxsize=8)
+    lores = camera.subscribe("lores", mode="every", maxsize=8)
+    timestamps = {"main": {}, "lores": {}}
+    for name, subscription in (("main", main), ("lores", lores)):
+        for _ in range(3):
+            with subscription.get(timeout=1) as frame:
+                timestamps[name][frame.id] = frame.timestamp
+                shape = frame.array.shape
+        assert shape == ((96, 128, 3) if name == "main" else (72, 64))
+    camera.camera_close()
+
+    shared = set(timestamps["main"]) & set(timestamps["lores"])
+    assert shared
+    assert all(timestamps["main"][i] == timestamps["lores"][i] for i in shared)
+    stats = camera.frame_stats()
+    assert stats["lores"]["frames"] == stats["main"]["frames"]
+    assert stats["lores"]["fps"] > 0
+    assert "lores 64x48" in camera.summary()
+
+
+def test_recording_includes_preroll(tmp_path):
+    """Test that a recording starts at a keyframe before the request and decodes."""
+    import av
+
+    from src.recording import H264FileSink
+
+    camera = Camera(
+        resolution=(64, 48),
+        lores=None,
+        backend=SyntheticBackend(fps=100),
+        recording=RecordingConfig(PREROLL_SECONDS=0.2),
+    )
+    time.sleep(0.5)
+    path = str(tmp_path / "video.h264")
+    camera.recorder.start_recording(H264FileSink(path))
+    time.sleep(0.1)
+    stats = camera.recorder.stop_recording()
+    camera.camera_close()
+
+    assert stats["preroll_seconds"] >= 0.2
+    assert stats["error"] is None
+    with av.open(path) as container:
+        frames = list(container.decode(video=0))
+    assert len(frames) == stats["frames"]
+    assert frames[0].key_frame
+
+
+def test_backend_replays_video(tmp_path):
+    """Test that a replayed video is scaled into both streams and loops."""
+    import cv2
+    import numpy as np
+
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+    for level in (40, 200):
+        for _ in range(2):
+            writer.write(np.full((48, 64, 3), level, np.uint8))
+    writer.release()
+
+    camera = Camera(
+        resolution=(32, 24),
+        lores=(16, 12),
+        backend=SyntheticBackend(fps=200, video=path),
+        pool_size=12,
+    )
+    main = camera.subscribe("main", mode="every", maxsize=10)
+    lores = camera.subscribe("lores", mode="every", maxsize=10)
+    levels = []
+    for _ in range(6):
+        with main.get(timeout=1) as frame:
+            assert frame.array.shape == (24, 32, 3)
+            levels.append(int(frame.array.mean()))
+        with lores.get(timeout=1) as frame:
+            assert frame.array.shape == (18, 16)
+    camera.camera_close()
+
+    bright = [level > 120 for level in levels]
+    assert True in bright and False in bright
+    # Four frames per pass, so frames four apart match once looping
+    assert bright[:2] == bright[4:6]
+
+
+def test_segments_indexed_by_sensor_time(tmp_path):
+    """Test that a recording's frame index holds the sensor timestamps of its frames."""
+    import av
+
+    from src.recording import IndexedSink
+
+    camera = Camera(resolution=(64, 48), lores=None, backend=SyntheticBackend(fps=100))
+    captured = set()
+    camera.add_callback(lambda frame: captured.add(frame.timestamp // 1000))
+    camera.start_recording(str(tmp_path), "video.mp4")
+    time.sleep(0.3)
+    camera.stop_recording()
+    camera.camera_close()
+
+    assert sorted(os.listdir(tmp_path)) == ["video_000.idx", "video_000.mp4"]
+    records = IndexedSink.load(str(tmp_path / "video_000.idx"))
+    with av.open(str(tmp_path / "video_000.mp4")) as container:
+        times = [round(frame.time * 1e6) for frame in container.decode(video=0)]
+    assert [record.pts for record in records] == times
+    assert records[0].keyframe
+    # Pre-roll frames may predate the callback
+    indexed = [record.timestamp // 1000 for record in records]
+    assert all(t in captured for t in indexed if t >= min(captured))
+    assert len(captured.intersection(indexed)) > 10
@@ -0,0 +1,87 @@
+import threading
+import time
+
+from src.camera_worker import CameraProcess, CameraThread
+
+
+class FakeCamera:
+    """Camera stand-in that runs inside the worker process."""
+
+    def __init__(self, fail_start: bool = False) -> None:
+        self.fail_start = fail_start
+
+    def start_recording(self, path: str, video_file: str) -> None:
+        if self.fail_start:
+            raise RuntimeError("no sensor")
+
+    def stop_recording(self) -> None:
+        pass
+
+    def camera_close(self) -> None:
+        pass
+
+
+def wait_for_state(camera, state, timeout=10):
+    """Poll the worker until it reports the given state."""
+    messages = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        messages += camera.poll_status()
+        if camera.status["state"] == state:
+            return messages
+        time.sleep(0.01)
+    raise AssertionError(f"Worker never reached {state}: {camera.status}")
+
+
+def test_recording_commands():
+    """Test that commands are executed by the worker and reported back."""
+    camera = CameraProcess(FakeCamera)
+    wait_for_state(camera, "idle")
+
+    camera.start_recording("/tmp", "video.mp4")
+    messages = wait_for_state(camera, "recording")
+    assert messages[-1]["command"] == "start_recording"
+
+    camera.stop_recording()
+    wait_for_state(camera, "idle")
+
+    camera.camera_close()
+    assert camera.status["state"] == "closed"
+    assert not camera.process.is_alive()
+
+
+def test_errors_reported():
+    """Test that a failing camera call is reported rather than raised."""
+    camera = CameraProcess(FakeCamera, fail_start=True)
+    wait_for_state(camera, "idle")
+
+    camera.start_recording("/tmp", "video.mp4")
+    deadline = time.monotonic() + 10
+    errors = []
+    while not errors and time.monotonic() < deadline:
+        errors = [m["error"] for m in camera.poll_status() if m["error"]]
+        time.sleep(0.01)
+    assert "no sensor" in errors[0]
+    camera.camera_close()
+
+
+def test_thread_commands_do_not_block():
+    """Test that a slow recording start runs on the worker thread, not the caller's."""
+    camera = FakeCamera()
+    release = threading.Event()
+    camera.start_recording = lambda path, video_file: release.wait(5)
+    worker = CameraThread(camera)
+
+    started = time.monotonic()
+    worker.start_recording("/tmp", "video.mp4")
+    worker.stop_recording()
+    assert time.monotonic() - started < 0.1
+    assert worker.fail_start is False  # passed through to the camera
+
+    release.set()
+    worker.camera_close()
+    messages = worker.poll_status()
+    commands = [m.get("command") for m in messages]
+    assert commands == [None, "start_recording", "stop_recording", None]
+    assert messages[-1]["state"] == "closed"
+    assert not worker.thread.is_alive()
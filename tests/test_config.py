@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+import config.config as config_module
+from config.config import load_config
+from config.schema import Config, ConfigError, as_config
+
+sample_yaml = b"""
+ugv_config:
+  SPEED_MAX: 0.4
+  LOOP_HZ: 50
+realtime_config:
+  CONTROL_CPUS: [1, 2]
+"""
+
+
+def test_from_dict_defaults_and_types():
+    """Test that missing settings take defaults and values are converted."""
+    config = Config.from_dict(
+        {"ugv_config": {"SPEED_MAX": 1, "LOOP_HZ": 50}, "realtime_config": {"SERIAL_CPUS": [0]}}
+    )
+    assert config.ugv_config.SPEED_MAX == 1.0
+    assert isinstance(config.ugv_config.SPEED_MAX, float)
+    assert config.ugv_config.LOOP_POLICY == "skip"
+    assert config.realtime_config.SERIAL_CPUS == (0,)
+    assert config.udp_config.PORT == 5005
+
+
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        ({"ugv_confg": {}}, "Unknown config sections: ugv_confg"),
+        ({"ugv_config": {"SPEED": 1}}, "unknown settings: SPEED"),
+        ({"ugv_config": {"SPEED_MAX": "fast"}}, "SPEED_MAX must be a number"),
+        ({"ugv_config": {"LOOP_HZ": True}}, "LOOP_HZ must be a number"),
+        ({"ugv_config": {"LOOP_POLICY": "later"}}, "LOOP_POLICY"),
+        ({"ugv_config": {"SPEED_MIN": 1, "SPEED_MAX": 0.5}}, "SPEED_MIN"),
+        ({"ps4_controller_config": {"R2_MIN": 5, "R2_MAX": 5}}, "R2_MIN"),
+        ({"udp_config": {"PORT": 70000}}, "PORT"),
+        ({"realtime_config": {"CONTROL_CPUS": [1.5]}}, "list of integers"),
+        ({"logging_config": {"BACKUP_COUNT": -1}}, "BACKUP_COUNT"),
+    ],
+)
+def test_from_dict_rejects_invalid(data, message):
+    """Test that invalid configurations are rejected with a useful reason."""
+    with pytest.raises(ConfigError, match=message):
+        Config.from_dict(data)
+
+
+def test_config_is_frozen():
+    """Test that compiled configs cannot be changed in place."""
+    config = as_config({})
+    assert as_config(config) is config
+    with pytest.raises(AttributeError):
+        config.ugv_config.SPEED_MAX = 1.0
+
+
+def test_load_config_cache(tmp_path, monkeypatch):
+    """Test that the cache skips parsing until the YAML contents change."""
+    yaml_path = tmp_path / "config.yaml"
+    cache_path = tmp_path / "config.yaml.cache"
+    yaml_path.write_bytes(sample_yaml)
+    compiled = []
+    compile_config = config_module.compile_config
+    monkeypatch.setattr(
+        config_module,
+        "compile_config",
+        lambda yaml_bytes: compiled.append(yaml_bytes) or compile_config(yaml_bytes),
+    )
+
+    first = load_config(yaml_path, cache_path)
+    assert first.ugv_config.SPEED_MAX == 0.4
+    assert first.realtime_config.CONTROL_CPUS == (1, 2)
+    assert load_config(yaml_path, cache_path) == first
+    assert len(compiled) == 1
+
+    # Touched but unchanged: reused by content hash
+    stat = os.stat(yaml_path)
+    os.utime(yaml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_config(yaml_path, cache_path) == first
+    assert len(compiled) == 1
+
+    yaml_path.write_bytes(sample_yaml.replace(b"0.4", b"0.3"))
+    assert load_config(yaml_path, cache_path).ugv_config.SPEED_MAX == 0.3
+    assert len(compiled) == 2
+
+    cache_path.write_bytes(b"corrupt")
+    assert load_config(yaml_path, cache_path).ugv_config.SPEED_MAX == 0.3
+    assert len(compiled) == 3
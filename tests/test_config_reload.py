@@ -0,0 +1,146 @@
+import os
+from threading import Thread
+from unittest.mock import MagicMock
+
+from config.schema import Config
+from src.config_reload import ConfigReloader
+from src.logger import isolated_logging
+from src.ugv_system import UGVSystem
+from src.udp_controller import UDPRemoteController
+
+base_yaml = """
+ugv_config:
+  SPEED_MAX: 0.5
+udp_config:
+  PORT: 0
+"""
+
+
+def make_reloader(tmp_path, text=base_yaml):
+    """Write a config file and watch it."""
+    path = tmp_path / "config.yaml"
+    path.write_text(text)
+    rejected = []
+    reloader = ConfigReloader(
+        Config.from_dict({"ugv_config": {"SPEED_MAX": 0.5}, "udp_config": {"PORT": 0}}),
+        path,
+        on_reject=rejected.append,
+    )
+    return reloader, path, rejected
+
+
+def test_valid_change_is_pending(tmp_path):
+    """Test that a valid change is validated and left for the control loop."""
+    reloader, path, rejected = make_reloader(tmp_path)
+    assert not reloader.poll()
+
+    path.write_text(base_yaml.replace("0.5", "0.35"))
+    assert reloader.poll()
+    assert reloader.pending
+    pending = reloader.take()
+    assert pending.config.ugv_config.SPEED_MAX == 0.35
+    assert pending.changed == ["ugv_config.SPEED_MAX"]
+    assert not reloader.pending and reloader.take() is None
+    assert reloader.reloads == 1 and len(reloader.latencies) == 1
+    assert rejected == []
+
+
+def test_invalid_changes_rejected(tmp_path):
+    """Test that invalid files and restart-only changes are rejected with a reason."""
+    reloader, path, rejected = make_reloader(tmp_path)
+
+    path.write_text(base_yaml.replace("SPEED_MAX: 0.5", "SPEED_MAX: fast"))
+    assert not reloader.poll()
+    path.write_text(base_yaml + "  bad: [unclosed\n")
+    assert not reloader.poll()
+    path.write_text(base_yaml.replace("PORT: 0", "PORT: 6000"))
+    assert not reloader.poll()
+
+    assert not reloader.pending
+    assert "SPEED_MAX must be a number" in rejected[0]
+    assert "config.yaml is invalid" in rejected[1]
+    assert "udp_config.PORT cannot change without a restart" in rejected[2]
+    assert list(reloader.rejections) == rejected
+
+
+def test_reload_applied_between_ticks(tmp_path):
+    """Test that UGVSystem swaps a reloaded config into every consumer on the next tick."""
+    path = tmp_path / "config.yaml"
+    config = isolated_logging(
+        Config.from_dict({"ugv_config": {"SPEED_MAX": 0.5}, "udp_config": {"PORT": 0}}),
+        str(tmp_path),
+    )
+    logging_yaml = (
+        f"logging_config:\n  LOG_FILE: {config.logging_config.LOG_FILE}\n"
+        f"  DRIVE_RING_PATH: {config.logging_config.DRIVE_RING_PATH}\n"
+    )
+    path.write_text(base_yaml + logging_yaml)
+    controller = UDPRemoteController(config)
+    system = UGVSystem(
+        config=config,
+        base_path="test",
+        debug_logging=False,
+        base=MagicMock(),
+        controller=controller,
+        config_path=path,
+    )
+    system.logger = MagicMock()
+
+    path.write_text(
+        base_yaml.replace("SPEED_MAX: 0.5", "SPEED_MAX: 0.3\n  LOOP_HZ: 50")
+        + "  MAX_PACKET_AGE: 0.2\n"
+        + logging_yaml
+        + "  DRIVE_LOG_INTERVAL: 2\n"
+    )
+    assert system.config_reloader.poll()
+    assert system.config.ugv_config.SPEED_MAX == 0.5  # not applied until a tick
+
+    system._tick()
+    assert system.config.ugv_config.SPEED_MAX == 0.3
+    assert controller.config is system.config
+    assert controller.max_packet_age == 0.2
+    assert system.scheduler.period == 1 / 50
+    assert system.hotlog.min_interval == 2
+    messages = [call.args[0] for call in system.logger.info.call_args_list]
+    assert any(m.startswith("Reloaded config") and "ugv_config.SPEED_MAX" in m for m in messages)
+
+
+def test_reloader_thread_not_realtime(tmp_path):
+    """Test that the reloader thread keeps the default policy and CPUs under --realtime."""
+    path = tmp_path / "config.yaml"
+    path.write_text(base_yaml)
+    cpus = os.sched_getaffinity(0)
+    config = isolated_logging(
+        Config.from_dict(
+            {
+                "udp_config": {"PORT": 0},
+                "realtime_config": {"CONTROL_CPUS": [max(cpus)], "CONTROL_PRIORITY": 10},
+            }
+        ),
+        str(tmp_path),
+    )
+    controller = UDPRemoteController(config)
+    system = UGVSystem(
+        config=config,
+        base_path="test",
+        debug_logging=False,
+        base=MagicMock(),
+        controller=controller,
+        config_path=path,
+        realtime=True,
+    )
+    system.logger = MagicMock()
+    observed = {}
+
+    def tick():
+        reloader_id = system.config_reloader._thread.native_id
+        observed["policy"] = os.sched_getscheduler(reloader_id)
+        observed["cpus"] = os.sched_getaffinity(reloader_id)
+        controller.stop = True
+
+    system._tick = tick
+    loop_thread = Thread(target=system._loop)  # keeps the test runner unaffected
+    loop_thread.start()
+    loop_thread.join()
+
+    assert observed == {"policy": os.SCHED_OTHER, "cpus": cpus}
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import numpy as np
+
+from src.cv_worker import CVWorker
+
+
+def wait_until(condition, timeout=5):
+    """Poll until `condition()` is true."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert condition()
+
+
+def test_stale_frames_dropped():
+    """Test that frames submitted while the worker is busy replace each other."""
+    release = threading.Event()
+    seen = []
+
+    def process(frame, mode):
+        seen.append((int(frame[0]), mode))
+        release.wait(5)
+
+    worker = CVWorker(process)
+    worker.submit(np.array([0]), "faces")
+    wait_until(lambda: seen)
+    for value in (1, 2, 3):
+        worker.submit(np.array([value]), "faces")
+    release.set()
+    wait_until(lambda: worker.processed == 2)
+    worker.close(timeout=5)
+
+    assert seen == [(0, "faces"), (3, "faces")]
+    assert worker.last_id == 3
+    stats = worker.stats()
+    assert (stats["submitted"], stats["processed"], stats["dropped"]) == (4, 2, 2)
+    assert stats["modes"]["faces"]["frames"] == 2
+    assert "2 dropped" in worker.summary()
+
+
+def test_copy_only_for_idle_worker():
+    """Test that a frame submitted with `copy` is copied only when a worker can take it."""
+    release = threading.Event()
+    seen = []
+
+    def process(frame, mode):
+        seen.append(frame)
+        release.wait(5)
+
+    worker = CVWorker(process)
+    wait_until(lambda: worker._idle == 1)
+    first = np.array([0])
+    worker.submit(first, copy=True)
+    wait_until(lambda: seen)
+    first[0] = 9  # drawn on after submitting
+    worker.submit(np.array([1]), copy=True)  # worker busy: dropped without a copy
+    assert (worker.submitted, worker.dropped) == (2, 1)
+
+    release.set()
+    wait_until(lambda: worker._idle == 1)
+    worker.submit(np.array([2]), copy=True)
+    wait_until(lambda: worker.processed == 2)
+    worker.close(timeout=5)
+
+    assert [int(frame[0]) for frame in seen] == [0, 2]
+    assert seen[0] is not first
+
+
+def test_errors_counted_and_workers_kept():
+    """Test that a failing mode is counted without stopping the workers."""
+
+    def process(frame, mode):
+        if mode == "broken":
+            raise RuntimeError("no model")
+
+    worker = CVWorker(process, workers=2)
+    worker.submit(np.zeros(1), "broken")
+    wait_until(lambda: worker.processed == 1)
+    worker.submit(np.zeros(1), "color")
+    wait_until(lambda: worker.processed == 2)
+    worker.close(timeout=5)
+
+    assert worker.errors == 1
+    assert "no model" in str(worker.last_error)
+    assert set(worker.stats()["modes"]) == {"broken", "color"}
+    assert not any(thread.is_alive() for thread in worker._threads)
+    worker.submit(np.zeros(1), "color")  # ignored once closed
+    assert worker.submitted == 2
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from src.frame_stream import FramePool, FrameStream
+
+
+def publish(stream, count, start=0):
+    """Publish `count` frames filled with their frame ID."""
+    for frame_id in range(start, start + count):
+        stream.publish(np.full(stream.shape, frame_id, np.uint8), frame_id, frame_id * 1000)
+
+
+def test_pool_reuses_buffers():
+    """Test that released buffers are reused and an empty pool returns None."""
+    pool = FramePool((2, 2), size=2)
+    first = pool.acquire(0, 0, "main")
+    second = pool.acquire(1, 0, "main")
+    assert pool.acquire(2, 0, "main") is None
+    assert pool.in_use == 2
+
+    buffer = first.array
+    first.release()
+    third = pool.acquire(2, 0, "main")
+    assert third.array is buffer
+    second.release()
+    third.release()
+    assert pool.in_use == 0
+
+
+def test_double_release_raises():
+    """Test that releasing a frame more times than held raises and keeps the pool intact."""
+    pool = FramePool((2, 2), size=2)
+    frame = pool.acquire(0, 0, "main")
+    frame.release()
+    with pytest.raises(RuntimeError):
+        frame.release()
+    assert pool.in_use == 0
+    assert len(pool.free) == 2
+
+
+def test_latest_keeps_newest_frame():
+    """Test that a latest-only subscriber gets the newest frame and drops the rest."""
+    stream = FrameStream("main", (4, 4), pool_size=3)
+    subscription = stream.subscribe("latest")
+    publish(stream, 5)
+
+    with subscription.get(timeout=0) as frame:
+        assert frame.id == 4
+        assert frame.timestamp == 4000
+        assert (frame.array == 4).all()
+    assert subscription.get(timeout=0) is None
+    assert subscription.dropped == 4
+    assert stream.pool.in_use == 0
+
+
+def test_every_frame_in_order():
+    """Test that an every-frame subscriber gets frames in order until its queue fills."""
+    stream = FrameStream("main", (4, 4), pool_size=4)
+    subscription = stream.subscribe("every", maxsize=3)
+    publish(stream, 5)
+
+    ids = []
+    for _ in range(3):
+        with subscription.get(timeout=0) as frame:
+            ids.append(frame.id)
+    assert ids == [0, 1, 2]
+    assert subscription.dropped == 2
+    stats = stream.stats()
+    assert (stats["frames"], stats["delivered"], stats["dropped"]) == (5, 5, 0)
+    assert stats["subscriber_dropped"] == 2
+    assert stats["fps"] == pytest.approx(1e6)  # timestamps 1 us apart
+
+
+def test_held_frames_exhaust_pool():
+    """Test that frames are dropped, not overwritten, while consumers hold every buffer."""
+    stream = FrameStream("main", (4, 4), pool_size=2)
+    held = []
+    stream.add_callback(lambda frame: held.append(frame.retain()))
+    publish(stream, 3)
+
+    assert [frame.id for frame in held] == [0, 1]
+    assert (held[0].array == 0).all()
+    assert stream.stats()["dropped"] == 1
+
+
+def test_close_ends_iteration():
+    """Test that iterating a subscription stops once it is closed, releasing queued frames."""
+    stream = FrameStream("main", (4, 4), pool_size=2)
+    subscription = stream.subscribe("every")
+    publish(stream, 2)
+    stream.unsubscribe(subscription)
+
+    assert list(subscription) == []
+    assert stream.pool.in_use == 0
@@ -0,0 +1,76 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.hotlog import DriveRing, HotPathLogger
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_rate_limited_per_site():
+    """Test that each call site is limited independently."""
+    clock = FakeClock()
+    hotlog = HotPathLogger(MagicMock(), enabled=True, min_interval=0.5, clock=clock)
+    assert hotlog.due("drive") is True
+    assert hotlog.due("drive") is False
+    assert hotlog.due("camera") is True
+
+    clock.now = 0.6
+    assert hotlog.due("drive") is True
+    assert hotlog.suppressed == {"drive": 1}
+
+
+def test_disabled_never_logs():
+    """Test that a disabled logger never formats or logs."""
+    logger = MagicMock()
+    hotlog = HotPathLogger(logger, enabled=False)
+    hotlog.debug("drive", "speed: %s", 0.5)
+    assert hotlog.due("drive") is False
+    logger.debug.assert_not_called()
+
+
+def test_debug_defers_formatting():
+    """Test that arguments are passed through unformatted."""
+    logger = MagicMock()
+    hotlog = HotPathLogger(logger, enabled=True)
+    hotlog.debug("drive", "speed: %s", 0.5)
+    logger.debug.assert_called_once_with("speed: %s", 0.5)
+
+
+def test_ring_dump_partial(tmp_path):
+    """Test dumping a ring that has not wrapped yet."""
+    ring = DriveRing(4)
+    ring.record(1.0, 0.5, 0.0, 0.5, 0.5)
+    ring.record(2.0, 0.25, 0.5, 0.125, 0.25)
+    path = str(tmp_path / "ring.bin")
+    assert ring.dump(path) == 2
+    assert DriveRing.load(path) == [
+        (1.0, 0.5, 0.0, 0.5, 0.5),
+        (2.0, 0.25, 0.5, 0.125, 0.25),
+    ]
+
+
+def test_ring_dump_wrapped(tmp_path):
+    """Test that a wrapped ring dumps the newest records, oldest first."""
+    ring = DriveRing(3)
+    for t in range(5):
+        ring.record(float(t), 0.0, 0.0, 0.0, 0.0)
+    path = str(tmp_path / "ring.bin")
+    assert ring.dump(path) == 3
+    assert [record[0] for record in DriveRing.load(path)] == [2.0, 3.0, 4.0]
+
+
+def test_ring_load_rejects_other_files(tmp_path):
+    """Test that loading a file that is not a dump fails."""
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a dump")
+    with pytest.raises(ValueError):
+        DriveRing.load(str(path))
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from src.kinematics import calculate_track_speeds_batch
+from src.ugv_system import UGVSystem
+
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import given, strategies as st  # noqa: E402
+
+speeds = st.floats(min_value=-1.0, max_value=1.0, allow_nan=False)
+turns = st.floats(min_value=-1.0, max_value=1.0, allow_nan=False)
+
+
+def test_matches_pinned_cases():
+    """Test the cases pinned for the scalar version, including ordering."""
+    first, second = calculate_track_speeds_batch(
+        [0.5, 0.5, 0.5, 0, 0.5, 0.5, 1.0, 0.2],
+        [0, 1, -1, 0, 0.5, -0.5, -0.3, 0.8],
+    )
+    np.testing.assert_allclose(first, [0.5, 0.0, 0.5, 0, 0.25, 0.5, 1.0, 0.04])
+    np.testing.assert_allclose(second, [0.5, 0.5, 0.0, 0, 0.5, 0.25, 0.7, 0.2])
+
+
+@given(st.lists(st.tuples(speeds, turns), min_size=1, max_size=50))
+def test_matches_scalar(samples):
+    """Property: the batch result equals the scalar result for every sample."""
+    speed = np.array([sample[0] for sample in samples])
+    turn = np.array([sample[1] for sample in samples])
+    first, second = calculate_track_speeds_batch(speed, turn)
+    for i, (s, t) in enumerate(samples):
+        assert (first[i], second[i]) == UGVSystem._calculate_track_speeds(s, t)
@@ -0,0 +1,117 @@
+import gzip
+import logging
+import os
+import queue
+import threading
+
+from src.logger import (
+    DroppingQueueHandler,
+    _file_handlers,
+    SizeTimedRotatingFileHandler,
+    customLogger,
+    flush_logs,
+    rotated_logs,
+)
+
+
+def test_repeated_construction_does_not_duplicate(tmp_path):
+    """Test that building the same logger twice writes each line once."""
+    log_file = str(tmp_path / "test.log")
+    customLogger("test_logger_repeat", log_file, False)
+    logger = customLogger("test_logger_repeat", log_file, False)
+
+    logger.debug("only once")
+    flush_logs()
+
+    with open(log_file) as f:
+        lines = f.readlines()
+    assert len(lines) == 1
+    assert "test_logger_repeat - DEBUG - only once" in lines[0]
+
+
+def test_loggers_share_file(tmp_path):
+    """Test that two loggers writing to one file both reach it."""
+    log_file = str(tmp_path / "shared.log")
+    customLogger("test_logger_a", log_file, False).info("from a")
+    customLogger("test_logger_b", log_file, False).info("from b %d", 2)
+    flush_logs()
+
+    with open(log_file) as f:
+        contents = f.read()
+    assert "test_logger_a - INFO - from a" in contents
+    assert "test_logger_b - INFO - from b 2" in contents
+
+
+def test_new_file_replaces_route(tmp_path):
+    """Test that pointing a logger at another file stops it writing to the first."""
+    first, second = str(tmp_path / "first.log"), str(tmp_path / "second.log")
+    customLogger("test_logger_move", first, False).info("before")
+    logger = customLogger("test_logger_move", second, False)
+    logger.info("after")
+    flush_logs()
+
+    with open(first) as f:
+        contents = f.read()
+    assert "before" in contents and "after" not in contents
+    with open(second) as f:
+        assert "after" in f.read()
+    assert first not in _file_handlers  # closed once unused
+    compressors = [t for t in threading.enumerate() if t.name == "log_compressor"]
+    assert len(compressors) == 1  # shared by every file
+
+
+def test_dropped_when_full():
+    """Test that a full queue drops and counts records instead of blocking."""
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.makeLogRecord({"msg": "line %s", "args": ("x",)})
+    for _ in range(3):
+        handler.emit(record)
+    assert handler.dropped == 2
+    queued = handler.queue.get_nowait()
+    assert (queued.msg, queued.args) == ("line %s", ("x",))  # merged by the listener
+    assert queued.getMessage() == "line x"
+
+
+def test_size_rotation_and_compression(tmp_path):
+    """Test that the log rotates by size, compresses and keeps BACKUP_COUNT files."""
+    log_file = str(tmp_path / "rotate.log")
+    handler = SizeTimedRotatingFileHandler(
+        log_file, max_bytes=200, interval=0, backup_count=2
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    for i in range(80):
+        handler.emit(logging.makeLogRecord({"msg": f"line {i:02d} " + "x" * 40}))
+    handler.compressor.wait()
+    handler.close()
+
+    rotated = rotated_logs(log_file)
+    assert len(rotated) == 2
+    assert all(path.endswith(".gz") for path in rotated)
+    with gzip.open(rotated[-1], "rt") as f:
+        newest_rotated = f.read()
+    with open(log_file) as f:
+        live = f.read()
+    assert os.path.getsize(log_file) <= 200
+    assert "line 79" in live
+    assert int(newest_rotated.split()[-2]) == int(live.split()[1]) - 1
+
+
+def test_time_rotation(tmp_path):
+    """Test that the log rotates once the interval has passed."""
+    log_file = str(tmp_path / "timed.log")
+    handler = SizeTimedRotatingFileHandler(
+        log_file, max_bytes=0, interval=3600, backup_count=5
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.emit(logging.makeLogRecord({"msg": "before"}))
+    handler.rollover_at = 0
+    handler.emit(logging.makeLogRecord({"msg": "after"}))
+    handler.compressor.wait()
+    handler.close()
+
+    rotated = rotated_logs(log_file)
+    assert len(rotated) == 1
+    with gzip.open(rotated[0], "rt") as f:
+        assert f.read() == "before\n"
+    with open(log_file) as f:
+        assert f.read() == "after\n"
@@ -0,0 +1,70 @@
+import threading
+
+import cv2
+import numpy as np
+
+from src.overlay import OverlayLayers, make_layer
+
+
+def full_frame_composite(frame, overlay):
+    """The full-frame compositing the layers replace."""
+    mask = overlay.astype(bool)
+    frame[mask] = overlay[mask]
+    cv2.addWeighted(overlay, 1, frame, 1, 0, frame)
+
+
+def test_layer_matches_full_frame_composite():
+    """Test that compositing a layer's region gives the same frame as the full-frame blend."""
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (48, 64, 4), np.uint8)
+    overlay = np.zeros_like(frame)
+    cv2.rectangle(overlay, (10, 5), (30, 20), (0, 200, 90, 0), 1)
+    cv2.putText(overlay, "7", (40, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255, 0), 1)
+
+    layer = make_layer(overlay, version=3)
+    assert layer.version == 3
+    x, y, width, height = layer.box
+    assert (x, y) == (10, 5) and width < 64 and height < 48
+
+    layers = OverlayLayers()
+    layers.set("cv", overlay)
+    expected = frame.copy()
+    full_frame_composite(expected, overlay)
+    layers.composite(frame)
+    assert np.array_equal(frame, expected)
+
+
+def test_empty_and_replaced_layers():
+    """Test that empty layers are skipped and each update bumps the version."""
+    layers = OverlayLayers()
+    assert layers.set("cv", np.zeros((8, 8, 3), np.uint8)).box is None
+    overlay = np.zeros((8, 8, 3), np.uint8)
+    overlay[2, 3] = (0, 50, 0)
+    assert layers.set("cv", overlay).version == 2
+    assert layers.set("info", None).box is None
+
+    frame = np.full((8, 8, 3), 7, np.uint8)
+    layers.composite(frame)
+    assert frame[2, 3].tolist() == [7, 100, 7]
+    assert (frame != 7).sum() == 1
+
+    layers.clear()
+    assert layers.layers == {} and layers.version == 4
+
+
+def test_concurrent_sets_keep_every_layer():
+    """Test that layers set from several threads at once are all kept."""
+    layers = OverlayLayers()
+    overlay = np.zeros((8, 8, 3), np.uint8)
+    overlay[1, 1] = 255
+
+    def set_layers(thread):
+        for index in range(200):
+            layers.set(f"{thread}_{index}", overlay)
+
+    threads = [threading.Thread(target=set_layers, args=(thread,)) for thread in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(layers.layers) == 800 and layers.version == 800
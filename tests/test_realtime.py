@@ -0,0 +1,42 @@
+import os
+from threading import Thread
+
+from src.realtime import apply_realtime, describe_realtime
+
+
+def run_in_thread(*args):
+    """Apply settings in a throwaway thread so the test runner is unaffected."""
+    reports = []
+    thread = Thread(target=lambda: reports.append(apply_realtime(*args)), name="probe")
+    thread.start()
+    thread.join()
+    return reports[0]
+
+
+def test_nothing_requested():
+    """Test that no settings are applied when none are requested."""
+    report = run_in_thread(None, None)
+    assert report == {
+        "thread": "probe",
+        "cpus": None,
+        "policy": "default",
+        "priority": None,
+        "errors": [],
+    }
+
+
+def test_pin_to_available_cpu():
+    """Test pinning to a CPU the process is allowed to use."""
+    cpu = min(os.sched_getaffinity(0))
+    report = run_in_thread([cpu], None)
+    assert report["cpus"] == [cpu]
+    assert report["errors"] == []
+
+
+def test_fallback_on_invalid_settings():
+    """Test that rejected settings fall back and report why."""
+    report = run_in_thread([4095], 1000)
+    assert report["cpus"] is None
+    assert report["policy"] == "default"
+    assert len(report["errors"]) == 2
+    assert "Fell back" in describe_realtime(report)
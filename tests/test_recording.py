@@ -0,0 +1,284 @@
+import os
+import threading
+import time
+
+import av
+import numpy as np
+
+from src.camera_backends import SyntheticEncoder
+from src.recording import (
+    EncodedFrame,
+    H264FileSink,
+    IndexedSink,
+    Mp4Sink,
+    PrerollRecorder,
+    SegmentedSink,
+    StreamSink,
+    evict_oldest,
+    find_frame,
+)
+
+
+class ListSink(StreamSink):
+    """Sink keeping the frames it is given."""
+
+    def __init__(self) -> None:
+        self.written = []
+        self.closed = False
+        super().__init__()
+
+    def _write(self, frame: EncodedFrame) -> None:
+        self.written.append(frame)
+
+    def _close(self) -> None:
+        self.closed = True
+
+
+def feed(recorder, count, start=0, gop=10, size=100, fps=10):
+    """Give the recorder `count` frames, with a keyframe every `gop` frames."""
+    for index in range(start, start + count):
+        recorder.outputframe(bytes(size), index % gop == 0, index * 1_000_000 // fps)
+
+
+def test_ring_trimmed_by_whole_gops():
+    """Test that the pre-roll is bounded by time and always starts at a keyframe."""
+    recorder = PrerollRecorder(seconds=2.0)
+    feed(recorder, 3, start=7)  # no keyframe yet
+    assert recorder.buffered_bytes == 0
+    assert recorder.skipped == 3
+
+    feed(recorder, 45, start=10)
+    # Up to 5.4 s encoded; at least 2 s kept, in whole GOPs
+    assert recorder._ring[0].keyframe
+    assert recorder._ring[0].timestamp == 3_000_000
+    assert recorder.buffered_seconds == 2.4
+    assert recorder.buffered_bytes == 25 * 100
+
+
+def test_ring_bounded_by_bytes_keeps_current_gop():
+    """Test that the byte limit never drops the GOP being written."""
+    recorder = PrerollRecorder(seconds=60.0, max_bytes=1400)
+    feed(recorder, 25)
+    assert recorder._ring[0].timestamp == 2_000_000
+    assert recorder.buffered_bytes == 500
+
+
+def test_recording_starts_with_preroll():
+    """Test that a recording gets the pre-roll then every new frame, in order."""
+    recorder = PrerollRecorder(seconds=1.0)
+    feed(recorder, 25)
+    sink = ListSink()
+    recorder.start_recording(sink)
+    assert recorder.recording
+    feed(recorder, 5, start=25)
+    stats = recorder.stop_recording()
+
+    timestamps = [frame.timestamp for frame in sink.written]
+    assert timestamps == [index * 100_000 for index in range(10, 30)]
+    assert sink.written[0].keyframe
+    assert sink.closed
+    assert stats["frames"] == 20
+    assert stats["preroll_frames"] == 15
+    assert stats["start_latency"] >= 0
+    assert "first frame written" in recorder.summary()
+    assert recorder.stop_recording() is None
+
+
+class StalledSink(ListSink):
+    """List sink with a two-frame queue whose writer waits for `gate`."""
+
+    QUEUE_FRAMES = 2
+
+    def __init__(self) -> None:
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        super().__init__()
+
+    def _write(self, frame: EncodedFrame) -> None:
+        self.started.set()
+        self.gate.wait()
+        super()._write(frame)
+
+
+def test_full_sink_queue_drops_to_next_keyframe():
+    """Test that a stalled sink drops frames, up to the next keyframe, instead of blocking."""
+    sink = StalledSink()
+    frames = [EncodedFrame(bytes(10), index in (0, 4, 7), index) for index in range(9)]
+    sink.write(frames[0])
+    assert sink.started.wait(1)
+    for frame in frames[1:6]:
+        sink.write(frame)  # 1 and 2 fill the queue, 3 to 5 are dropped
+    assert sink.queue_dropped == 3
+
+    sink.gate.set()
+    while sink.frames < 3:
+        time.sleep(0.001)
+    for frame in frames[6:]:
+        sink.write(frame)  # 6 still depends on a dropped frame
+    sink.close()
+
+    assert [frame.timestamp for frame in sink.written] == [0, 1, 2, 7, 8]
+    assert sink.queue_dropped == 4
+
+
+class FileListSink(H264FileSink):
+    """File sink that also keeps the frames it is given."""
+
+    def __init__(self, path: str) -> None:
+        self.written = []
+        super().__init__(path)
+
+    def _write(self, frame: EncodedFrame) -> None:
+        super()._write(frame)
+        self.written.append(frame)
+
+
+def test_segments_roll_at_keyframes(tmp_path):
+    """Test that segments roll at keyframes without losing frames, and gaps are counted."""
+    segments = {}
+
+    def open_segment(path):
+        segments[path] = FileListSink(path)
+        return segments[path]
+
+    events = []
+    sink = SegmentedSink(
+        str(tmp_path),
+        "video.h264",
+        open_segment,
+        fps=10,
+        segment_seconds=1.0,
+        on_event=events.append,
+    )
+    recorder = PrerollRecorder(seconds=0)
+    recorder.start_recording(sink)
+    feed(recorder, 25, gop=5)
+    feed(recorder, 10, start=27, gop=5)  # frames 25 and 26 never arrive
+    recorder.stop_recording()
+
+    names = sorted(os.listdir(tmp_path))
+    assert names == ["video_000.h264", "video_001.h264", "video_002.h264", "video_003.h264"]
+    written = [segments[str(tmp_path / name)].written for name in names]
+    assert [len(frames) for frames in written] == [10, 10, 8, 7]
+    assert all(frames[0].keyframe for frames in written)
+    assert len(sink.roll_latencies) == 3
+    assert sink.dropped == 2
+    assert any("2 frames missing" in event for event in events)
+
+
+def test_evict_oldest(tmp_path):
+    """Test that the oldest segments and their indexes go to fit the quota, except those kept."""
+    for index in range(4):
+        for extension, size in ((".mp4", 90), (".idx", 10)):
+            path = tmp_path / f"video_2024-05-01_12-00-00_{index:03d}{extension}"
+            path.write_bytes(bytes(size))
+            os.utime(path, (index, index))
+    for name in ("notes.txt", "video_holiday.mp4", "video_000.txt"):
+        (tmp_path / name).write_bytes(bytes(1000))
+        os.utime(tmp_path / name, (0, 0))
+
+    kept = tmp_path / "video_2024-05-01_12-00-00_000.mp4"
+    evicted = evict_oldest(str(tmp_path), 250, keep=[str(kept)])
+    assert [os.path.basename(path) for path, _ in evicted] == [
+        "video_2024-05-01_12-00-00_001.mp4",
+        "video_2024-05-01_12-00-00_001.idx",
+        "video_2024-05-01_12-00-00_002.mp4",
+        "video_2024-05-01_12-00-00_002.idx",
+    ]
+    assert sorted(os.listdir(tmp_path)) == [
+        "notes.txt",
+        "video_000.txt",
+        "video_2024-05-01_12-00-00_000.idx",
+        "video_2024-05-01_12-00-00_000.mp4",
+        "video_2024-05-01_12-00-00_003.idx",
+        "video_2024-05-01_12-00-00_003.mp4",
+        "video_holiday.mp4",
+    ]
+
+
+def test_mp4_sink_keeps_encoder_timestamps(tmp_path):
+    """Test that the MP4 starts at a keyframe and keeps the encoder's timestamps and gaps."""
+    recorder = PrerollRecorder(seconds=60)
+    encoder = SyntheticEncoder(iperiod=5)
+    encoder.start(recorder, (64, 48), 10)
+    for index in range(20):
+        frame = np.full((48, 64, 3), index * 10, np.uint8)
+        encoder.encode(frame, index * 100_000_000)  # 10 fps
+    encoder.stop()
+    encoded = list(recorder._ring)
+
+    path = str(tmp_path / "video.mp4")
+    sink = Mp4Sink(path)
+    for frame in encoded[3:12] + encoded[14:]:  # starts mid-GOP, frames 12 and 13 lost
+        sink.write(frame)
+    sink.close()
+    assert sink.error is None
+    assert sink.skipped == 2
+
+    with av.open(path) as container:
+        times = [round(float(frame.time), 3) for frame in container.decode(video=0)]
+    assert times == [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.9, 1.0, 1.1, 1.2, 1.3, 1.4]
+
+
+def test_frame_index_on_monotonic_clock(tmp_path):
+    """Test that indexed frames get absolute sensor timestamps and can be found by time."""
+    inner = ListSink()
+    path = str(tmp_path / "video.idx")
+    sink = IndexedSink(inner, path, epoch=lambda: 5_000_000_000)  # encoder started at 5 s
+    recorder = PrerollRecorder(seconds=0)
+    recorder.start_recording(sink)
+    feed(recorder, 15, start=5, gop=5)
+    recorder.stop_recording()
+
+    assert len(inner.written) == 15 and inner.closed
+    records = IndexedSink.load(path)
+    assert [record.sequence for record in records] == list(range(15))
+    assert records[0].timestamp == 5_500_000_000
+    assert records[0].pts == 0 and records[1].pts == 100_000
+    assert [record.keyframe for record in records[:6]] == [True] + [False] * 4 + [True]
+
+    assert find_frame(records, 5.0) is None
+    assert find_frame(records, 5.75).sequence == 2
+    assert find_frame(records, 60.0).sequence == 14
+
+    unused = IndexedSink(ListSink(), str(tmp_path / "unused.idx"), epoch=lambda: 0)
+    unused.close()
+    assert sorted(os.listdir(tmp_path)) == ["video.idx"]
+
+
+def test_index_matches_mp4_frames(tmp_path):
+    """Test that frames an MP4 skips before its first keyframe are not indexed."""
+    recorder = PrerollRecorder(seconds=60)
+    encoder = SyntheticEncoder(iperiod=5)
+    encoder.start(recorder, (64, 48), 10)
+    for index in range(12):
+        encoder.encode(np.full((48, 64, 3), index * 10, np.uint8), index * 100_000_000)
+    encoder.stop()
+
+    path = str(tmp_path / "video.idx")
+    sink = IndexedSink(Mp4Sink(str(tmp_path / "video.mp4")), path, epoch=lambda: 0)
+    for frame in list(recorder._ring)[3:]:  # starts mid-GOP
+        sink.write(frame)
+    sink.close()
+
+    records = IndexedSink.load(path)
+    assert sink.sink.skipped == 2
+    assert [record.sequence for record in records] == list(range(7))
+    assert records[0].keyframe and records[0].pts == 0
+    with av.open(str(tmp_path / "video.mp4")) as container:
+        assert len(list(container.decode(video=0))) == len(records)
+
+
+def test_index_failure_keeps_recording(tmp_path):
+    """Test that frames still reach the recording when they cannot be indexed."""
+    inner = ListSink()
+    sink = IndexedSink(inner, str(tmp_path / "video.idx"), epoch=lambda: None)
+    recorder = PrerollRecorder(seconds=0)
+    recorder.start_recording(sink)
+    feed(recorder, 10, gop=5)
+    recorder.stop_recording()
+
+    assert len(inner.written) == 10 and inner.closed
+    assert sink.error is None
+    assert "start time unknown" in str(sink.index_error)
+    assert os.listdir(tmp_path) == []
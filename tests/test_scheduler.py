@@ -0,0 +1,83 @@
+import pytest
+from pytest import approx
+
+from src.scheduler import FixedRateScheduler, percentile
+
+
+class VirtualTime:
+    """Clock and sleep pair where time only advances when told to."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def run_ticks(scheduler, virtual_time, costs):
+    """Run one tick per entry in costs, each taking that many seconds."""
+    starts = []
+    remaining = list(costs)
+
+    def tick():
+        starts.append(virtual_time.now)
+        virtual_time.now += remaining.pop(0)
+
+    scheduler.run(tick, lambda: not remaining)
+    return starts
+
+
+def test_fixed_rate_without_drift():
+    """Test that tick cost does not shift the schedule."""
+    virtual_time = VirtualTime()
+    scheduler = FixedRateScheduler(
+        100, clock=virtual_time.clock, sleep=virtual_time.sleep
+    )
+    starts = run_ticks(scheduler, virtual_time, [0.004, 0.002, 0.009, 0.001])
+    assert starts == approx([0.0, 0.01, 0.02, 0.03])
+    assert scheduler.overruns == 0
+
+
+def test_skip_policy():
+    """Test that missed ticks are dropped under the skip policy."""
+    virtual_time = VirtualTime()
+    scheduler = FixedRateScheduler(
+        100, policy="skip", clock=virtual_time.clock, sleep=virtual_time.sleep
+    )
+    starts = run_ticks(scheduler, virtual_time, [0.035, 0.001, 0.001])
+    assert starts == approx([0.0, 0.04, 0.05])
+    assert scheduler.overruns == 1
+    assert scheduler.skipped == 3
+
+
+def test_catch_up_policy():
+    """Test that missed ticks run back to back under the catch up policy."""
+    virtual_time = VirtualTime()
+    scheduler = FixedRateScheduler(
+        100, policy="catch_up", clock=virtual_time.clock, sleep=virtual_time.sleep
+    )
+    starts = run_ticks(scheduler, virtual_time, [0.025, 0.001, 0.001, 0.001])
+    assert starts == approx([0.0, 0.025, 0.026, 0.03])
+    assert scheduler.skipped == 0
+    stats = scheduler.stats()
+    assert stats["ticks"] == 4
+    assert stats["jitter_max"] == approx(0.015)
+
+
+def test_invalid_arguments():
+    """Test that bad rates and policies are rejected."""
+    with pytest.raises(ValueError):
+        FixedRateScheduler(0)
+    with pytest.raises(ValueError):
+        FixedRateScheduler(100, policy="sometimes")
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile([], 0.5) == 0.0
@@ -0,0 +1,117 @@
+import math
+import time
+
+import pytest
+from pytest import approx
+
+from config.config import config
+from src.simulator import (
+    DiffDriveSimulator,
+    ReplayController,
+    ReplayEvent,
+    VirtualClock,
+    run_simulation,
+)
+from src.watchdog import InputWatchdog
+
+
+def test_straight_drive_distance():
+    """Test that a straight drive covers speed * time, less slip and lag."""
+    clock = VirtualClock()
+    simulator = DiffDriveSimulator(clock, motor_time_constant=0.0, slip=0.1)
+    simulator.send_command({"T": 1, "L": 0.2, "R": 0.2})
+    clock.sleep(10)
+    simulator.send_command({"T": 1, "L": 0, "R": 0})
+    assert simulator.pose.x == approx(0.2 * 10 * 0.9)
+    assert simulator.pose.y == approx(0.0)
+    assert simulator.pose.heading == approx(0.0)
+
+
+def test_motor_lag():
+    """Test that the tracks approach the command with the motor time constant."""
+    clock = VirtualClock()
+    simulator = DiffDriveSimulator(clock, motor_time_constant=0.1)
+    simulator.send_command({"T": 1, "L": 0.4, "R": 0.4})
+    clock.sleep(0.1)
+    simulator.send_command({"T": 1, "L": 0.4, "R": 0.4})
+    assert simulator.track_speeds[0] == approx(0.4 * (1 - math.exp(-1)))
+
+
+def test_feedback_records():
+    """Test that T:1001 feedback is recorded at the feedback interval."""
+    clock = VirtualClock()
+    simulator = DiffDriveSimulator(clock, motor_time_constant=0.0, feedback_interval=0.1)
+    simulator.send_command({"T": 1, "L": 0.1, "R": 0.3})
+    clock.sleep(1.05)
+    simulator.send_command({"T": 1, "L": 0, "R": 0})
+    assert len(simulator.feedback_log) == 10
+    feedback = simulator.feedback_log[-1]
+    assert feedback["T"] == 1001
+    assert (feedback["L"], feedback["R"]) == (0.1, 0.3)
+    assert feedback["y"] > 0  # right track faster turns left (counter-clockwise)
+
+
+def test_replay_controller():
+    """Test that replay events apply as virtual time passes."""
+    clock = VirtualClock()
+    controller = ReplayController(
+        [ReplayEvent(0.0, 0.2, 0.0), ReplayEvent(1.0, 0.4, 0.5, True)], clock, 2.0
+    )
+    assert controller.speed == 0.2
+    clock.sleep(1.0)
+    assert (controller.speed, controller.turn, controller.recording) == (0.4, 0.5, True)
+    assert controller.stop is False
+    clock.sleep(1.0)
+    assert controller.stop is True
+
+
+def test_replay_feeds_watchdog_like_pad():
+    """Test that held input stays fresh only while the simulated listener is alive."""
+    clock = VirtualClock()
+    watchdog = InputWatchdog(0.1, clock=clock.monotonic)
+    controller = ReplayController([ReplayEvent(0.0, 0.3, 0.0)], clock, 2.0)
+    controller.watchdog = watchdog
+    assert controller.speed == 0.3
+    clock.sleep(0.5)
+    controller.speed  # no new event, but the listener is alive
+    assert watchdog.check() is False
+    controller.connected = False
+    clock.sleep(0.5)
+    controller.speed
+    assert watchdog.check() is True
+
+
+def test_system_right_turn(tmp_path):
+    """Test UGVSystem end to end: a right turn turns the UGV clockwise."""
+    system, simulator = run_simulation(
+        config, [ReplayEvent(0.0, 0.3, 0.5)], duration=5.0, log_dir=str(tmp_path)
+    )
+    assert simulator.pose.heading < 0
+    assert simulator.commands_received == approx(500, abs=2)
+    assert system.scheduler.overruns == 0
+    assert system.watchdog.trip_count == 0
+
+
+def test_simulation_logs_to_own_directory(tmp_path):
+    """Test that a simulated run keeps its log and drive ring dump out of the rover's."""
+    system, _ = run_simulation(
+        config, [ReplayEvent(0.0, 0.3, 0.0)], duration=1.0, log_dir=str(tmp_path)
+    )
+    assert system.config.logging_config.LOG_FILE == str(tmp_path / "app.log")
+    assert (tmp_path / "drive_ring.bin").exists()
+
+
+def test_system_faster_than_real_time(tmp_path):
+    """Test that a minute of driving simulates in well under a minute."""
+    events = [ReplayEvent(t / 2, 0.3, math.sin(t / 5)) for t in range(120)]
+    start = time.perf_counter()
+    system, simulator = run_simulation(config, events, duration=60.0, log_dir=str(tmp_path))
+    assert time.perf_counter() - start < 10
+    assert simulator.distance > 5
+    assert system.controller.stop is True
+
+
+def test_invalid_slip():
+    """Test that impossible slip values are rejected."""
+    with pytest.raises(ValueError):
+        DiffDriveSimulator(VirtualClock(), slip=1.0)
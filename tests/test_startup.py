@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from src.startup import StartupProfile
+
+
+def test_phase_records_duration_and_imports(tmp_path, monkeypatch):
+    """Test that a phase records its duration and the packages it imported."""
+    (tmp_path / "startup_probe_module.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    times = iter([0.0, 1.0, 1.25, 2.0])
+    profile = StartupProfile(clock=lambda: next(times))
+
+    with profile.phase("probe"):
+        import startup_probe_module  # noqa: F401
+
+    phase = profile.phases[0]
+    assert phase.name == "probe"
+    assert phase.duration == 0.25
+    assert phase.modules == ("startup_probe_module",)
+    assert profile.elapsed() == 2.0
+    sys.modules.pop("startup_probe_module")
+
+
+def test_phase_without_imports(tmp_path, monkeypatch):
+    """Test that a phase can be timed without attributing imports to it."""
+    (tmp_path / "startup_probe_quiet.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    profile = StartupProfile()
+
+    with profile.phase("concurrent", imports=False):
+        import startup_probe_quiet  # noqa: F401
+
+    assert profile.phases[0].modules == ()
+    sys.modules.pop("startup_probe_quiet")
+
+
+def test_extend_nests_phases():
+    """Test that another profile's phases are added one level deeper."""
+    outer = StartupProfile()
+    inner = StartupProfile()
+    with inner.phase("base"):
+        pass
+    with outer.phase("system init"):
+        pass
+    outer.extend(inner)
+
+    assert [(phase.name, phase.depth) for phase in outer.phases] == [
+        ("system init", 0),
+        ("base", 1),
+    ]
+    report = outer.report()
+    assert "system init" in report and "    base" in report
+
+
+def test_system_import_is_lazy():
+    """Test that importing the system does not pull in optional hardware libraries."""
+    probe = (
+        "import sys, src.ugv_system, src.utils, src.logger; "
+        "print(sorted(m for m in ('picamera2', 'pyfiglet', 'termcolor', "
+        "'pyPS4Controller', 'serial') if m in sys.modules))"
+    )
+    # A clean PYTHONPATH, so nothing preloaded from site hooks counts.
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parent.parent))
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True, env=env
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,121 @@
+import time
+from threading import Thread
+
+from src.udp_controller import (
+    UDPRemoteController,
+    UDPTeleopSender,
+    pack_command,
+    unpack_command,
+)
+
+sample_config = {
+    "udp_config": {"HOST": "127.0.0.1", "PORT": 0, "MAX_PACKET_AGE": 0.5},
+    "ugv_config": {
+        "SPEED_MIN": 0,
+        "SPEED_MAX": 0.5,
+        "TURN_VALUE_MIN": -1,
+        "TURN_VALUE_MID": 0,
+        "TURN_VALUE_MAX": 1,
+    },
+}
+
+
+def test_pack_round_trip():
+    """Test that datagrams survive packing and unpacking."""
+    seq, sent, speed, turn, recording, stop = unpack_command(
+        pack_command(7, 123.5, 0.25, -0.5, recording=True)
+    )
+    assert (seq, sent, speed, turn, recording, stop) == (
+        7,
+        123.5,
+        0.25,
+        -0.5,
+        True,
+        False,
+    )
+
+
+def test_out_of_order_dropped():
+    """Test that datagrams older than the newest accepted one are dropped."""
+    controller = UDPRemoteController(config=sample_config)
+    now = time.time()
+    assert controller._accept(unpack_command(pack_command(5, now, 0.1, 0)), now)
+    assert not controller._accept(unpack_command(pack_command(4, now - 0.01, 0.1, 0)), now)
+    assert not controller._accept(unpack_command(pack_command(5, now, 0.1, 0)), now)
+    assert controller._accept(unpack_command(pack_command(6, now, 0.1, 0)), now)
+    assert controller.dropped_out_of_order == 2
+
+
+def test_sequence_wraparound_and_restart():
+    """Test sequence wraparound and sender restart detection."""
+    controller = UDPRemoteController(config=sample_config)
+    now = time.time()
+    assert controller._accept(unpack_command(pack_command(2**32 - 1, now, 0, 0)), now)
+    assert controller._accept(unpack_command(pack_command(0, now, 0, 0)), now)
+    # A restarted sender begins again from a low number with a newer timestamp
+    assert controller._accept(unpack_command(pack_command(0, now + 1, 0, 0)), now + 1)
+
+
+def test_stale_dropped():
+    """Test that datagrams older than MAX_PACKET_AGE are dropped."""
+    controller = UDPRemoteController(config=sample_config)
+    now = time.time()
+    assert not controller._accept(unpack_command(pack_command(1, now - 1, 0.1, 0)), now)
+    assert controller.dropped_stale == 1
+
+
+def test_age_check_off_by_default():
+    """Test that an unsynchronised sender clock does not drop datagrams by default."""
+    controller = UDPRemoteController(config={"udp_config": {"HOST": "127.0.0.1", "PORT": 0}})
+    now = time.time()
+    assert controller._accept(unpack_command(pack_command(1, now - 30, 0.1, 0)), now)
+    assert controller.dropped_stale == 0
+
+
+def test_apply_clamps_to_config():
+    """Test that applied values are clamped to the UGV ranges."""
+    controller = UDPRemoteController(config=sample_config)
+    controller._apply(unpack_command(pack_command(1, time.time(), 5.0, -3.0, True)))
+    assert controller.speed == 0.5
+    assert controller.turn == -1
+    assert controller.recording is True
+
+
+def test_localhost_listen():
+    """Test receiving datagrams over localhost until a stop datagram."""
+    controller = UDPRemoteController(config=sample_config)
+    _, port = controller.bind()
+    listen_thread = Thread(target=controller.listen, args=(5,))
+    listen_thread.start()
+
+    sender = UDPTeleopSender("127.0.0.1", port)
+    sender.send(0.25, 0.5, recording=True)
+    deadline = time.monotonic() + 2
+    while controller.accepted == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert controller.speed == 0.25
+    assert controller.turn == 0.5
+    assert controller.recording is True
+
+    sender.send(0, 0, stop=True)
+    listen_thread.join(timeout=2)
+    sender.close()
+    assert controller.stop is True
+    assert not listen_thread.is_alive()
+
+
+def test_stop_not_superseded():
+    """Test that a stop request is applied even when a newer datagram follows it."""
+    controller = UDPRemoteController(config=sample_config)
+    _, port = controller.bind()
+    sender = UDPTeleopSender("127.0.0.1", port)
+    sender.send(0, 0, stop=True)
+    sender.send(0.25, 0.5)
+    sender.close()
+    time.sleep(0.1)  # both queued before one drain
+
+    controller._receive_pending()
+    controller.close()
+    assert controller.dropped_superseded == 1
+    assert controller.stop is True
+    assert controller.speed == 0.25
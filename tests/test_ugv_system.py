@@ -1,5 +1,8 @@
+import os
+import struct
+import pytest
 from pytest import approx
-from threading import Thread
+from threading import Event, Thread
 import time
 from unittest.mock import MagicMock, patch
 
@@ -114,6 +117,185 @@ def test_loop():
     mock_base.send_command.assert_called_with({"T": 1, "R": 0, "L": 0})
 
 
+def test_loop_input_stall():
+    """Test that the drive is zeroed when remote control input goes stale."""
+    system.controller.stop = False
+    system.controller.on_R2_release()  # one event arms the watchdog
+    system.controller.speed = 0.5
+    system.controller.turn = 0
+
+    loop_thread = Thread(target=system._loop)
+    loop_thread.start()
+
+    time.sleep(0.5)
+
+    assert system.watchdog.trip_count == 1
+    assert system.controller.speed == 0.0
+    mock_base.send_command.assert_called_with({"T": 1, "R": 0.0, "L": 0.0})
+
+    system._terminate()
+    loop_thread.join()
+
+
+def pad_device(tmp_path):
+    """A FIFO standing in for the pad's js device, and its writing end."""
+    device = tmp_path / "js0"
+    os.mkfifo(device)
+    return str(device), os.open(device, os.O_RDWR)  # read-write, so opening never blocks
+
+
+def test_loop_held_input_connected(tmp_path):
+    """Test that a trigger held steady on a live listener does not trip the watchdog."""
+    device, writer = pad_device(tmp_path)
+    interface = system.controller.interface
+    system.controller.interface = device
+    system.controller.stop = False
+    system.watchdog.reset()
+    trips = system.watchdog.trip_count
+
+    listen_thread = Thread(target=system.controller.listen, args=(1,))
+    loop_thread = Thread(target=system._loop)
+    listen_thread.start()
+    loop_thread.start()
+    os.write(writer, struct.pack("<IhBB", 0, 32767, 2, 5))  # R2 fully pressed, then held
+    time.sleep(0.5)
+
+    assert system.watchdog.trip_count == trips
+    mock_base.send_command.assert_called_with({"T": 1, "R": 0.5, "L": 0.5})
+
+    system._terminate()
+    loop_thread.join()
+    listen_thread.join()
+    os.close(writer)
+    system.controller.interface = interface
+    system.watchdog.reset()
+
+
+def test_loop_stalled_listener(tmp_path):
+    """Test that a connected pad whose listener stops reading trips the watchdog."""
+    device, writer = pad_device(tmp_path)
+    interface = system.controller.interface
+    system.controller.interface = device
+    system.controller.is_connected = True  # connected, but nothing reading it
+    system.controller.stop = False
+    system.watchdog.reset()
+    trips = system.watchdog.trip_count
+    system.controller.on_R2_press(config.ps4_controller_config.R2_MAX)
+
+    loop_thread = Thread(target=system._loop)
+    loop_thread.start()
+    time.sleep(0.5)
+
+    assert system.watchdog.trip_count == trips + 1
+    mock_base.send_command.assert_called_with({"T": 1, "R": 0.0, "L": 0.0})
+
+    system._terminate()
+    loop_thread.join()
+    os.close(writer)
+    system.controller.interface = interface
+    system.controller.is_connected = False
+    system.watchdog.reset()
+
+
+class GatedCamera:
+    """Camera whose initialisation blocks until released."""
+
+    release = None
+
+    def __init__(self, resolution, flip, recording):
+        GatedCamera.release.wait(5)
+        self.start_recording = MagicMock()
+        self.camera_close = MagicMock()
+
+
+def test_drive_before_camera_ready():
+    """Test that driving starts before the camera, and recording once it is ready."""
+    GatedCamera.release = Event()
+    remote = MagicMock(speed=0.5, turn=0, recording=True, stop=False)
+    early_system = UGVSystem(
+        config=config,
+        base_path=base_path,
+        debug_logging=False,
+        camera=True,
+        base=MagicMock(),
+        controller=remote,
+        wait_for_camera=False,
+        camera_factory=GatedCamera,
+    )
+
+    early_system._tick()
+    early_system.base.send_command.assert_called_with({"T": 1, "R": 0.5, "L": 0.5})
+    assert early_system.first_drive_at is not None
+    assert not early_system.is_recording
+
+    GatedCamera.release.set()
+    assert early_system._camera_available(wait=True)
+    early_system._tick()
+    assert early_system.is_recording
+    early_system.camera.camera_close()  # after the queued start
+    early_system.camera.camera.start_recording.assert_called_once()
+
+
+def test_init_failures():
+    """Test that a failing camera stops init only when it is waited for."""
+
+    def broken_camera(resolution, flip, recording):
+        raise RuntimeError("no sensor")
+
+    kwargs = dict(
+        config=config,
+        base_path=base_path,
+        debug_logging=False,
+        camera=True,
+        base=MagicMock(),
+        controller=MagicMock(),
+        camera_factory=broken_camera,
+    )
+    with pytest.raises(RuntimeError, match="no sensor"):
+        UGVSystem(**kwargs)
+    with pytest.raises(RuntimeError, match="no sensor"):
+        UGVSystem(parallel_init=False, **kwargs)
+
+    degraded = UGVSystem(wait_for_camera=False, **kwargs)
+    assert not degraded._camera_available(wait=True)
+    assert not degraded.camera_exists
+
+
+def test_init_failure_closes_camera():
+    """Test that a camera still initialising is closed when another subsystem fails."""
+    closed = []
+
+    class SlowCamera:
+        def __init__(self, resolution, flip, recording):
+            time.sleep(0.2)
+
+        def camera_close(self):
+            closed.append(True)
+
+    with pytest.raises(ValueError, match="Unknown input source"):
+        UGVSystem(
+            config=config,
+            base_path=base_path,
+            debug_logging=False,
+            camera=True,
+            base=MagicMock(),
+            input_source="joystick",
+            wait_for_camera=False,
+            camera_factory=SlowCamera,
+        )
+    assert closed == [True]
+
+
+def test_parallel_init_attributes_imports_as_a_whole():
+    """Test that concurrent init phases do not claim each other's imports."""
+    parallel = UGVSystem(
+        config=config, base_path=base_path, debug_logging=False, base=MagicMock()
+    )
+    phases = {phase.name: phase for phase in parallel.startup.phases}
+    assert phases["base"].modules == phases["controller"].modules == ()
+    assert "parallel init" in phases
+
+
 def test_run():
     """Test the run method with mocked threads."""
     with patch("threading.Thread.start") as mock_start, patch(
@@ -26,3 +26,46 @@ def test_normalise_to_range():
     # Both ranges collapsed
     with pytest.raises(ValueError):
         normalise_to_range(50, 50, 50, 10, 10)
+
+
+# 2. Test self-test caching
+def test_tree_hash_tracks_content(tmp_path):
+    """Test that the tree hash changes with file contents but not caches."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "module.py").write_text("x = 1\n")
+    paths = [tmp_path / "src"]
+    original = tree_hash(paths)
+
+    (tmp_path / "src" / "__pycache__").mkdir()
+    (tmp_path / "src" / "__pycache__" / "module.pyc").write_bytes(b"\x00")
+    (tmp_path / "src" / "config.yaml.cache").write_bytes(b"\x00")
+    assert tree_hash(paths) == original
+
+    (tmp_path / "src" / "module.py").write_text("x = 2\n")
+    assert tree_hash(paths) != original
+
+
+def test_self_test_paths_cover_config_and_entry_point():
+    """Test that the self-test hash covers the config loader, schema and main.py."""
+    hashed = {file for path in SELF_TEST_PATHS for file in [path, *path.rglob("*")]}
+    for name in ("config/config.py", "config/schema.py", "config/config.yaml", "main.py"):
+        assert ROOT_PATH / name in hashed
+
+
+def test_self_test_cache(tmp_path):
+    """Test recording and checking a passing self-test."""
+    cache_file = str(tmp_path / "outputs" / "cache.json")
+    assert not self_test_cached(cache_file, "abc")
+    record_self_test_pass(cache_file, "abc")
+    assert self_test_cached(cache_file, "abc")
+    assert not self_test_cached(cache_file, "def")
+
+
+def test_self_test_logs_apart():
+    """Test that the self-test never writes or rotates the rover's log."""
+    from config.config import config, load_config
+
+    rover_logging = load_config().logging_config
+    assert config.logging_config.LOG_FILE != rover_logging.LOG_FILE
+    assert config.logging_config.DRIVE_RING_PATH != rover_logging.DRIVE_RING_PATH
+    assert config.logging_config.MAX_BYTES == config.logging_config.ROTATE_INTERVAL == 0
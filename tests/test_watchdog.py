@@ -0,0 +1,72 @@
+from pytest import approx
+
+from src.watchdog import InputWatchdog
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_not_armed_before_first_input():
+    """Test that the watchdog does not trip before any input is received."""
+    clock = FakeClock()
+    watchdog = InputWatchdog(0.1, clock=clock)
+    clock.now = 10.0
+    assert watchdog.check() is False
+    assert watchdog.trip_count == 0
+
+
+def test_trips_after_timeout():
+    """Test that the watchdog trips once input is older than the timeout."""
+    clock = FakeClock()
+    trips = []
+    watchdog = InputWatchdog(
+        0.1, on_trip=lambda stale, latency: trips.append((stale, latency)), clock=clock
+    )
+    watchdog.feed()
+
+    clock.now = 0.05
+    assert watchdog.check() is False
+
+    clock.now = 0.12
+    assert watchdog.check() is True
+    assert watchdog.trip_count == 1
+    assert trips == [(approx(0.12), approx(0.02))]
+
+    # Stays tripped without invoking the callback again
+    clock.now = 0.2
+    assert watchdog.check() is True
+    assert len(trips) == 1
+
+
+def test_recovers_on_input():
+    """Test that fresh input clears the trip and a new stall trips again."""
+    clock = FakeClock()
+    watchdog = InputWatchdog(0.1, clock=clock)
+    watchdog.feed()
+    clock.now = 0.5
+    assert watchdog.check() is True
+
+    watchdog.feed()
+    assert watchdog.check() is False
+    assert watchdog.tripped is False
+
+    clock.now = 0.7
+    assert watchdog.check() is True
+    assert watchdog.trip_count == 2
+    assert "2 trips" in watchdog.summary()
+
+
+def test_disabled():
+    """Test that a timeout of 0 disables the watchdog."""
+    clock = FakeClock()
+    watchdog = InputWatchdog(0, clock=clock)
+    watchdog.feed()
+    clock.now = 100.0
+    assert watchdog.check() is False